@@ -3,6 +3,7 @@
 """
 import os
 import sys
+import argparse
 
 # 添加项目根目录到Python路径
 project_root = os.path.dirname(os.path.abspath(__file__))
@@ -15,6 +16,10 @@ logger = setup_logger('main')
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description='Survival-Kit')
+    parser.add_argument('--resume', action='store_true', help='从上次中断运行的检查点继续，已获取的项目不再请求API')
+    args = parser.parse_args()
+    
     try:
         # 确保在正确的目录
         os.chdir(project_root)
@@ -22,7 +27,7 @@ def main():
         # 运行主程序
         logger.info("启动Survival-Kit...")
         kit = SurvivalKit()
-        kit.run()
+        kit.run(resume=args.resume)
         
     except Exception as e:
         logger.error(f"运行出错: {str(e)}")
@@ -1,6 +1,21 @@
+import os
 import json
-from typing import Dict, List, Optional
+import math
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 from datetime import datetime
+import numpy as np
+from src.analyzer.topic_classifier import TopicClassifier
+from src.analyzer.similarity_index import SimilarityIndex
+from src.utils.top_k import TopK
+from src.storage import get_result_store, MemoCache, stable_hash
+
+# 评分逻辑变化时递增，使缓存的分析结果失效
+SCORING_VERSION = 2
+
+# 评分只读取这些字段，其余字段（如 url、matched_keywords）变化不影响缓存
+SCORING_FIELDS = (
+    'name', 'stars', 'forks', 'language', 'license', 'topics', 'activity', 'issues', 'competition'
+)
 
 class ProjectAnalyzer:
     def __init__(self):
@@ -43,6 +58,18 @@ class ProjectAnalyzer:
             'Rust': 0.75
         }
         
+        # 主题特征分类
+        self.topic_classifier = TopicClassifier()
+        
+        # 相似项目索引：按描述和主题找出竞品，替代固定的竞争评分
+        self.similarity_index = None
+        if os.getenv('SIMILARITY_INDEX', '1') != '0':
+            self.similarity_index = SimilarityIndex()
+            self.similarity_index.load()
+            
+        # 分析结果缓存：项目评分输入和评分配置都未变化时复用上次结果
+        self.memo = MemoCache('analysis') if os.getenv('MEMO_CACHE', '1') != '0' else None
+        
     def analyze_project(self, project_data: Dict) -> Dict:
         """分析项目并生成评分"""
         try:
@@ -58,8 +85,9 @@ class ProjectAnalyzer:
                 monetization_score * sum(self.weights['monetization'].values())
             )
             
-            # 生成变现路径建议
-            monetization_paths = self._suggest_monetization_paths(project_data)
+            # 识别主题特征，生成变现路径建议
+            features = self.topic_classifier.classify(project_data.get('topics'))
+            monetization_paths = self._suggest_monetization_paths(project_data, features)
             
             return {
                 'project_id': project_data['name'],
@@ -69,8 +97,10 @@ class ProjectAnalyzer:
                     'monetization_score': round(monetization_score, 2),
                     'overall_score': round(overall_score, 2)
                 },
+                'features': sorted(features),
+                'competition': project_data.get('competition'),
                 'monetization_paths': monetization_paths,
-                'recommendations': self._generate_recommendations(project_data)
+                'recommendations': self._generate_recommendations(project_data, features)
             }
             
         except Exception as e:
@@ -100,8 +130,13 @@ class ProjectAnalyzer:
         # 市场需求得分（基于stars和forks）
         demand = min(1.0, (project['stars'] / 5000) * 0.6 + (project['forks'] / 1000) * 0.4)
         
-        # 竞争情况（基于类似项目数量，这里使用简化计算）
-        competition = 0.7  # 默认中等竞争
+        # 有历史快照时，按星标增长速度在全部仓库中的百分位调整需求
+        growth_percentile = project.get('trend', {}).get('growth_percentile')
+        if growth_percentile is not None:
+            demand = demand * 0.5 + growth_percentile * 0.5
+        
+        # 竞争情况（基于相似项目的数量和强弱，没有索引数据时按中等竞争计）
+        competition = (project.get('competition') or {}).get('score', 0.7)
         
         # 用户反馈（基于issues）
         issues = project.get('issues', {})
@@ -139,17 +174,16 @@ class ProjectAnalyzer:
             maintenance_score * self.weights['monetization']['maintenance']
         ) / sum(self.weights['monetization'].values())
         
-    def _suggest_monetization_paths(self, project: Dict) -> List[Dict]:
+    def _suggest_monetization_paths(self, project: Dict, features: Optional[Set[str]] = None) -> List[Dict]:
         """生成变现路径建议"""
         paths = []
         
         # 分析项目特征
-        is_tool = any(kw in str(project.get('topics', [])).lower() for kw in ['tool', 'utility', 'automation'])
-        is_api = any(kw in str(project.get('topics', [])).lower() for kw in ['api', 'service', 'server'])
-        is_ui = any(kw in str(project.get('topics', [])).lower() for kw in ['ui', 'frontend', 'web'])
-        
+        if features is None:
+            features = self.topic_classifier.classify(project.get('topics'))
+            
         # 根据特征推荐变现路径
-        if is_tool:
+        if 'tool' in features:
             paths.append({
                 'type': 'SaaS',
                 'difficulty': 'medium',
@@ -158,7 +192,7 @@ class ProjectAnalyzer:
                 'description': '将工具转化为在线服务，提供免费和付费版本'
             })
             
-        if is_api:
+        if 'api' in features:
             paths.append({
                 'type': 'API Service',
                 'difficulty': 'low',
@@ -167,7 +201,7 @@ class ProjectAnalyzer:
                 'description': '提供API即服务，按调用次数收费'
             })
             
-        if is_ui:
+        if 'ui' in features:
             paths.append({
                 'type': 'Premium Template',
                 'difficulty': 'low',
@@ -187,20 +221,22 @@ class ProjectAnalyzer:
         
         return paths
         
-    def _generate_recommendations(self, project: Dict) -> List[str]:
+    def _generate_recommendations(self, project: Dict, features: Optional[Set[str]] = None) -> List[str]:
         """生成具体建议"""
         recommendations = []
+        if features is None:
+            features = self.topic_classifier.classify(project.get('topics'))
         
         # 许可证建议
         if project['license'] == 'Unknown':
             recommendations.append("添加明确的开源许可证（建议使用MIT或Apache 2.0）")
             
         # 文档建议
-        if 'documentation' not in str(project.get('topics', [])).lower():
+        if 'documentation' not in features:
             recommendations.append("完善项目文档，特别是快速启动指南")
             
         # 部署建议
-        if 'docker' not in str(project.get('topics', [])).lower():
+        if 'docker' not in features:
             recommendations.append("添加Docker支持，简化部署流程")
             
         # 功能建议
@@ -212,43 +248,252 @@ class ProjectAnalyzer:
             
         return recommendations
         
-    def save_analysis(self, analysis: Dict, filename: str = 'data/project_analysis.json'):
-        """保存分析结果"""
+    def save_analysis(self, analysis: List[Dict], run_id: Optional[str] = None, filename: Optional[str] = None):
+        """保存分析结果，指定 filename 时同时导出JSON"""
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'timestamp': datetime.now().isoformat(),
-                    'analysis': analysis
-                }, f, ensure_ascii=False, indent=2)
+            store = get_result_store()
+            store.save_analyses(run_id or store.start_run(), analysis)
+            
+            if filename:
+                with open(filename, 'w', encoding='utf-8') as f:
+                    json.dump({
+                        'timestamp': datetime.now().isoformat(),
+                        'analysis': analysis
+                    }, f, ensure_ascii=False, indent=2)
         except Exception as e:
             print(f"Error saving analysis: {str(e)}")
             
-    def batch_analyze(self, projects: List[Dict]) -> List[Dict]:
-        """批量分析项目"""
-        results = []
-        for project in projects:
-            analysis = self.analyze_project(project)
-            if analysis:
-                results.append(analysis)
+    def _extract_columns(self, projects: List[Dict]) -> Tuple[List[int], Dict[str, np.ndarray]]:
+        """
+        把项目转换成评分所需的数值列
+
+        与逐个分析时会出错的记录（缺字段、非数值等）不放入列中，由调用方走逐个分析路径。
+
+        Returns:
+            Tuple[List[int], Dict[str, np.ndarray]]: 有效记录的下标和各列数组
+        """
+        def number(value) -> float:
+            if not isinstance(value, (int, float)) or not math.isfinite(value):
+                raise TypeError(value)
+            return value
+            
+        rows = []
+        indices = []
+        for i, project in enumerate(projects):
+            try:
+                if 'name' not in project:
+                    continue
+                activity = project.get('activity', {})
+                issues = project.get('issues', {})
+                if issues:
+                    issue_counts = (
+                        1.0,
+                        number(issues.get('open_issues_count', 0)),
+                        number(issues.get('closed_issues_count', 0))
+                    )
+                else:
+                    issue_counts = (0.0, 0, 0)
+                growth_percentile = project.get('trend', {}).get('growth_percentile')
                 
-        # 按总分排序
-        results.sort(
-            key=lambda x: x.get('evaluation', {}).get('overall_score', 0),
-            reverse=True
+                rows.append((
+                    number(project['stars']),
+                    number(project['forks']),
+                    number(activity.get('activity_score', 0)),
+                    number(activity.get('activity_score', 0.5)),
+                    number((project.get('competition') or {}).get('score', 0.7)),
+                    self.tech_stack_scores.get(project['language'], 0.5),
+                    self.license_scores.get(project['license'], 0.1),
+                    *issue_counts,
+                    0.0 if growth_percentile is None else 1.0,
+                    0 if growth_percentile is None else number(growth_percentile)
+                ))
+                indices.append(i)
+            except Exception:
+                continue
+                
+        names = ('stars', 'forks', 'activity_score', 'maintenance_activity', 'competition', 'tech_stack', 'license',
+                 'has_issues', 'open_issues', 'closed_issues', 'has_growth', 'growth_percentile')
+        table = np.array(rows, dtype=np.float64).reshape(len(rows), len(names))
+        return indices, {name: table[:, j] for j, name in enumerate(names)}
+        
+    def _score_columns(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """按列计算三个维度得分和总分，运算顺序与逐个分析一致以保证结果完全相同"""
+        weights = self.weights
+        weight_sums = {dimension: sum(weights[dimension].values()) for dimension in weights}
+        stars, forks = columns['stars'], columns['forks']
+        
+        # 技术维度
+        code_quality = np.minimum(1.0, (stars / 1000) * 0.7 + (forks / 200) * 0.3)
+        technical_score = (
+            code_quality * weights['technical']['code_quality'] +
+            columns['activity_score'] * weights['technical']['activity'] +
+            columns['tech_stack'] * weights['technical']['tech_stack']
+        ) / weight_sums['technical']
+        
+        # 市场维度
+        demand = np.minimum(1.0, (stars / 5000) * 0.6 + (forks / 1000) * 0.4)
+        demand = np.where(
+            columns['has_growth'] > 0,
+            demand * 0.5 + columns['growth_percentile'] * 0.5,
+            demand
         )
         
-        return results
+        total_issues = columns['open_issues'] + columns['closed_issues']
+        has_issues = (columns['has_issues'] > 0) & (total_issues > 0)
+        resolution_rate = np.divide(
+            columns['closed_issues'], total_issues,
+            out=np.zeros_like(total_issues), where=has_issues
+        )
+        user_feedback = np.where(has_issues, np.minimum(1.0, resolution_rate * 0.7 + 0.3), 0.5)
+        market_score = (
+            demand * weights['market']['demand'] +
+            columns['competition'] * weights['market']['competition'] +
+            user_feedback * weights['market']['user_feedback']
+        ) / weight_sums['market']
+        
+        # 变现维度
+        maintenance_score = 1.0 - (columns['maintenance_activity'] * 0.5)
+        monetization_score = (
+            columns['license'] * weights['monetization']['license'] +
+            0.7 * weights['monetization']['complexity'] +
+            maintenance_score * weights['monetization']['maintenance']
+        ) / weight_sums['monetization']
+        
+        overall_score = (
+            technical_score * weight_sums['technical'] +
+            market_score * weight_sums['market'] +
+            monetization_score * weight_sums['monetization']
+        )
+        return {
+            'technical_score': technical_score,
+            'market_score': market_score,
+            'monetization_score': monetization_score,
+            'overall_score': overall_score
+        }
+        
+    def _iter_analyses_vectorized(self, projects: List[Dict]) -> Iterator[Dict]:
+        """按列批量计算评分，按输入顺序产出与逐个调用 analyze_project 相同的结果"""
+        indices, columns = self._extract_columns(projects)
+        scores = {
+            name: values.tolist() for name, values in self._score_columns(columns).items()
+        }
+        rows = dict(zip(indices, range(len(indices))))
+        
+        for i, project_data in enumerate(projects):
+            analysis = None
+            if i in rows:
+                try:
+                    features = self.topic_classifier.classify(project_data.get('topics'))
+                    analysis = {
+                        'project_id': project_data['name'],
+                        'evaluation': {
+                            name: round(values[rows[i]], 2) for name, values in scores.items()
+                        },
+                        'features': sorted(features),
+                        'competition': project_data.get('competition'),
+                        'monetization_paths': self._suggest_monetization_paths(project_data, features),
+                        'recommendations': self._generate_recommendations(project_data, features)
+                    }
+                except Exception:
+                    analysis = None
+                    
+            # 无法按列计算的记录走逐个分析路径（包括错误输出）
+            yield analysis if analysis is not None else self.analyze_project(project_data)
+            
+    def _annotate_competition(self, projects: List[Dict]) -> List[Dict]:
+        """把本批项目加入相似项目索引，并为每个项目附上竞争信息"""
+        index = self.similarity_index
+        valid = []
+        for project in projects:
+            try:
+                index.add(project)
+                valid.append(True)
+            except Exception:
+                # 无法分析的记录在评分时按原路径报错
+                valid.append(False)
+                
+        annotated = []
+        for project, ok in zip(projects, valid):
+            competition = None
+            if ok:
+                try:
+                    competition = index.competition(project)
+                except Exception:
+                    competition = None
+            annotated.append({**project, 'competition': competition} if competition else project)
+            
+        return annotated
+        
+    def save_similarity_index(self):
+        """保存相似项目索引，每次运行结束时调用一次"""
+        if self.similarity_index is not None:
+            self.similarity_index.save()
+        
+    def _config_hash(self) -> str:
+        """评分配置哈希，配置变化后缓存自动失效"""
+        return stable_hash([
+            SCORING_VERSION, self.weights, self.license_scores,
+            self.tech_stack_scores, self.topic_classifier.rules
+        ])
+        
+    @staticmethod
+    def _scoring_input(project: Dict) -> Optional[Dict]:
+        """提取参与评分的字段作为缓存键的输入，无法提取时不缓存"""
+        if not isinstance(project, dict):
+            return None
+        record = {field: project[field] for field in SCORING_FIELDS if field in project}
+        trend = project.get('trend')
+        record['growth_percentile'] = trend.get('growth_percentile') if isinstance(trend, dict) else trend
+        return record
+        
+    def batch_analyze(
+        self,
+        projects: List[Dict],
+        vectorized: bool = True,
+        top_k: Optional[int] = None
+    ) -> List[Dict]:
+        """批量分析项目
+        
+        Args:
+            projects: 监控得到的项目
+            vectorized: 是否按列批量计算评分；为False时逐个调用 analyze_project
+            top_k: 只保留总分最高的K个，默认全部保留
+            
+        Returns:
+            List[Dict]: 按总分降序排列的分析结果，同分时保持输入顺序
+        """
+        if self.similarity_index is not None:
+            projects = self._annotate_competition(projects)
+            
+        def compute(batch: List[Dict]) -> Iterator[Dict]:
+            if vectorized:
+                return self._iter_analyses_vectorized(batch)
+            return (self.analyze_project(project) for project in batch)
+            
+        if self.memo:
+            config_hash = self._config_hash()
+            keys = [
+                None if record is None else self.memo.make_key(record, config_hash)
+                for record in map(self._scoring_input, projects)
+            ]
+            analyses = self.memo.iter_cached(projects, keys, compute)
+        else:
+            analyses = compute(projects)
+            
+        # 按总分选取
+        ranking = TopK(top_k, key=lambda x: x.get('evaluation', {}).get('overall_score', 0))
+        ranking.extend(analysis for analysis in analyses if analysis)
+        return ranking.items()
 
 if __name__ == "__main__":
     # 测试分析器
     analyzer = ProjectAnalyzer()
     
-    # 读取监控数据
+    # 读取最近一次监控结果
     try:
-        with open('data/github_trends.json', 'r', encoding='utf-8') as f:
-            monitored_data = json.load(f)
-            results = analyzer.batch_analyze(monitored_data.get('results', []))
-            analyzer.save_analysis(results)
-            print(f"分析完成，发现 {len(results)} 个潜在项目")
+        results = analyzer.batch_analyze(get_result_store().load_repos())
+        analyzer.save_analysis(results)
+        analyzer.save_similarity_index()
+        print(f"分析完成，发现 {len(results)} 个潜在项目")
     except Exception as e:
-        print(f"Error reading monitored data: {str(e)}") 
\ No newline at end of file
+        print(f"Error reading monitored data: {str(e)}")
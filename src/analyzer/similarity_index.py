@@ -0,0 +1,244 @@
+"""
+相似项目索引模块
+"""
+import os
+import re
+import hashlib
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Set
+import numpy as np
+from src.analyzer.topic_classifier import normalize_topic
+
+# 描述中不参与相似度计算的常见词
+STOPWORDS = {
+    'the', 'and', 'for', 'with', 'that', 'this', 'from', 'your', 'you', 'are', 'use',
+    'using', 'based', 'into', 'can', 'all', 'any', 'not', 'our', 'its', 'more', 'easy',
+    'simple', 'fast', 'open', 'source', 'project', 'library', 'framework', 'written'
+}
+
+# 64位乘法哈希取高32位
+_MASK_32 = np.uint64(0xFFFFFFFF)
+_SHIFT_32 = np.uint64(32)
+
+
+def repo_tokens(repo: Dict) -> Set[str]:
+    """提取描述词和主题词作为相似度计算的特征集合"""
+    tokens = {
+        word for word in re.findall(r'[a-z0-9]+', (repo.get('description') or '').lower())
+        if len(word) > 2 and word not in STOPWORDS
+    }
+    for topic in repo.get('topics') or []:
+        if isinstance(topic, str):
+            normalized = normalize_topic(topic)
+            tokens.add(normalized)
+            tokens.update(part for part in normalized.split('-') if len(part) > 2)
+    return tokens
+
+
+class SimilarityIndex:
+    """基于 MinHash + LSH 的相似项目索引
+
+    每个仓库的描述和主题词集合压缩为 ``num_perm`` 个 MinHash 值，按 ``bands`` 段
+    放入哈希桶；查询只比较同桶的候选项目，不需要两两比较全部仓库。
+    新仓库随时加入，已存在的仓库重新加入时更新签名。
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        num_perm: int = 64,
+        bands: int = 32,
+        min_similarity: Optional[float] = None,
+        max_candidates: int = 500,
+        seed: int = 1
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm 必须能被 bands 整除")
+
+        self.path = path or os.getenv('SIMILARITY_INDEX_PATH', os.path.join('data', 'similarity_index.npz'))
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.min_similarity = min_similarity or float(os.getenv('SIMILARITY_THRESHOLD', 0.2))
+        # 单次查询最多比较签名的候选数，按同桶段数取最多的，避免大量雷同项目时退化为线性扫描
+        self.max_candidates = max_candidates
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+
+        self.signatures: Dict[int, np.ndarray] = {}
+        self.stars: Dict[int, int] = {}
+        self.names: Dict[int, str] = {}
+        self._buckets: List[Dict[bytes, Set[int]]] = [{} for _ in range(bands)]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def signature(self, tokens: Set[str]) -> Optional[np.ndarray]:
+        """计算 MinHash 签名，特征为空时返回None"""
+        if not tokens:
+            return None
+        hashes = np.array(
+            [int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=4).digest(), 'little')
+             for token in tokens],
+            dtype=np.uint64
+        )
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) >> _SHIFT_32
+        return (permuted & _MASK_32).min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def _insert(self, repo_id: int, signature: np.ndarray):
+        """写入签名和哈希桶，调用方持有锁"""
+        previous = self.signatures.get(repo_id)
+        if previous is not None:
+            if np.array_equal(previous, signature):
+                return
+            for band, key in enumerate(self._band_keys(previous)):
+                bucket = self._buckets[band].get(key)
+                if bucket:
+                    bucket.discard(repo_id)
+
+        self.signatures[repo_id] = signature
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(key, set()).add(repo_id)
+
+    def add(self, repo: Dict) -> bool:
+        """
+        加入或更新一个仓库
+
+        Args:
+            repo: 含 ``id``、``name``、``description``、``topics``、``stars`` 的仓库信息
+
+        Returns:
+            bool: 是否有可用的特征
+        """
+        signature = self.signature(repo_tokens(repo))
+        if signature is None or repo.get('id') is None:
+            return False
+
+        with self._lock:
+            self._insert(repo['id'], signature)
+            self.stars[repo['id']] = repo.get('stars') or 0
+            self.names[repo['id']] = repo.get('name')
+        return True
+
+    def _candidates(self, signature: np.ndarray, exclude: Optional[int] = None) -> List[int]:
+        """
+        按同桶的段数选出候选项目，调用方持有锁
+
+        同桶段数越多，估计相似度越高；只保留段数最多的 ``max_candidates`` 个，
+        大量雷同项目挤在同一个桶里时，后续的签名比较数量仍有上限。
+        """
+        collisions = Counter()
+        for band, key in enumerate(self._band_keys(signature)):
+            collisions.update(self._buckets[band].get(key, ()))
+        collisions.pop(exclude, None)
+        return [candidate for candidate, _ in collisions.most_common(self.max_candidates)]
+
+    def query(self, repo: Dict, limit: int = 10) -> List[Dict]:
+        """
+        查找相似项目
+
+        Args:
+            repo: 仓库信息，已加入索引的仓库不会返回自身
+            limit: 返回数量
+
+        Returns:
+            List[Dict]: 按估计相似度降序排列的相似项目
+        """
+        signature = self.signatures.get(repo.get('id'))
+        if signature is None:
+            signature = self.signature(repo_tokens(repo))
+        if signature is None:
+            return []
+
+        with self._lock:
+            ids = self._candidates(signature, repo.get('id'))
+            if not ids:
+                return []
+            matrix = np.stack([self.signatures[candidate] for candidate in ids])
+            stars = [self.stars[candidate] for candidate in ids]
+            names = [self.names[candidate] for candidate in ids]
+
+        similarity = (matrix == signature).mean(axis=1)
+        order = np.argsort(-similarity, kind='stable')
+        return [
+            {'id': ids[i], 'name': names[i], 'stars': stars[i], 'similarity': round(float(similarity[i]), 2)}
+            for i in order[:limit] if similarity[i] >= self.min_similarity
+        ]
+
+    def competition(self, repo: Dict) -> Optional[Dict]:
+        """
+        根据相似项目的数量和强弱评估竞争情况
+
+        每个相似项目按 相似度 × 对方星标占比 计入竞争压力；
+        ``score`` 越高表示竞争越小，与原先的默认值 0.7（中等竞争）同一量纲。
+
+        Returns:
+            Optional[Dict]: 竞争信息；仓库没有可用特征时返回None
+        """
+        if repo.get('id') not in self.signatures and not repo_tokens(repo):
+            return None
+
+        competitors = self.query(repo, limit=20)
+        own_stars = repo.get('stars') or 0
+        pressure = sum(
+            c['similarity'] * c['stars'] / (c['stars'] + own_stars) if c['stars'] + own_stars else 0
+            for c in competitors
+        )
+        pressure = min(1.0, pressure)
+
+        if pressure < 0.2:
+            level = 'low'
+        elif pressure < 0.5:
+            level = 'moderate'
+        else:
+            level = 'high'
+
+        return {
+            'score': round(1.0 - pressure * 0.6, 4),
+            'level': level,
+            'competitors': len(competitors),
+            'top_competitors': [c['name'] for c in competitors[:3]]
+        }
+
+    def save(self):
+        """保存签名，哈希桶在加载时重建"""
+        with self._lock:
+            ids = list(self.signatures)
+            signatures = np.stack([self.signatures[i] for i in ids]) if ids else np.empty((0, self.num_perm), np.uint32)
+            stars = np.array([self.stars[i] for i in ids], dtype=np.int64)
+            names = np.array([self.names[i] or '' for i in ids], dtype=str)
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{threading.get_ident()}.tmp.npz"
+        try:
+            np.savez(tmp_path, ids=np.array(ids, dtype=np.int64), signatures=signatures, stars=stars, names=names)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Error saving similarity index: {str(e)}")
+
+    def load(self):
+        """从磁盘加载签名"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path) as data:
+                if data['signatures'].shape[1:] != (self.num_perm,):
+                    return
+                with self._lock:
+                    for repo_id, signature, stars, name in zip(
+                        data['ids'].tolist(), data['signatures'], data['stars'].tolist(), data['names'].tolist()
+                    ):
+                        self._insert(repo_id, signature)
+                        self.stars[repo_id] = stars
+                        self.names[repo_id] = name
+        except Exception as e:
+            print(f"Error loading similarity index: {str(e)}")
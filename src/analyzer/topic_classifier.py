@@ -0,0 +1,84 @@
+"""
+项目主题分类模块
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+# 特征 -> 触发该特征的主题关键词；带连字符的关键词需整个主题匹配
+FEATURE_RULES: Dict[str, List[str]] = {
+    'tool': ['tool', 'utility', 'automation'],
+    'api': ['api', 'service', 'server'],
+    'ui': ['ui', 'frontend', 'web'],
+    'documentation': ['documentation', 'docs'],
+    'docker': ['docker'],
+    'enterprise': ['enterprise'],
+    'developer_tools': ['developer-tools', 'devtools'],
+    'automation': ['automation']
+}
+
+_SEPARATORS = re.compile(r'[\s_]+')
+
+
+def _singular(word: str) -> str:
+    """简单的复数还原，主题和关键词两侧使用同一规则"""
+    if len(word) > 4 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        return word[:-1]
+    return word
+
+
+def normalize_topic(topic: str) -> str:
+    """统一大小写、分隔符和复数形式，如 ``Developer_Tools`` -> ``developer-tool``"""
+    parts = _SEPARATORS.sub('-', topic.strip().lower()).split('-')
+    return '-'.join(_singular(part) for part in parts if part)
+
+
+class TopicClassifier:
+    """按预编译的关键词索引把项目主题映射为特征标记
+
+    主题按连字符拆分为词后与关键词逐词比较，不再在 ``str(topics)`` 上做子串查找，
+    避免 ``ui`` 命中 ``build``、``api`` 命中 ``rapid`` 之类的误判。
+    每个项目只遍历一次主题，得到全部特征。
+    """
+
+    def __init__(self, rules: Optional[Dict[str, List[str]]] = None):
+        self.rules = rules or FEATURE_RULES
+        self._index: Dict[str, Set[str]] = {}
+        for feature, keywords in self.rules.items():
+            for keyword in keywords:
+                self._index.setdefault(normalize_topic(keyword), set()).add(feature)
+
+    def classify(self, topics: Optional[Iterable[str]]) -> Set[str]:
+        """
+        识别项目特征
+
+        Args:
+            topics: 项目主题列表
+
+        Returns:
+            Set[str]: 命中的特征
+        """
+        if not topics:
+            return set()
+        if isinstance(topics, str):
+            topics = [topics]
+
+        features: Set[str] = set()
+        for topic in topics:
+            if not isinstance(topic, str):
+                continue
+            normalized = normalize_topic(topic)
+            features.update(self._index.get(normalized, ()))
+            if '-' in normalized:
+                for part in normalized.split('-'):
+                    features.update(self._index.get(part, ()))
+        return features
+
+
+_default_classifier = TopicClassifier()
+
+
+def classify_topics(topics: Optional[Iterable[str]]) -> Set[str]:
+    """使用默认规则识别项目特征"""
+    return _default_classifier.classify(topics)
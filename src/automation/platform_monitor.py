@@ -2,8 +2,9 @@ import os
 import schedule
 import time
 from datetime import datetime
-import requests
 from dotenv import load_dotenv
+from src.utils.http_client import get_http_client
+from src.utils.token_pool import get_token_pool
 
 load_dotenv()
 
@@ -12,9 +13,11 @@ class PlatformMonitor:
         self.platforms = {
             'upwork': os.getenv('UPWORK_API_KEY'),
             'fiverr': os.getenv('FIVERR_API_KEY'),
-            'github': os.getenv('GITHUB_TOKEN')
+            'github': os.getenv('GITHUB_TOKENS') or os.getenv('GITHUB_TOKEN')
         }
         self.keywords = ['AI', 'Python', 'Automation', 'Data Analysis']
+        self.http = get_http_client()
+        self.token_pool = get_token_pool()
         
     def check_opportunities(self):
         """检查各平台的机会"""
@@ -38,8 +41,8 @@ class PlatformMonitor:
     
     def _check_github_trends(self):
         """检查GitHub趋势项目"""
-        url = "https://api.github.com/search/repositories"
-        headers = {"Authorization": f"token {self.platforms['github']}"}
+        base_url = os.getenv('GITHUB_API_URL', 'https://api.github.com').rstrip('/')
+        url = f"{base_url}/search/repositories"
         
         trends = []
         for keyword in self.keywords:
@@ -48,7 +51,11 @@ class PlatformMonitor:
                 'sort': 'stars',
                 'order': 'desc'
             }
-            response = requests.get(url, headers=headers, params=params)
+            # 与GitHubMonitor共用令牌池，按剩余搜索额度选择令牌
+            token = self.token_pool.acquire('search')
+            headers = {"Authorization": f"token {token}"} if token else {}
+            response = self.http.get(url, headers=headers, params=params)
+            self.token_pool.update(token, 'search', response.headers)
             if response.status_code == 200:
                 data = response.json()
                 trends.extend(data.get('items', [])[:5])
@@ -0,0 +1,252 @@
+"""
+评分配置历史回测模块
+"""
+import os
+import copy
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from src.analyzer.project_analyzer import ProjectAnalyzer
+from src.evaluator.monetization_evaluator import MonetizationEvaluator
+from src.storage import ResultStore, get_result_store
+from src.utils.logger import setup_logger
+
+logger = setup_logger('backtest')
+
+# 工作进程内复用的分析器和评估器
+_worker_analyzer: Optional[ProjectAnalyzer] = None
+_worker_evaluator: Optional[MonetizationEvaluator] = None
+
+
+def _init_worker():
+    """
+    初始化工作进程
+
+    回放时不使用缓存和相似项目索引：索引包含快照之后才出现的仓库，
+    竞争评分会泄露未来信息。
+    """
+    global _worker_analyzer, _worker_evaluator
+    previous = {name: os.environ.get(name) for name in ('MEMO_CACHE', 'SIMILARITY_INDEX')}
+    os.environ.update({name: '0' for name in previous})
+    try:
+        _worker_analyzer = ProjectAnalyzer()
+        _worker_evaluator = MonetizationEvaluator()
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _replay(task: Tuple[Dict, List[Dict], int, str]) -> List[str]:
+    """
+    在一个快照上按一组权重重新分析和评估
+
+    Returns:
+        List[str]: 选出的前K个项目id
+    """
+    weights, repos, top_k, rank_by = task
+    if _worker_analyzer is None:
+        _init_worker()
+    _worker_analyzer.weights = copy.deepcopy(weights)
+
+    if rank_by == 'overall':
+        picks = _worker_analyzer.batch_analyze(repos, top_k=top_k)
+    else:
+        picks = _worker_evaluator.batch_evaluate(_worker_analyzer.batch_analyze(repos), top_k=top_k)
+    return [pick['project_id'] for pick in picks]
+
+
+class Backtester:
+    """用历史扫描快照比较不同评分配置
+
+    结果库中每次运行的监控结果是一个快照。每组权重在每个快照上重新跑
+    ProjectAnalyzer 和 MonetizationEvaluator，选出前K个项目，再用
+    ``horizon_days`` 天内最后一个快照的星标数衡量这些项目之后的增长。
+    (配置, 快照) 组合分发到进程池并行计算。
+
+    默认按分析总分（``rank_by='overall'``）选取。按潜在收入（``'revenue'``）选取时，
+    收入只取决于变现维度得分，而该得分按变现权重之和归一化，技术和市场权重
+    不起作用，因此要求各配置的变现权重互不相同。
+    """
+
+    def __init__(
+        self,
+        store: Optional[ResultStore] = None,
+        horizon_days: float = 30,
+        top_k: int = 10,
+        rank_by: str = 'overall',
+        max_workers: Optional[int] = None
+    ):
+        if rank_by not in ('revenue', 'overall'):
+            raise ValueError(f"未知的排序方式: {rank_by}")
+
+        self.store = store or get_result_store()
+        self.horizon = timedelta(days=horizon_days)
+        self.top_k = top_k
+        self.rank_by = rank_by
+        self.max_workers = max_workers or int(os.getenv('BACKTEST_WORKERS', os.cpu_count() or 1))
+
+    def load_snapshots(self) -> List[Dict]:
+        """
+        读取有监控结果的运行
+
+        Returns:
+            List[Dict]: 按时间排序的快照，含 ``run_id``、``time`` 和 ``repos``
+        """
+        snapshots = []
+        for run in self.store.list_runs():
+            repos = self.store.load_repos(run['run_id'])
+            if repos:
+                snapshots.append({
+                    'run_id': run['run_id'],
+                    'time': datetime.fromisoformat(run['started_at']),
+                    'repos': repos
+                })
+        return sorted(snapshots, key=lambda snapshot: snapshot['time'])
+
+    def _outcome_snapshot(self, snapshots: List[Dict], index: int) -> Optional[Dict]:
+        """回测窗口内最后一个快照，没有则返回None"""
+        start = snapshots[index]['time']
+        later = [
+            snapshot for snapshot in snapshots[index + 1:]
+            if start < snapshot['time'] <= start + self.horizon
+        ]
+        return later[-1] if later else None
+
+    @staticmethod
+    def _growth(before: Dict, after: Dict) -> Dict[str, Dict[str, float]]:
+        """两个快照间每个仓库的星标增长"""
+        later = {repo['name']: repo.get('stars') or 0 for repo in after['repos']}
+        growth = {}
+        for repo in before['repos']:
+            if repo['name'] in later:
+                stars = repo.get('stars') or 0
+                gained = later[repo['name']] - stars
+                growth[repo['name']] = {'stars': gained, 'relative': gained / max(stars, 1)}
+        return growth
+
+    def _score_picks(self, picks: List[str], growth: Dict[str, Dict[str, float]]) -> Dict:
+        """对比选中项目与全部项目的后续增长"""
+        tracked = [name for name in picks if name in growth]
+        relative = [growth[name]['relative'] for name in tracked]
+        all_relative = [value['relative'] for value in growth.values()]
+
+        # 实际增长最快的前K个仓库
+        k = min(self.top_k, len(growth))
+        leaders = set(sorted(growth, key=lambda name: growth[name]['relative'], reverse=True)[:k])
+        baseline = statistics.mean(all_relative) if all_relative else 0.0
+        mean_relative = statistics.mean(relative) if relative else 0.0
+
+        return {
+            'picks': len(picks),
+            'tracked': len(tracked),
+            'mean_star_growth': statistics.mean(growth[name]['stars'] for name in tracked) if tracked else 0.0,
+            'mean_relative_growth': mean_relative,
+            'median_relative_growth': statistics.median(relative) if relative else 0.0,
+            'precision_at_k': len(leaders.intersection(tracked)) / k if k else 0.0,
+            'baseline_relative_growth': baseline,
+            'lift': mean_relative / baseline if baseline > 0 else None
+        }
+
+    @staticmethod
+    def _monetization_weights(weights: Dict) -> Tuple[Tuple[str, float], ...]:
+        """归一化后的变现权重，按收入排序时只有它影响结果"""
+        monetization = weights.get('monetization', {})
+        total = sum(monetization.values())
+        return tuple(sorted((key, round(value / total, 9) if total else value) for key, value in monetization.items()))
+
+    def _check_configs(self, configs: Dict[str, Dict]):
+        """按收入排序时，变现权重相同的配置结果必然相同，直接报错"""
+        if self.rank_by != 'revenue':
+            return
+        seen = {}
+        for name, config in configs.items():
+            key = self._monetization_weights(config['weights'])
+            if key in seen:
+                raise ValueError(
+                    f"按收入排序时只有变现权重影响结果，配置 {seen[key]} 与 {name} 的变现权重相同，"
+                    f"请改用 rank_by='overall'"
+                )
+            seen[key] = name
+
+    def run(self, configs: Dict[str, Dict], snapshots: Optional[List[Dict]] = None) -> Dict:
+        """
+        回测多组评分配置
+
+        Args:
+            configs: 配置名到配置，格式同 ``PROJECT_ANALYZER_CONFIG``（含 ``weights``）
+            snapshots: 历史快照，默认从结果库读取
+
+        Returns:
+            Dict: 每组配置在各快照上的表现及汇总，按平均相对增长降序
+        """
+        self._check_configs(configs)
+        snapshots = self.load_snapshots() if snapshots is None else snapshots
+        windows = []
+        for index, snapshot in enumerate(snapshots):
+            outcome = self._outcome_snapshot(snapshots, index)
+            if outcome is not None:
+                windows.append((snapshot, self._growth(snapshot, outcome)))
+        logger.info(f"共 {len(snapshots)} 个快照，其中 {len(windows)} 个有后续快照可供回测")
+
+        tasks = [
+            (name, snapshot['run_id'], (config['weights'], snapshot['repos'], self.top_k, self.rank_by))
+            for name, config in configs.items()
+            for snapshot, _ in windows
+        ]
+        if self.max_workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker) as pool:
+                picks = list(pool.map(_replay, [task for _, _, task in tasks]))
+        else:
+            picks = [_replay(task) for _, _, task in tasks]
+
+        growth_by_run = {snapshot['run_id']: growth for snapshot, growth in windows}
+        results = {name: [] for name in configs}
+        for (name, run_id, _), picked in zip(tasks, picks):
+            results[name].append({'run_id': run_id, **self._score_picks(picked, growth_by_run[run_id])})
+
+        summaries = []
+        for name, per_snapshot in results.items():
+            lifts = [result['lift'] for result in per_snapshot if result['lift'] is not None]
+            summaries.append({
+                'name': name,
+                'weights': configs[name]['weights'],
+                'mean_relative_growth': statistics.mean(
+                    result['mean_relative_growth'] for result in per_snapshot) if per_snapshot else 0.0,
+                'mean_precision_at_k': statistics.mean(
+                    result['precision_at_k'] for result in per_snapshot) if per_snapshot else 0.0,
+                'mean_lift': statistics.mean(lifts) if lifts else None,
+                'snapshots': per_snapshot
+            })
+        summaries.sort(key=lambda summary: summary['mean_relative_growth'], reverse=True)
+
+        return {
+            'snapshots': len(windows),
+            'top_k': self.top_k,
+            'horizon_days': self.horizon.total_seconds() / 86400,
+            'rank_by': self.rank_by,
+            'configs': summaries
+        }
+
+
+if __name__ == "__main__":
+    from config.default.config import PROJECT_ANALYZER_CONFIG
+
+    # 默认配置与偏重市场、偏重技术的两组权重对比，按分析总分选取
+    market_heavy = copy.deepcopy(PROJECT_ANALYZER_CONFIG)
+    market_heavy['weights']['market'] = {'demand': 0.3, 'competition': 0.1, 'user_feedback': 0.2}
+    technical_heavy = copy.deepcopy(PROJECT_ANALYZER_CONFIG)
+    technical_heavy['weights']['technical'] = {'code_quality': 0.2, 'activity': 0.2, 'tech_stack': 0.1}
+
+    result = Backtester().run({
+        'default': PROJECT_ANALYZER_CONFIG,
+        'market_heavy': market_heavy,
+        'technical_heavy': technical_heavy
+    })
+    print(f"回测 {result['snapshots']} 个快照，前{result['top_k']}名，窗口 {result['horizon_days']} 天")
+    for summary in result['configs']:
+        print(f"{summary['name']}: 平均相对增长 {summary['mean_relative_growth']:.2%}，"
+              f"precision@K {summary['mean_precision_at_k']:.2f}，lift {summary['mean_lift']}")
@@ -1,8 +1,20 @@
+import os
 import json
-from typing import Dict, List, Optional
+import math
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime
 import requests
 from bs4 import BeautifulSoup
+import numpy as np
+from src.storage import get_result_store, MemoCache, stable_hash
+from src.analyzer.topic_classifier import classify_topics
+from src.utils.top_k import TopK
+
+# 评估逻辑变化时递增，使缓存的评估结果失效
+EVALUATION_VERSION = 2
+
+# 评估只读取分析结果中的这些字段
+EVALUATION_FIELDS = ('project_id', 'evaluation', 'monetization_paths', 'features', 'topics', 'competition')
 
 class MonetizationEvaluator:
     def __init__(self):
@@ -46,6 +58,33 @@ class MonetizationEvaluator:
             'chrome_store': 0.75
         }
         
+        # 各变现模式的启动成本
+        self.setup_costs = {
+            'SaaS': {
+                'development': 3000,
+                'infrastructure': 500,
+                'marketing': 1000
+            },
+            'API_Service': {
+                'development': 2000,
+                'infrastructure': 300,
+                'marketing': 700
+            },
+            'Premium_Template': {
+                'development': 1000,
+                'infrastructure': 100,
+                'marketing': 500
+            },
+            'Support_Consulting': {
+                'development': 500,
+                'infrastructure': 100,
+                'marketing': 300
+            }
+        }
+        
+        # 评估结果缓存：分析结果和评估配置都未变化时复用上次结果
+        self.memo = MemoCache('evaluation') if os.getenv('MEMO_CACHE', '1') != '0' else None
+        
     def evaluate_monetization(self, project_analysis: Dict) -> Dict:
         """评估项目的变现潜力"""
         try:
@@ -127,31 +166,8 @@ class MonetizationEvaluator:
         
     def _estimate_setup_cost(self, path: Dict) -> Dict:
         """估算启动成本"""
-        base_costs = {
-            'SaaS': {
-                'development': 3000,
-                'infrastructure': 500,
-                'marketing': 1000
-            },
-            'API_Service': {
-                'development': 2000,
-                'infrastructure': 300,
-                'marketing': 700
-            },
-            'Premium_Template': {
-                'development': 1000,
-                'infrastructure': 100,
-                'marketing': 500
-            },
-            'Support_Consulting': {
-                'development': 500,
-                'infrastructure': 100,
-                'marketing': 300
-            }
-        }
-        
         path_type = path['type'].replace(' ', '_')
-        costs = base_costs.get(path_type, {})
+        costs = self.setup_costs.get(path_type, {})
         
         return {
             'development_cost': costs.get('development', 0),
@@ -186,7 +202,7 @@ class MonetizationEvaluator:
         """分析市场情况"""
         return {
             'market_size': 'medium',  # 可以通过API获取更准确的市场规模数据
-            'competition_level': 'moderate',
+            'competition_level': (project_analysis.get('competition') or {}).get('level', 'moderate'),
             'growth_potential': 'high' if project_analysis['evaluation']['market_score'] > 0.7 else 'medium',
             'target_audience': self._identify_target_audience(project_analysis)
         }
@@ -194,56 +210,227 @@ class MonetizationEvaluator:
     def _identify_target_audience(self, project_analysis: Dict) -> List[str]:
         """识别目标用户群体"""
         audiences = []
-        topics = project_analysis.get('topics', [])
+        features = project_analysis.get('features')
+        features = set(features) if features is not None else classify_topics(project_analysis.get('topics'))
         
-        if 'enterprise' in str(topics).lower():
+        if 'enterprise' in features:
             audiences.append('Enterprise')
-        if 'developer-tools' in str(topics).lower():
+        if 'developer_tools' in features:
             audiences.append('Developers')
-        if 'automation' in str(topics).lower():
+        if 'automation' in features:
             audiences.append('DevOps')
             
         return audiences or ['General Developers']
         
-    def save_evaluation(self, evaluation: Dict, filename: str = 'data/monetization_evaluation.json'):
-        """保存评估结果"""
+    def save_evaluation(self, evaluation: List[Dict], run_id: Optional[str] = None, filename: Optional[str] = None):
+        """保存评估结果，指定 filename 时同时导出JSON"""
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'timestamp': datetime.now().isoformat(),
-                    'evaluation': evaluation
-                }, f, ensure_ascii=False, indent=2)
+            store = get_result_store()
+            store.save_evaluations(run_id or store.start_run(), evaluation)
+            
+            if filename:
+                with open(filename, 'w', encoding='utf-8') as f:
+                    json.dump({
+                        'timestamp': datetime.now().isoformat(),
+                        'evaluation': evaluation
+                    }, f, ensure_ascii=False, indent=2)
         except Exception as e:
             print(f"Error saving evaluation: {str(e)}")
             
-    def batch_evaluate(self, analyzed_projects: List[Dict]) -> List[Dict]:
-        """批量评估项目"""
-        results = []
-        for project in analyzed_projects:
-            evaluation = self.evaluate_monetization(project)
-            if evaluation:
-                results.append(evaluation)
+    def _collect_path_pairs(self, analyses: List[Dict], model_index: Dict[str, int]) -> Dict:
+        """
+        把分析结果展开为 (项目, 变现路径) 对
+
+        逐个评估时会输出错误的项目（缺字段、路径格式不对、没有可评估的路径等）
+        不展开，由调用方走 evaluate_monetization。
+        """
+        pair_project, pair_model, pair_path = [], [], []
+        base_scores, starts, counts, rows = [], [], [], {}
+        
+        for i, analysis in enumerate(analyses):
+            try:
+                base_score = analysis['evaluation']['monetization_score']
+                if not isinstance(base_score, (int, float)) or not math.isfinite(base_score):
+                    continue
+                if 'project_id' not in analysis:
+                    continue
+                paths = analysis.get('monetization_paths', [])
+                if not isinstance(paths, list):
+                    continue
+                    
+                pairs = []
+                for path in paths:
+                    model = model_index.get(path['type'].replace(' ', '_'))
+                    if model is None:
+                        continue
+                    if 'difficulty' not in path:
+                        # 缺少难度的路径在逐个评估时会输出错误，整个项目交由逐个评估
+                        pairs = None
+                        break
+                    pairs.append((model, path))
+            except Exception:
+                continue
+            if not pairs:
+                continue
+                
+            rows[i] = len(base_scores)
+            starts.append(len(pair_project))
+            counts.append(len(pairs))
+            base_scores.append(base_score)
+            for model, path in pairs:
+                pair_project.append(rows[i])
+                pair_model.append(model)
+                pair_path.append(path)
                 
-        # 按潜在收入排序
-        results.sort(
+        return {
+            'rows': rows,
+            'base_scores': np.array(base_scores, dtype=np.float64),
+            'starts': np.array(starts, dtype=np.intp),
+            'counts': np.array(counts, dtype=np.intp),
+            'pair_project': np.array(pair_project, dtype=np.intp),
+            'pair_model': np.array(pair_model, dtype=np.intp),
+            'pair_path': pair_path
+        }
+        
+    def _iter_evaluations_vectorized(self, analyses: List[Dict]) -> Iterator[Dict]:
+        """按 (项目 × 路径) 矩阵批量评估，按输入顺序产出与逐个调用 evaluate_monetization 相同的结果"""
+        model_names = list(self.monetization_models)
+        model_index = {name: m for m, name in enumerate(model_names)}
+        models = [self.monetization_models[name] for name in model_names]
+        
+        # 每个变现模式的常量只计算一次
+        min_revenue = np.array([model['min_revenue'] for model in models], dtype=np.float64)
+        scalability = np.array([model['scalability'] for model in models], dtype=np.float64)
+        maintenance_cost = np.array([model['maintenance_cost'] for model in models], dtype=np.float64)
+        setup_costs = [self._estimate_setup_cost({'type': name}) for name in model_names]
+        total_cost = np.array([cost['total_cost'] for cost in setup_costs], dtype=np.float64)
+        platforms = [self._recommend_platforms(name) for name in model_names]
+        
+        pairs = self._collect_path_pairs(analyses, model_index)
+        pair_model = pairs['pair_model']
+        
+        # 潜在收入、净收入和回报周期，运算顺序与逐个评估一致
+        market_factor = 1 + (pairs['base_scores'][pairs['pair_project']] - 0.5) * 2
+        scale_factor = 1 + scalability[pair_model] * 0.5
+        potential = min_revenue[pair_model] * market_factor * scale_factor
+        net = potential * (1 - maintenance_cost[pair_model])
+        positive = net > 0
+        roi = np.full(len(net), np.inf)
+        np.divide(total_cost[pair_model], net, out=roi, where=positive)
+        
+        potential_rounded = [round(value, 2) for value in potential.tolist()]
+        net_rounded = [round(value, 2) for value in net.tolist()]
+        roi_rounded = [round(value, 1) for value in roi.tolist()]
+        
+        # 每个项目取四舍五入后潜在收入最高的路径，同为最高时取靠前的
+        best = np.empty(0, dtype=np.intp)
+        if len(pairs['starts']):
+            ranked = np.array(potential_rounded, dtype=np.float64)
+            group_max = np.maximum.reduceat(ranked, pairs['starts'])
+            is_max = ranked == np.repeat(group_max, pairs['counts'])
+            positions = np.where(is_max, np.arange(len(ranked)), len(ranked))
+            best = np.minimum.reduceat(positions, pairs['starts'])
+        best = best.tolist()
+        starts = pairs['starts'].tolist()
+        counts = pairs['counts'].tolist()
+        pair_model = pair_model.tolist()
+        
+        for i, analysis in enumerate(analyses):
+            row = pairs['rows'].get(i)
+            evaluation = None
+            if row is not None:
+                try:
+                    evaluated_paths = []
+                    best_path = None
+                    for k in range(starts[row], starts[row] + counts[row]):
+                        model, path = models[pair_model[k]], pairs['pair_path'][k]
+                        evaluated = {
+                            'type': path['type'],
+                            'difficulty': path['difficulty'],
+                            'setup_time_days': model['setup_time'],
+                            'potential_monthly_revenue': potential_rounded[k],
+                            'net_monthly_revenue': net_rounded[k],
+                            'maintenance_cost_percentage': model['maintenance_cost'] * 100,
+                            'scalability_score': model['scalability'],
+                            'passive_income_potential': model['passive_income'],
+                            'roi_period_months': roi_rounded[k],
+                            'recommended_platforms': [dict(p) for p in platforms[pair_model[k]]]
+                        }
+                        evaluated_paths.append(evaluated)
+                        if k == best[row]:
+                            best_path = evaluated
+                            best_model = pair_model[k]
+                            
+                    evaluation = {
+                        'project_id': analysis['project_id'],
+                        'monetization_potential': {
+                            'score': analysis['evaluation']['monetization_score'],
+                            'evaluated_paths': evaluated_paths,
+                            'recommended_path': best_path,
+                            'estimated_setup_cost': dict(setup_costs[best_model]),
+                            'market_analysis': self._analyze_market(analysis)
+                        }
+                    }
+                except Exception:
+                    evaluation = None
+                    
+            # 无法按矩阵评估的项目走逐个评估路径（包括错误输出）
+            yield evaluation if evaluation is not None else self.evaluate_monetization(analysis)
+            
+    def _config_hash(self) -> str:
+        """评估配置哈希，配置变化后缓存自动失效"""
+        return stable_hash([EVALUATION_VERSION, self.monetization_models, self.platform_scores, self.setup_costs])
+        
+    def batch_evaluate(
+        self,
+        analyzed_projects: List[Dict],
+        top_k: Optional[int] = None,
+        vectorized: bool = True
+    ) -> List[Dict]:
+        """批量评估项目
+        
+        Args:
+            analyzed_projects: 项目分析结果
+            top_k: 只保留潜在收入最高的K个，默认全部保留
+            vectorized: 是否按矩阵批量评估；为False时逐个调用 evaluate_monetization
+            
+        Returns:
+            List[Dict]: 按潜在收入降序排列的评估结果，同分时保持输入顺序
+        """
+        def compute(batch: List[Dict]) -> Iterator[Dict]:
+            if vectorized:
+                return self._iter_evaluations_vectorized(batch)
+            return (self.evaluate_monetization(project) for project in batch)
+            
+        if self.memo:
+            config_hash = self._config_hash()
+            keys = [
+                self.memo.make_key({field: project.get(field) for field in EVALUATION_FIELDS}, config_hash)
+                if isinstance(project, dict) else None
+                for project in analyzed_projects
+            ]
+            evaluations = self.memo.iter_cached(analyzed_projects, keys, compute)
+        else:
+            evaluations = compute(analyzed_projects)
+            
+        # 按潜在收入选取
+        ranking = TopK(
+            top_k,
             key=lambda x: x.get('monetization_potential', {})
-                         .get('recommended_path', {})
-                         .get('potential_monthly_revenue', 0),
-            reverse=True
+                          .get('recommended_path', {})
+                          .get('potential_monthly_revenue', 0)
         )
-        
-        return results
+        ranking.extend(evaluation for evaluation in evaluations if evaluation)
+        return ranking.items()
 
 if __name__ == "__main__":
     # 测试评估器
     evaluator = MonetizationEvaluator()
     
-    # 读取分析数据
+    # 读取最近一次分析结果
     try:
-        with open('data/project_analysis.json', 'r', encoding='utf-8') as f:
-            analyzed_data = json.load(f)
-            results = evaluator.batch_evaluate(analyzed_data.get('analysis', []))
-            evaluator.save_evaluation(results)
-            print(f"评估完成，处理了 {len(results)} 个项目")
+        results = evaluator.batch_evaluate(get_result_store().load_analyses())
+        evaluator.save_evaluation(results)
+        print(f"评估完成，处理了 {len(results)} 个项目")
     except Exception as e:
-        print(f"Error reading project analysis: {str(e)}") 
\ No newline at end of file
+        print(f"Error reading project analysis: {str(e)}")
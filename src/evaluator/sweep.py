@@ -0,0 +1,395 @@
+"""
+变现假设参数扫描模块
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from src.evaluator import criteria
+from src.evaluator.monetization_evaluator import MonetizationEvaluator
+from src.storage import ResultStore, get_result_store
+
+# 综合评分各项，顺序与 criteria.WEIGHTS 一致
+WEIGHT_KEYS = list(criteria.WEIGHTS)
+
+# 单个分块中 场景数 × 路径数 的上限，控制中间数组的内存
+MAX_CHUNK_ELEMENTS = 2_000_000
+
+# 可按变现模式逐个扫描的 monetization_models 字段
+MODEL_FIELDS = ('min_revenue', 'scalability', 'maintenance_cost')
+
+# evaluator: 与 MonetizationEvaluator 相同，按潜在收入选路径和排名
+# criteria: 按 criteria.WEIGHTS 综合评分（计入平台手续费）选路径和排名
+SCORING_MODES = ('evaluator', 'criteria')
+
+
+class ParameterSweep:
+    """在已保存的分析结果上批量试算不同的变现假设
+
+    每个场景是以下参数的一种组合：
+
+    - ``revenue_scale``: 各变现模式最低月收入的倍数
+    - ``maintenance_scale``: 维护成本比例的倍数
+    - ``max_roi_months``: 最大投资回报周期（``criteria.MAX_ROI_PERIOD_MONTHS``）
+    - ``model_scales``: 单个变现模式的最低月收入、可扩展性、维护成本的倍数
+    - ``fee_scale``: 平台手续费比例的倍数（``criteria.PLATFORM_CRITERIA``），仅 criteria 模式
+    - ``weights``: 综合评分权重（``criteria.WEIGHTS``），仅 criteria 模式
+
+    默认（evaluator 模式）与流水线中的 MonetizationEvaluator 一致：每个项目取潜在收入
+    最高的路径，项目按该路径的潜在收入排名，参数全为默认值的场景即 ``batch_evaluate``
+    的结果。全局倍数对所有项目等比缩放，不改变排名；排名稳定性要靠
+    ``model_scales`` 改变各变现模式之间的相对收益。criteria 模式改用 ``criteria.py`` 的综合评分，流水线不使用该模型，
+    只用于比较另一套评分假设。
+
+    (项目, 变现路径) 对只展开一次，所有场景按分块广播计算，
+    不调用 API，也不逐个重新评估。
+    """
+
+    def __init__(
+        self,
+        analyses: List[Dict],
+        evaluator: Optional[MonetizationEvaluator] = None,
+        max_chunk_elements: int = MAX_CHUNK_ELEMENTS
+    ):
+        self.evaluator = evaluator or MonetizationEvaluator()
+        self.max_chunk_elements = max_chunk_elements
+
+        model_names = list(self.evaluator.monetization_models)
+        models = [self.evaluator.monetization_models[name] for name in model_names]
+        pairs = self.evaluator._collect_path_pairs(analyses, {name: m for m, name in enumerate(model_names)})
+
+        self.project_ids: List[str] = [None] * len(pairs['rows'])
+        for i, row in pairs['rows'].items():
+            self.project_ids[row] = analyses[i]['project_id']
+        self._starts = pairs['starts']
+        self._counts = pairs['counts']
+        pair_model = pairs['pair_model']
+        self._pair_model = pair_model
+
+        def model_vector(values) -> np.ndarray:
+            return np.array(values, dtype=np.float64)[pair_model]
+
+        # 与 MonetizationEvaluator 相同的潜在收入公式，各模式的参数按场景缩放后再展开到路径
+        self.model_names = model_names
+        self._model_values = {
+            field: np.array([model[field] for model in models], dtype=np.float64) for field in MODEL_FIELDS
+        }
+        self._market_factor = 1 + (pairs['base_scores'][pairs['pair_project']] - 0.5) * 2
+        self._passive = model_vector([model['passive_income'] for model in models])
+
+        # 手续费按首选销售平台计算，没有推荐平台时为0
+        fees = []
+        for name in model_names:
+            platforms = self.evaluator._recommend_platforms(name)
+            platform = criteria.PLATFORM_CRITERIA.get(platforms[0]['name'], {}) if platforms else {}
+            fees.append(platform.get('fee_percentage', 0))
+        self._fee = model_vector(fees)
+
+        self._setup_cost = model_vector([
+            self.evaluator._estimate_setup_cost({'type': name})['total_cost'] for name in model_names
+        ])
+        # 不超过上限得1，超过时按超出的倍数递减
+        self._setup_factor = criteria.MAX_SETUP_COST / np.maximum(self._setup_cost, criteria.MAX_SETUP_COST)
+
+        hours = criteria.TIME_INVESTMENT_LEVELS
+        self._time_factor = 1 - np.array([
+            hours.get(path.get('difficulty'), hours['medium']) / hours['high'] for path in pairs['pair_path']
+        ], dtype=np.float64)
+
+    @classmethod
+    def from_store(
+        cls,
+        run_id: Optional[str] = None,
+        store: Optional[ResultStore] = None,
+        **kwargs
+    ) -> 'ParameterSweep':
+        """使用结果库中某次运行（默认最近一次）的分析结果"""
+        return cls((store or get_result_store()).load_analyses(run_id), **kwargs)
+
+    def _best_paths(self, score: np.ndarray) -> np.ndarray:
+        """每个场景中每个项目得分最高的路径位置，同分时取靠前的"""
+        best_score = np.maximum.reduceat(score, self._starts, axis=1)
+        is_max = score == np.repeat(best_score, self._counts, axis=1)
+        positions = np.where(is_max, np.arange(score.shape[1]), score.shape[1])
+        return np.minimum.reduceat(positions, self._starts, axis=1)
+
+    def _path_terms(self, params: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        计算一组场景下每条路径的潜在收入和维护成本比例
+
+        Args:
+            params: 参数名到长度为场景数的数组，单个模式的倍数以 ``模式名.字段`` 为键
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: 场景数 × 路径数 的潜在收入和维护成本比例
+        """
+        count = len(params['revenue_scale'])
+        values = {}
+        for field, base in self._model_values.items():
+            matrix = np.tile(base, (count, 1))
+            for m, name in enumerate(self.model_names):
+                scale = params.get(f'{name}.{field}')
+                if scale is not None:
+                    matrix[:, m] *= scale
+            values[field] = matrix[:, self._pair_model]
+
+        min_revenue = values['min_revenue'] * params['revenue_scale'][:, None]
+        potential = min_revenue * self._market_factor * (1 + values['scalability'] * 0.5)
+        maintenance = np.minimum(values['maintenance_cost'] * params['maintenance_scale'][:, None], 1.0)
+        return potential, maintenance
+
+    def _score_evaluator(self, params: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        按 MonetizationEvaluator 的公式计算一组场景下每个项目的推荐路径
+
+        Returns:
+            Dict[str, np.ndarray]: 场景数 × 项目数 的得分（推荐路径的潜在收入）、
+            推荐路径净收入和推荐路径回报周期是否在上限内
+        """
+        potential, maintenance = self._path_terms(params)
+        net = potential * (1 - maintenance)
+
+        roi = np.full(net.shape, np.inf)
+        np.divide(np.broadcast_to(self._setup_cost, net.shape), net, out=roi, where=net > 0)
+
+        # 与评估器一致：取四舍五入后潜在收入最高的路径
+        ranked = np.round(potential, 2)
+        best = self._best_paths(ranked)
+        return {
+            'score': np.take_along_axis(ranked, best, axis=1),
+            'revenue': np.take_along_axis(net, best, axis=1),
+            'viable': np.take_along_axis(roi, best, axis=1) <= params['max_roi_months'][:, None]
+        }
+
+    def _score_criteria(self, params: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        按 criteria 综合评分计算一组场景下每个项目的最佳路径
+
+        ``params['weights']`` 为 场景数 × 评分项 的归一化权重。
+
+        Returns:
+            Dict[str, np.ndarray]: 场景数 × 项目数 的得分、最佳路径净收入和是否有可行路径
+        """
+        potential, maintenance = self._path_terms(params)
+        net = potential * (1 - maintenance) * (1 - np.minimum(self._fee * params['fee_scale'][:, None], 1.0))
+
+        roi = np.full(net.shape, np.inf)
+        np.divide(np.broadcast_to(self._setup_cost, net.shape), net, out=roi, where=net > 0)
+        feasible = roi <= params['max_roi_months'][:, None]
+
+        factors = {
+            'setup_cost': np.broadcast_to(self._setup_factor, net.shape),
+            'monthly_cost': criteria.MAX_MONTHLY_COST / np.maximum(
+                potential * maintenance, criteria.MAX_MONTHLY_COST
+            ),
+            'income_potential': np.clip(net / criteria.MONTHLY_INCOME_TARGET, 0.0, 1.0),
+            'passive_level': np.broadcast_to(self._passive, net.shape),
+            'time_investment': np.broadcast_to(self._time_factor, net.shape)
+        }
+        composite = np.einsum('kcp,ck->cp', np.stack([factors[key] for key in WEIGHT_KEYS]), params['weights'])
+        # 回报周期超出上限的路径得分减1，排在所有可行路径之后
+        score = composite - ~feasible
+
+        best = self._best_paths(score)
+        return {
+            'score': np.take_along_axis(score, best, axis=1),
+            'revenue': np.take_along_axis(net, best, axis=1),
+            'viable': np.logical_or.reduceat(feasible, self._starts, axis=1)
+        }
+
+    @staticmethod
+    def _ranks(score: np.ndarray) -> np.ndarray:
+        """每个场景内按得分降序的名次（从0开始，同分时保持项目顺序）"""
+        order = np.argsort(-score, axis=1, kind='stable')
+        ranks = np.empty_like(order)
+        np.put_along_axis(ranks, order, np.broadcast_to(np.arange(order.shape[1]), order.shape), axis=1)
+        return ranks
+
+    def run(
+        self,
+        revenue_scale: Sequence[float] = (1.0,),
+        maintenance_scale: Sequence[float] = (1.0,),
+        max_roi_months: Sequence[float] = (criteria.MAX_ROI_PERIOD_MONTHS,),
+        model_scales: Optional[Dict[str, Dict[str, Sequence[float]]]] = None,
+        fee_scale: Optional[Sequence[float]] = None,
+        weights: Optional[Sequence[Dict[str, float]]] = None,
+        top_k: int = 10,
+        mode: str = 'evaluator'
+    ) -> Dict:
+        """
+        对参数网格的全部组合进行评估
+
+        Args:
+            revenue_scale: 最低月收入倍数的取值，如 ``np.linspace(0.5, 1.5, 11)``
+            maintenance_scale: 维护成本倍数的取值
+            max_roi_months: 最大投资回报周期（月）的取值，evaluator 模式下只影响 ``viable_fraction``
+            model_scales: 变现模式名到 ``MODEL_FIELDS`` 中字段倍数的取值，
+                如 ``{'SaaS': {'min_revenue': [0.5, 1.0, 1.5]}}``，每个字段是网格的一维
+            fee_scale: 平台手续费倍数的取值，仅 criteria 模式，默认 ``(1.0,)``
+            weights: 综合评分权重的候选，缺少的评分项按0计，仅 criteria 模式，默认当前权重
+            top_k: 统计排名稳定性时使用的前K名
+            mode: 选路径和排名的方式，见 ``SCORING_MODES``
+
+        Returns:
+            Dict: 场景数、排名稳定性（与同一模式下的默认参数相比）和每个项目的名次及收入分布
+        """
+        if mode not in SCORING_MODES:
+            raise ValueError(f"未知的评分方式: {mode}")
+        if mode == 'evaluator' and (fee_scale is not None or weights is not None):
+            raise ValueError("手续费和评分权重只在 criteria 模式下使用")
+
+        grid = {
+            'revenue_scale': np.asarray(revenue_scale, dtype=np.float64),
+            'maintenance_scale': np.asarray(maintenance_scale, dtype=np.float64),
+            'max_roi_months': np.asarray(max_roi_months, dtype=np.float64)
+        }
+        for name, fields in (model_scales or {}).items():
+            if name not in self.model_names:
+                raise ValueError(f"未知的变现模式: {name}")
+            for field, values in fields.items():
+                if field not in MODEL_FIELDS:
+                    raise ValueError(f"不支持扫描的字段: {field}")
+                grid[f'{name}.{field}'] = np.asarray(values, dtype=np.float64)
+        weight_matrix = None
+        if mode == 'criteria':
+            grid['fee_scale'] = np.asarray((1.0,) if fee_scale is None else fee_scale, dtype=np.float64)
+            weights = (criteria.WEIGHTS,) if weights is None else weights
+            weight_matrix = np.array(
+                [[weight.get(key, 0.0) for key in WEIGHT_KEYS] for weight in weights], dtype=np.float64
+            ).reshape(-1, len(WEIGHT_KEYS))
+        if any(values.size == 0 for values in grid.values()):
+            raise ValueError("参数取值不能为空")
+        if weight_matrix is not None:
+            if not len(weight_matrix):
+                raise ValueError("参数取值不能为空")
+            weight_sums = weight_matrix.sum(axis=1, keepdims=True)
+            if np.any(weight_sums <= 0):
+                raise ValueError("评分权重之和必须大于0")
+            weight_matrix = weight_matrix / weight_sums
+
+        # 场景为全部参数取值的笛卡尔积
+        sizes = [values.size for values in grid.values()]
+        if weight_matrix is not None:
+            sizes.append(len(weight_matrix))
+        index = np.indices(sizes).reshape(len(sizes), -1)
+        scenarios = {name: values[i] for (name, values), i in zip(grid.items(), index)}
+        if weight_matrix is not None:
+            scenarios['weights'] = weight_matrix[index[-1]]
+        total = index.shape[1]
+        scorer = self._score_criteria if mode == 'criteria' else self._score_evaluator
+
+        result = {
+            'mode': mode,
+            'scenarios': total,
+            'parameters': {name: values.tolist() for name, values in grid.items()},
+            'projects': []
+        }
+        if weight_matrix is not None:
+            result['parameters']['weights'] = [dict(weight) for weight in weights]
+        projects = len(self.project_ids)
+        if not projects:
+            return result
+
+        # 当前配置作为对照，evaluator 模式下即流水线的评估结果
+        baseline_params = {
+            'revenue_scale': np.ones(1),
+            'maintenance_scale': np.ones(1),
+            'max_roi_months': np.array([criteria.MAX_ROI_PERIOD_MONTHS], dtype=np.float64)
+        }
+        if mode == 'criteria':
+            baseline_weights = np.array([[criteria.WEIGHTS[key] for key in WEIGHT_KEYS]], dtype=np.float64)
+            baseline_params.update(fee_scale=np.ones(1), weights=baseline_weights / baseline_weights.sum())
+        baseline = scorer(baseline_params)
+        baseline_ranks = self._ranks(baseline['score'])[0]
+        k = min(top_k, projects)
+        baseline_top = baseline_ranks < k
+
+        rank_sum = np.zeros(projects)
+        rank_sq = np.zeros(projects)
+        rank_min = np.full(projects, projects)
+        rank_max = np.zeros(projects, dtype=np.intp)
+        top_count = np.zeros(projects, dtype=np.int64)
+        viable_count = np.zeros(projects, dtype=np.int64)
+        revenues = np.empty((total, projects), dtype=np.float32)
+        spearman = np.empty(total)
+        overlap = np.empty(total)
+
+        chunk = max(1, self.max_chunk_elements // max(len(self._pair_model), 1))
+        for start in range(0, total, chunk):
+            stop = min(start + chunk, total)
+            scored = scorer({name: values[start:stop] for name, values in scenarios.items()})
+            ranks = self._ranks(scored['score'])
+
+            rank_sum += ranks.sum(axis=0)
+            rank_sq += (ranks.astype(np.float64) ** 2).sum(axis=0)
+            rank_min = np.minimum(rank_min, ranks.min(axis=0))
+            rank_max = np.maximum(rank_max, ranks.max(axis=0))
+            in_top = ranks < k
+            top_count += in_top.sum(axis=0)
+            viable_count += scored['viable'].sum(axis=0)
+            revenues[start:stop] = scored['revenue']
+
+            if projects > 1:
+                d = (ranks - baseline_ranks).astype(np.float64)
+                spearman[start:stop] = 1 - 6 * (d ** 2).sum(axis=1) / (projects * (projects ** 2 - 1))
+            else:
+                spearman[start:stop] = 1.0
+            overlap[start:stop] = (in_top & baseline_top).sum(axis=1) / k if k else 1.0
+
+        least_stable = int(np.argmin(spearman))
+        result['stability'] = {
+            'top_k': k,
+            'spearman_mean': round(float(spearman.mean()), 4),
+            'spearman_min': round(float(spearman.min()), 4),
+            'top_k_overlap_mean': round(float(overlap.mean()), 4),
+            'top_k_overlap_min': round(float(overlap.min()), 4),
+            'least_stable_scenario': {name: float(scenarios[name][least_stable]) for name in grid}
+        }
+        if weight_matrix is not None:
+            result['stability']['least_stable_scenario']['weights'] = dict(weights[int(index[-1][least_stable])])
+
+        rank_mean = rank_sum / total
+        rank_std = np.sqrt(np.maximum(rank_sq / total - rank_mean ** 2, 0.0))
+        percentiles = np.percentile(revenues, [10, 50, 90], axis=0)
+        summaries = []
+        for i, project_id in enumerate(self.project_ids):
+            summaries.append({
+                'project_id': project_id,
+                'baseline_rank': int(baseline_ranks[i]) + 1,
+                'rank_mean': round(float(rank_mean[i]) + 1, 2),
+                'rank_std': round(float(rank_std[i]), 2),
+                'best_rank': int(rank_min[i]) + 1,
+                'worst_rank': int(rank_max[i]) + 1,
+                'top_k_frequency': round(float(top_count[i]) / total, 4),
+                'viable_fraction': round(float(viable_count[i]) / total, 4),
+                'net_monthly_revenue': {
+                    'mean': round(float(revenues[:, i].mean(dtype=np.float64)), 2),
+                    'min': round(float(revenues[:, i].min()), 2),
+                    'p10': round(float(percentiles[0, i]), 2),
+                    'p50': round(float(percentiles[1, i]), 2),
+                    'p90': round(float(percentiles[2, i]), 2),
+                    'max': round(float(revenues[:, i].max()), 2)
+                }
+            })
+        summaries.sort(key=lambda summary: (-summary['top_k_frequency'], summary['rank_mean']))
+        result['projects'] = summaries
+        return result
+
+
+if __name__ == "__main__":
+    # 在最近一次分析结果上试算一组假设
+    sweep = ParameterSweep.from_store()
+    result = sweep.run(
+        revenue_scale=np.linspace(0.5, 1.5, 11),
+        maintenance_scale=np.linspace(0.5, 1.5, 5),
+        max_roi_months=(2, 6, 12, 24),
+        model_scales={
+            'SaaS': {'min_revenue': (0.5, 1.0, 1.5)},
+            'Support_Consulting': {'maintenance_cost': (0.5, 1.0, 1.5)}
+        }
+    )
+    stability = result.get('stability', {})
+    print(f"试算 {result['scenarios']} 个场景，{len(result['projects'])} 个项目")
+    print(f"排名相关系数均值: {stability.get('spearman_mean')}，前{stability.get('top_k')}名重合率: {stability.get('top_k_overlap_mean')}")
+    for project in result['projects'][:10]:
+        revenue = project['net_monthly_revenue']
+        print(f"{project['project_id']}: 前K频率 {project['top_k_frequency']:.0%}，"
+              f"净月收入 {revenue['p10']} ~ {revenue['p90']}")
@@ -0,0 +1,53 @@
+"""
+异步并发抓取客户端
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class AsyncGitHubClient:
+    """在限定并发数下异步执行阻塞的HTTP请求
+
+    实际请求仍由同步的 ``fetch`` 函数完成（复用同一套认证、会话和错误处理），
+    这里只负责把请求调度到线程池中并用信号量限制同时在途的请求数。
+    """
+
+    def __init__(self, fetch: Callable[..., Any], max_concurrency: int = 8):
+        self.fetch = fetch
+        self.max_concurrency = max(1, int(max_concurrency))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """获取绑定到当前事件循环的信号量"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix='github-fetch'
+            )
+        return self._executor
+
+    async def request(self, *args, **kwargs) -> Any:
+        """异步执行一次请求，参数原样传给 ``fetch``"""
+        async with self._get_semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_executor(),
+                functools.partial(self.fetch, *args, **kwargs)
+            )
+
+    def close(self):
+        """关闭线程池"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,150 @@
+"""
+星标突增检测模块
+"""
+import os
+import json
+import math
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+SECONDS_PER_DAY = 86400
+
+
+class BreakoutDetector:
+    """在线检测星标增长突增的仓库
+
+    每个仓库只保存上次的星标数、时间和每日星标增量的指数加权均值/方差（O(1)状态），
+    新扫描的记录到达时立即计算增量的 z 分数，超过阈值即记为突增，无需回读历史。
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        alpha: Optional[float] = None,
+        threshold: Optional[float] = None,
+        min_samples: int = 3,
+        min_sigma: float = 1.0,
+        min_interval_hours: Optional[float] = None
+    ):
+        self.path = path or os.getenv('BREAKOUT_STATE_PATH', os.path.join('data', 'breakout_state.json'))
+        self.alpha = alpha or float(os.getenv('BREAKOUT_EWMA_ALPHA', 0.3))
+        self.threshold = threshold or float(os.getenv('BREAKOUT_SIGMA', 3))
+        # 基线至少有几个间隔后才开始判断
+        self.min_samples = min_samples
+        # 标准差下限（星标/天），避免长期零增长的仓库因一两个星标被误报
+        self.min_sigma = min_sigma
+        # 两次记录的最短间隔，间隔过短时几个星标也会折算成极高的日增速
+        self.min_interval_days = (
+            min_interval_hours if min_interval_hours is not None
+            else float(os.getenv('BREAKOUT_MIN_INTERVAL_HOURS', 1))
+        ) / 24
+
+        self.states: Dict[str, Dict] = {}
+        self.cycle_ts = time.time()
+        self._seen = set()
+        self._breakouts: Dict[str, Dict] = {}
+        self.load()
+
+    def load(self):
+        """从磁盘加载状态"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.states = json.load(f).get('repos', {})
+        except (OSError, ValueError) as e:
+            print(f"Error loading breakout state: {str(e)}")
+            self.states = {}
+
+    def save(self):
+        """原子地写回磁盘"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'timestamp': datetime.now().isoformat(),
+                    'repos': self.states
+                }, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Error saving breakout state: {str(e)}")
+
+    def start_cycle(self, ts: Optional[float] = None):
+        """开始新一轮扫描，同一轮内每个仓库只计一次"""
+        self.cycle_ts = time.time() if ts is None else ts
+        self._seen.clear()
+        self._breakouts.clear()
+
+    def observe(self, repo_info: Dict) -> Optional[Dict]:
+        """
+        处理一条仓库记录
+
+        Args:
+            repo_info: ``_extract_repo_info`` 返回的仓库信息
+
+        Returns:
+            Optional[Dict]: 判定为突增时返回突增信息，否则返回None
+        """
+        key = str(repo_info.get('id'))
+        stars = repo_info.get('stars')
+        if key in self._seen or stars is None:
+            return None
+        self._seen.add(key)
+
+        state = self.states.get(key)
+        if state is None or self.cycle_ts <= state['ts']:
+            self.states[key] = {'stars': stars, 'ts': self.cycle_ts, 'mean': 0.0, 'var': 0.0, 'n': 0}
+            return None
+
+        # 间隔不足时保留上次的记录，增量累积到下一次足够长的间隔再计算
+        days = (self.cycle_ts - state['ts']) / SECONDS_PER_DAY
+        if days < self.min_interval_days:
+            return None
+        gain = (stars - state['stars']) / max(days, 1 / 1440)
+
+        breakout = None
+        if state['n'] >= self.min_samples:
+            sigma = max(math.sqrt(state['var']), self.min_sigma)
+            z_score = (gain - state['mean']) / sigma
+            if z_score >= self.threshold:
+                breakout = {
+                    'id': repo_info.get('id'),
+                    'name': repo_info.get('name'),
+                    'stars': stars,
+                    'stars_per_day': round(gain, 2),
+                    'baseline_per_day': round(state['mean'], 2),
+                    'z_score': round(z_score, 2)
+                }
+                self._breakouts[key] = breakout
+
+        # 更新指数加权均值和方差
+        if state['n'] == 0:
+            mean, var = gain, 0.0
+        else:
+            diff = gain - state['mean']
+            increment = self.alpha * diff
+            mean = state['mean'] + increment
+            var = (1 - self.alpha) * (state['var'] + diff * increment)
+
+        self.states[key] = {
+            'stars': stars,
+            'ts': self.cycle_ts,
+            'mean': mean,
+            'var': var,
+            'n': state['n'] + 1
+        }
+        return breakout
+
+    def breakouts(self) -> List[Dict]:
+        """
+        获取本轮的突增仓库
+
+        Returns:
+            List[Dict]: 按 z 分数降序排列的突增信息
+        """
+        return sorted(self._breakouts.values(), key=lambda b: b['z_score'], reverse=True)
@@ -0,0 +1,77 @@
+"""
+延迟重试队列模块
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+from src.utils.token_pool import TokenRejected
+
+
+class StatsPendingError(Exception):
+    """GitHub仍在后台生成统计数据（HTTP 202）"""
+
+
+class DeferredRetryQueue:
+    """非阻塞的延迟重试队列
+
+    收到202的请求被挂起为后台任务，按指数退避重新轮询，
+    期间其他仓库的抓取照常进行；``drain`` 等待所有挂起任务并返回结果。
+    """
+
+    def __init__(self, base_delay: float = 2.0, max_delay: float = 60.0, max_attempts: int = 6):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self.stats = {'parked': 0, 'resolved': 0, 'expired': 0}
+        self._tasks: Dict[str, asyncio.Future] = {}
+
+    def park(self, key: str, fetch: Callable[[], Awaitable[Any]]):
+        """
+        挂起一个待重试的请求
+
+        Args:
+            key: 结果键（如仓库名）
+            fetch: 重新发起请求的协程工厂，数据未就绪时抛出 StatsPendingError
+        """
+        if key in self._tasks:
+            return
+        self.stats['parked'] += 1
+        self._tasks[key] = asyncio.ensure_future(self._poll(key, fetch))
+
+    async def _poll(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        delay = self.base_delay
+        for _ in range(self.max_attempts):
+            await asyncio.sleep(delay)
+            try:
+                result = await fetch()
+                self.stats['resolved'] += 1
+                return result
+            except StatsPendingError:
+                delay = min(self.max_delay, delay * 2)
+
+        print(f"统计数据仍未就绪，放弃重试: {key}")
+        self.stats['expired'] += 1
+        return None
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    async def drain(self) -> Dict[str, Any]:
+        """
+        等待所有挂起的请求完成
+
+        Returns:
+            Dict[str, Any]: 成功获取的结果，键为挂起时的 key
+        """
+        keys = list(self._tasks)
+        outcomes = await asyncio.gather(*(self._tasks[k] for k in keys), return_exceptions=True)
+        self._tasks.clear()
+
+        results = {}
+        for key, outcome in zip(keys, outcomes):
+            if isinstance(outcome, TokenRejected):
+                raise outcome
+            if isinstance(outcome, Exception):
+                print(f"重试 {key} 时出错: {str(outcome)}")
+            elif outcome is not None:
+                results[key] = outcome
+        return results
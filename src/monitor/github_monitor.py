@@ -1,23 +1,92 @@
 import os
 import json
+import math
+import time
+import asyncio
+import itertools
 import requests
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Iterator, Optional
+from urllib.parse import parse_qs, urlsplit
+from requests.utils import parse_header_links
 from dotenv import load_dotenv
+from src.monitor.async_client import AsyncGitHubClient
+from src.utils.http_client import get_http_client
+from src.utils.http_cache import HTTPCache
+from src.utils.token_pool import TokenRejected, get_token_pool
+from src.monitor.rate_limiter import RateLimitScheduler
+from src.monitor.deferred_queue import DeferredRetryQueue, StatsPendingError
+from src.monitor.graphql_enricher import GraphQLEnricher
+from src.monitor.search_enumerator import SearchEnumerator
+from src.monitor.state_store import RepoStateStore
+from src.monitor.query_planner import plan_search_queries, match_keywords
+from src.monitor.breakout_detector import BreakoutDetector
+from src.storage import get_result_store, MetricSeriesStore
+from src.utils.pipeline import BoundedStream
+from src.utils.checkpoint import CheckpointStore
 
 load_dotenv()
 
 class GitHubMonitor:
     def __init__(self):
-        self.github_token = os.getenv('GITHUB_TOKEN')
-        self.headers = {'Authorization': f'token {self.github_token}'}
-        self.base_url = "https://api.github.com"
+        # 令牌池：GITHUB_TOKENS 可配置多个令牌，每次请求选用剩余额度最多的一个
+        self.token_pool = get_token_pool()
+        self.headers = {'Accept': 'application/vnd.github+json'}
+        # 可指向离线替身服务，见 tests/fixtures/github_stub_server.py
+        self.base_url = os.getenv('GITHUB_API_URL', 'https://api.github.com').rstrip('/')
+        self.http = get_http_client()
+        
+        # 条件请求缓存，304响应不计入速率限制
+        self.cache = HTTPCache() if os.getenv('GITHUB_HTTP_CACHE', '1') != '0' else None
+        
+        # 按 core/search 配额分别节流
+        self.scheduler = RateLimitScheduler(
+            max_wait=float(os.getenv('GITHUB_MAX_RATE_LIMIT_WAIT', 900)),
+            scale=len(self.token_pool)
+        )
+        self.max_retries = int(os.getenv('GITHUB_MAX_RETRIES', 3))
+        
+        # 统计数据生成中（202）时的重试退避配置
+        self.stats_retry_delay = float(os.getenv('STATS_RETRY_BASE_DELAY', 2))
+        self.stats_retry_attempts = int(os.getenv('STATS_RETRY_MAX_ATTEMPTS', 6))
+        
+        # 问题/PR计数方式：link 用分页头计算（core配额），search 用搜索总数（可区分已合并PR）
+        self.issue_count_mode = os.getenv('ISSUE_COUNT_MODE', 'link')
+        
+        # 详情获取方式：rest 每个仓库4个请求，graphql 每批仓库1个请求
+        self.enrichment_mode = os.getenv('GITHUB_ENRICHMENT_MODE', 'rest')
+        self.graphql = GraphQLEnricher(self, batch_size=int(os.getenv('GRAPHQL_BATCH_SIZE', 25)))
+        
+        # 增量监控：上游时间戳未变化的仓库复用上次的补充信息
+        self.state_store = RepoStateStore() if os.getenv('INCREMENTAL_MONITOR', '1') != '0' else None
+        
+        # 每次扫描追加星标/分叉/问题数快照，用于计算增长速度
+        self.timeseries = MetricSeriesStore() if os.getenv('TREND_HISTORY', '1') != '0' else None
+        
+        # 星标突增检测：搜索结果到达时逐条更新，每轮给出按 z 分数排序的突增列表
+        self.breakout_detector = BreakoutDetector() if os.getenv('BREAKOUT_DETECTION', '1') != '0' else None
+        self.breakouts: List[Dict] = []
         
         # 监控配置
         self.min_stars = int(os.getenv('MIN_STARS', 100))
         self.min_forks = int(os.getenv('MIN_FORKS', 20))
         self.days_since_update = int(os.getenv('DAYS_SINCE_UPDATE', 30))
         
+        # 搜索方式：top 每个关键词取前5个，exhaustive 按日期窗口遍历全部结果
+        self.search_mode = os.getenv('GITHUB_SEARCH_MODE', 'top')
+        self.search_date_field = os.getenv('SEARCH_DATE_FIELD', 'created')
+        
+        # 是否把多个关键词合并成 OR 查询以减少搜索请求
+        self.combine_keywords = os.getenv('SEARCH_COMBINE_KEYWORDS', '0') == '1'
+        
+        # 并发配置：同时在途的详情请求数
+        self.max_concurrency = int(os.getenv('MONITOR_CONCURRENCY', 8))
+        self.async_client = AsyncGitHubClient(self._request, self.max_concurrency)
+        
+        # 流式监控时每批获取详情的仓库数，每批完成即交给下游
+        self.stream_chunk_size = max(1, int(os.getenv('MONITOR_STREAM_CHUNK', 100)))
+        
         # 关键词配置
         self.keywords = [
             'ai', 'machine-learning', 'automation',
@@ -25,12 +94,39 @@ class GitHubMonitor:
             'discord-bot', 'telegram-bot', 'web3'
         ]
         
+    def _plan_queries(self, keywords: Optional[List[str]] = None) -> List[tuple]:
+        """生成 (查询, 关键词列表)，按配置决定是否合并关键词"""
+        keywords = keywords or self.keywords
+        qualifiers = f"stars:>{self.min_stars}"
+        if self.combine_keywords:
+            return plan_search_queries(keywords, qualifiers)
+        return [(f"{keyword} {qualifiers}", [keyword]) for keyword in keywords]
+        
+    @staticmethod
+    def _merge_repo(repos_by_id: Dict, repo_info: Dict, keywords: List[str]) -> bool:
+        """按仓库id去重并合并命中的关键词，返回是否为新仓库"""
+        existing = repos_by_id.get(repo_info['id'])
+        if existing:
+            for keyword in keywords:
+                if keyword not in existing['matched_keywords']:
+                    existing['matched_keywords'].append(keyword)
+            return False
+            
+        repo_info['matched_keywords'] = list(keywords)
+        repos_by_id[repo_info['id']] = repo_info
+        return True
+        
+    def _matched_keywords(self, repo_info: Dict, query_keywords: List[str]) -> List[str]:
+        """单关键词查询直接返回该关键词，合并查询在本地判断命中了哪些"""
+        if len(query_keywords) == 1:
+            return query_keywords
+        return match_keywords(repo_info, query_keywords) or query_keywords
+        
     def search_trending_repos(self) -> List[Dict]:
         """搜索趋势项目"""
-        trending_repos = []
+        repos_by_id = {}
         
-        for keyword in self.keywords:
-            query = f"{keyword} stars:>{self.min_stars}"  # 简化搜索条件
+        for query, query_keywords in self._plan_queries():
             url = f"{self.base_url}/search/repositories"
             params = {
                 'q': query,
@@ -39,19 +135,66 @@ class GitHubMonitor:
             }
             
             try:
-                response = requests.get(url, headers=self.headers, params=params)
-                response.raise_for_status()
-                data = response.json()
+                data = self._request(url, params=params).json()
                 
-                for repo in data.get('items', [])[:5]:  # 每个关键词只取前5个结果
+                # 每个关键词取前5个结果，合并查询按命中的关键词分别计数；
+                # 其余结果只用于突增检测，检测到突增的也一并保留
+                taken = Counter()
+                for repo in data.get('items', []):
                     repo_info = self._extract_repo_info(repo)
-                    if repo_info:
-                        trending_repos.append(repo_info)
+                    if not repo_info:
+                        continue
+                    breakout = self._observe(repo_info)
+                    matched = self._matched_keywords(repo_info, query_keywords)
+                    if any(taken[keyword] < 5 for keyword in matched):
+                        taken.update(matched)
+                    elif not breakout:
+                        continue
+                    self._merge_repo(repos_by_id, repo_info, matched)
                         
+            except TokenRejected:
+                raise
             except Exception as e:
-                print(f"Error searching for {keyword}: {str(e)}")
+                print(f"Error searching for {', '.join(query_keywords)}: {str(e)}")
                 
-        return trending_repos
+        return list(repos_by_id.values())
+    
+    def iter_search_repos(self, keywords: Optional[List[str]] = None) -> Iterator[Dict]:
+        """按日期窗口遍历每个关键词的全部搜索结果
+        
+        已返回过的仓库不再重复产出，只把新命中的关键词追加到其 ``matched_keywords``；
+        判定为突增的仓库带上 ``breakout`` 字段，边搜索边处理时不必等整轮检测结束。
+        """
+        enumerator = SearchEnumerator(self, date_field=self.search_date_field)
+        repos_by_id = {}
+        
+        for query, query_keywords in self._plan_queries(keywords):
+            for repo in enumerator.iter_items(query):
+                repo_info = self._extract_repo_info(repo)
+                if repo_info:
+                    breakout = self._observe(repo_info)
+                    if breakout:
+                        repo_info['breakout'] = breakout
+                if repo_info and self._merge_repo(
+                    repos_by_id,
+                    repo_info,
+                    self._matched_keywords(repo_info, query_keywords)
+                ):
+                    yield repo_info
+                    
+    def _observe(self, repo_info: Dict) -> Optional[Dict]:
+        """把搜索到的仓库交给突增检测器，返回突增信息"""
+        if self.breakout_detector:
+            return self.breakout_detector.observe(repo_info)
+        return None
+            
+    def _search_repos(self) -> List[Dict]:
+        """按配置的搜索方式获取候选项目"""
+        if self.breakout_detector:
+            self.breakout_detector.start_cycle()
+        if self.search_mode == 'exhaustive':
+            return list(self.iter_search_repos())
+        return self.search_trending_repos()
     
     def _extract_repo_info(self, repo: Dict) -> Optional[Dict]:
         """提取仓库信息"""
@@ -64,137 +207,550 @@ class GitHubMonitor:
                 'stars': repo['stargazers_count'],
                 'forks': repo['forks_count'],
                 'language': repo['language'],
-                'license': repo.get('license', {}).get('spdx_id', 'Unknown'),
+                'license': (repo.get('license') or {}).get('spdx_id', 'Unknown'),
                 'created_at': repo['created_at'],
                 'updated_at': repo['updated_at'],
+                'pushed_at': repo.get('pushed_at'),
                 'topics': repo.get('topics', []),
                 'open_issues': repo['open_issues_count']
             }
         except KeyError:
             return None
             
+    def _send(
+        self,
+        url: str,
+        headers: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        payload: Optional[Dict] = None
+    ) -> requests.Response:
+        """在配额允许时发送请求（有 payload 时为POST）
+
+        被限流时等待后重试；令牌被拒绝（401）时移出令牌池并换下一个令牌重试，
+        全部令牌都被拒绝时由令牌池抛出 TokenRejected。
+        """
+        resource = self.scheduler.classify(url)
+        
+        attempt = 0
+        while True:
+            self.scheduler.acquire(resource)
+            token = self.token_pool.acquire(resource)
+            request_headers = dict(headers or {})
+            if token:
+                request_headers['Authorization'] = f'token {token}'
+                
+            if payload is None:
+                response = self.http.get(url, headers=request_headers, params=params)
+            else:
+                response = self.http.post(url, headers=request_headers, json=payload)
+            if response.status_code == 401 and token:
+                remaining = self.token_pool.reject(token)
+                print(f"GitHub API拒绝了令牌 ...{token[-4:]}，已移出令牌池（剩余 {remaining} 个）")
+                continue
+            self.token_pool.update(token, resource, response.headers)
+            self.scheduler.update(resource, response)
+            
+            if not self.scheduler.is_rate_limited(response) or attempt >= self.max_retries:
+                break
+            attempt += 1
+            print(f"触发 {resource} 速率限制，等待后重试 ({attempt}/{self.max_retries}): {url}")
+            
+        return response
+        
+    def _request(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        payload: Optional[Dict] = None
+    ) -> requests.Response:
+        """发送请求并检查响应状态，GET请求经过条件请求缓存"""
+        if payload is not None:
+            response = self._send(url, headers=self.headers, payload=payload)
+        elif self.cache:
+            response = self.cache.get(self._send, url, params=params, headers=self.headers)
+        else:
+            response = self._send(url, headers=self.headers, params=params)
+        response.raise_for_status()
+        return response
+        
+    def rate_limit_state(self) -> Dict:
+        """获取当前的速率限制配额状态"""
+        return {
+            **self.scheduler.budget_state(),
+            'tokens': self.token_pool.state()
+        }
+        
     def analyze_repo_activity(self, repo_name: str) -> Dict:
         """分析仓库活跃度"""
         url = f"{self.base_url}/repos/{repo_name}/stats/commit_activity"
         
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            data = response.json()
+            response = self._request(url)
+            if response.status_code == 202:
+                raise StatsPendingError("GitHub正在生成统计数据")
+            return self._summarize_activity(response.json())
+        except TokenRejected:
+            raise
+        except Exception as e:
+            print(f"Error analyzing activity for {repo_name}: {str(e)}")
+            return {}
             
-            # 计算最近一年的提交活跃度
-            total_commits = sum(week['total'] for week in data)
-            active_weeks = sum(1 for week in data if week['total'] > 0)
+    async def _fetch_activity_async(self, repo_name: str) -> Dict:
+        """获取提交活跃度，统计数据未就绪时抛出 StatsPendingError"""
+        url = f"{self.base_url}/repos/{repo_name}/stats/commit_activity"
+        response = await self.async_client.request(url)
+        if response.status_code == 202:
+            raise StatsPendingError(repo_name)
+        return self._summarize_activity(response.json())
             
-            return {
-                'total_commits': total_commits,
-                'active_weeks': active_weeks,
-                'avg_weekly_commits': total_commits / 52 if data else 0,
-                'activity_score': active_weeks / 52 if data else 0
-            }
+    async def analyze_repo_activity_async(
+        self,
+        repo_name: str,
+        deferred: Optional[DeferredRetryQueue] = None
+    ) -> Dict:
+        """分析仓库活跃度（异步）
+        
+        统计数据未就绪时，若提供了 ``deferred`` 队列则挂起重试并先返回空结果。
+        """
+        try:
+            return await self._fetch_activity_async(repo_name)
+        except StatsPendingError:
+            if deferred is not None:
+                print(f"统计数据生成中，稍后重试: {repo_name}")
+                deferred.park(repo_name, lambda: self._fetch_activity_async(repo_name))
+            else:
+                print(f"Error analyzing activity for {repo_name}: GitHub正在生成统计数据")
+            return {}
+        except TokenRejected:
+            raise
         except Exception as e:
             print(f"Error analyzing activity for {repo_name}: {str(e)}")
             return {}
             
+    def _summarize_activity(self, data) -> Dict:
+        """汇总最近一年的提交活跃度"""
+        total_commits = sum(week['total'] for week in data)
+        active_weeks = sum(1 for week in data if week['total'] > 0)
+        
+        return {
+            'total_commits': total_commits,
+            'active_weeks': active_weeks,
+            'avg_weekly_commits': total_commits / 52 if data else 0,
+            'activity_score': active_weeks / 52 if data else 0
+        }
+            
     def get_repo_contributors(self, repo_name: str) -> List[Dict]:
         """获取贡献者信息"""
         url = f"{self.base_url}/repos/{repo_name}/contributors"
         
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            contributors = response.json()
-            
-            return [{
-                'username': c['login'],
-                'contributions': c['contributions'],
-                'profile': c['html_url']
-            } for c in contributors[:10]]  # 只获取前10名贡献者
+            return self._summarize_contributors(self._request(url).json())
+        except TokenRejected:
+            raise
         except Exception as e:
             print(f"Error getting contributors for {repo_name}: {str(e)}")
             return []
             
-    def get_repo_issues(self, repo_name: str) -> Dict:
-        """分析问题和PR情况"""
+    async def get_repo_contributors_async(self, repo_name: str) -> List[Dict]:
+        """获取贡献者信息（异步）"""
+        url = f"{self.base_url}/repos/{repo_name}/contributors"
+        
+        try:
+            response = await self.async_client.request(url)
+            return self._summarize_contributors(response.json())
+        except TokenRejected:
+            raise
+        except Exception as e:
+            print(f"Error getting contributors for {repo_name}: {str(e)}")
+            return []
+            
+    def _summarize_contributors(self, contributors: List[Dict]) -> List[Dict]:
+        """提取前10名贡献者"""
+        return [{
+            'username': c['login'],
+            'contributions': c['contributions'],
+            'profile': c['html_url']
+        } for c in contributors[:10]]
+            
+    def _issue_count_queries(self, repo_name: str) -> List[tuple]:
+        """生成统计问题和PR数量的请求
+
+        search 模式统计 开放问题/关闭问题/开放PR/已合并PR，每个仓库消耗4次搜索配额
+        （每分钟30次）；link 模式只用 core 配额，但接口无法区分已合并和未合并关闭的PR，
+        统计的是 开放问题/关闭问题/开放PR/已关闭PR。
+        """
+        if self.issue_count_mode == 'search':
+            url = f"{self.base_url}/search/issues"
+            return [
+                (url, {'q': f"repo:{repo_name} {qualifiers}", 'per_page': 1})
+                for qualifiers in ('is:issue is:open', 'is:issue is:closed', 'is:pr is:open', 'is:pr is:merged')
+            ]
+            
         issues_url = f"{self.base_url}/repos/{repo_name}/issues"
         pulls_url = f"{self.base_url}/repos/{repo_name}/pulls"
+        return [
+            (url, {'state': state, 'per_page': 1})
+            for url in (issues_url, pulls_url)
+            for state in ('open', 'closed')
+        ]
         
-        try:
-            # 获取问题
-            issues_response = requests.get(
-                issues_url,
-                headers=self.headers,
-                params={'state': 'all', 'per_page': 100}
-            )
-            issues_response.raise_for_status()
-            issues = issues_response.json()
-            
-            # 获取PR
-            pulls_response = requests.get(
-                pulls_url,
-                headers=self.headers,
-                params={'state': 'all', 'per_page': 100}
-            )
-            pulls_response.raise_for_status()
-            pulls = pulls_response.json()
-            
-            # 分析问题和PR的状态
+    def _count_items(self, response: requests.Response) -> int:
+        """从 total_count 或 Link 头的最后一页页码得到总数，不下载条目内容"""
+        if self.issue_count_mode == 'search':
+            return response.json().get('total_count', 0)
+            
+        link = response.headers.get('Link')
+        if isinstance(link, str):
+            for item in parse_header_links(link):
+                if item.get('rel') == 'last':
+                    return int(parse_qs(urlsplit(item['url']).query)['page'][0])
+        return len(response.json())
+        
+    def _summarize_issue_counts(self, counts: List[int]) -> Dict:
+        """汇总问题和PR数量，link 模式给出已关闭PR数（closed_pulls_count）而不是已合并PR数"""
+        if self.issue_count_mode == 'search':
+            open_issues, closed_issues, open_pulls, merged_pulls = counts
             return {
-                'open_issues_count': len([i for i in issues if i['state'] == 'open']),
-                'closed_issues_count': len([i for i in issues if i['state'] == 'closed']),
-                'open_pulls_count': len([p for p in pulls if p['state'] == 'open']),
-                'merged_pulls_count': len([p for p in pulls if p['state'] == 'closed'])
+                'open_issues_count': open_issues,
+                'closed_issues_count': closed_issues,
+                'open_pulls_count': open_pulls,
+                'merged_pulls_count': merged_pulls
             }
+            
+        # /issues 接口包含PR，需要减去PR数量；已关闭PR中包含未合并的PR
+        open_items, closed_items, open_pulls, closed_pulls = counts
+        return {
+            'open_issues_count': max(0, open_items - open_pulls),
+            'closed_issues_count': max(0, closed_items - closed_pulls),
+            'open_pulls_count': open_pulls,
+            'closed_pulls_count': closed_pulls
+        }
+        
+    def get_repo_issues(self, repo_name: str) -> Dict:
+        """分析问题和PR情况"""
+        try:
+            counts = [
+                self._count_items(self._request(url, params=params))
+                for url, params in self._issue_count_queries(repo_name)
+            ]
+            return self._summarize_issue_counts(counts)
+        except TokenRejected:
+            raise
         except Exception as e:
             print(f"Error analyzing issues for {repo_name}: {str(e)}")
             return {}
             
-    def save_results(self, results: List[Dict], filename: str = 'data/github_trends.json'):
-        """保存监控结果"""
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        
+    async def get_repo_issues_async(self, repo_name: str) -> Dict:
+        """分析问题和PR情况（异步）"""
+        try:
+            responses = await asyncio.gather(*(
+                self.async_client.request(url, params=params)
+                for url, params in self._issue_count_queries(repo_name)
+            ))
+            return self._summarize_issue_counts([self._count_items(r) for r in responses])
+        except TokenRejected:
+            raise
+        except Exception as e:
+            print(f"Error analyzing issues for {repo_name}: {str(e)}")
+            return {}
+            
+    def save_results(self, results: List[Dict], filename: Optional[str] = None, run_id: Optional[str] = None):
+        """
+        保存监控结果
+
+        Args:
+            results: 监控结果
+            filename: 同时导出的JSON文件，不指定时只写入结果库
+            run_id: 所属运行，不指定时新建一次运行
+        """
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'timestamp': datetime.now().isoformat(),
-                    'results': results
-                }, f, ensure_ascii=False, indent=2)
+            store = get_result_store()
+            store.save_repos(run_id or store.start_run(), results)
+            
+            if filename:
+                directory = os.path.dirname(filename)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(filename, 'w', encoding='utf-8') as f:
+                    json.dump({
+                        'timestamp': datetime.now().isoformat(),
+                        'results': results
+                    }, f, ensure_ascii=False, indent=2)
         except Exception as e:
             print(f"Error saving results: {str(e)}")
             
-    def run_monitor(self):
-        """运行监控流程"""
+    async def enrich_repo_async(self, repo: Dict, deferred: Optional[DeferredRetryQueue] = None) -> Dict:
+        """并发获取单个仓库的详细信息"""
+        repo_name = repo['name']
+        print(f"分析项目: {repo_name}")
+        
+        activity, contributors, issues = await asyncio.gather(
+            self.analyze_repo_activity_async(repo_name, deferred),
+            self.get_repo_contributors_async(repo_name),
+            self.get_repo_issues_async(repo_name)
+        )
+        
+        # 合并信息
+        return {
+            **repo,
+            'activity': activity,
+            'contributors': contributors,
+            'issues': issues
+        }
+        
+    async def _enrich_rest_async(self, repos: List[Dict]) -> List[Dict]:
+        """通过REST接口并发获取详情，并发数由 async_client 限制"""
+        deferred = DeferredRetryQueue(
+            base_delay=self.stats_retry_delay,
+            max_attempts=self.stats_retry_attempts
+        )
+        detailed_results = await asyncio.gather(
+            *(self.enrich_repo_async(repo, deferred) for repo in repos)
+        )
+        detailed_results = list(detailed_results)
+        
+        # 合并延迟获取的活跃度数据
+        if len(deferred):
+            print(f"等待 {len(deferred)} 个仓库的统计数据生成...")
+            activities = await deferred.drain()
+            for info in detailed_results:
+                if info['name'] in activities:
+                    info['activity'] = activities[info['name']]
+            
+        return detailed_results
+        
+    async def iter_monitor_async(
+        self,
+        run_id: Optional[str] = None,
+        save: bool = True,
+        checkpoint: Optional[CheckpointStore] = None
+    ) -> AsyncIterator[List[Dict]]:
+        """
+        运行监控流程（异步），按搜索结果顺序分批产出已获取详情的仓库
+
+        每批最多 ``stream_chunk_size`` 个仓库，获取完详情即产出，不等待全部完成；
+        从检查点恢复时，已完成的仓库先产出。exhaustive 模式不等全部搜索结果返回，
+        每凑满一批搜索结果即开始补充详情，之后的查询才命中的关键词不会出现在已产出的批次中。
+
+        Args:
+            run_id: 所属运行
+            save: 是否每批写入结果库
+            checkpoint: 检查点；搜索结果和每批详情写入检查点，
+                已有检查点时不再重复搜索，已完成的仓库直接产出
+        """
         print("开始监控GitHub趋势项目...")
         
-        # 获取趋势项目
-        trending_repos = self.search_trending_repos()
+        # 获取趋势项目，上次运行已完成搜索时直接使用其结果；
+        # exhaustive 模式边搜索边补充详情，不等全部搜索结果返回
+        resumed = checkpoint is not None and checkpoint.is_complete('search')
+        streaming = not resumed and self.search_mode == 'exhaustive'
+        if resumed:
+            trending_repos = list(checkpoint.load('search').values())
+            print(f"从检查点恢复 {len(trending_repos)} 个搜索结果")
+        elif streaming:
+            trending_repos = []
+            if self.breakout_detector:
+                self.breakout_detector.start_cycle()
+        else:
+            trending_repos = await asyncio.to_thread(self._search_repos)
+        if checkpoint is not None and not resumed:
+            checkpoint.reset('search')
+            checkpoint.reset('breakout')
+            checkpoint.append('search', trending_repos)
+        completed = checkpoint.load('monitor') if checkpoint is not None else {}
         
-        # 深入分析每个项目
-        detailed_results = []
-        for repo in trending_repos:
-            repo_name = repo['name']
-            print(f"分析项目: {repo_name}")
-            
-            # 获取详细信息
-            activity = self.analyze_repo_activity(repo_name)
-            contributors = self.get_repo_contributors(repo_name)
-            issues = self.get_repo_issues(repo_name)
-            
-            # 合并信息
-            detailed_info = {
-                **repo,
-                'activity': activity,
-                'contributors': contributors,
-                'issues': issues
+        if self.breakout_detector and not streaming:
+            self._record_breakouts(checkpoint, resumed)
+        # 边搜索边处理时突增信息随搜索结果带出，整轮结束后再汇总
+        breakouts_by_id = {} if streaming else {breakout['id']: breakout for breakout in self.breakouts}
+        
+        trends = {}
+        if self.timeseries and not streaming:
+            # 恢复的运行已记录过本次快照
+            if not resumed:
+                self.timeseries.append(trending_repos)
+            trends = self.timeseries.growth_metrics(repo['id'] for repo in trending_repos)
+            
+        if checkpoint is not None and not resumed and not streaming:
+            checkpoint.mark_complete('search')
+            
+        chunk_size = self.stream_chunk_size
+        if self.enrichment_mode == 'graphql':
+            # 凑满GraphQL批次，不增加请求数
+            chunk_size = math.ceil(chunk_size / self.graphql.batch_size) * self.graphql.batch_size
+            
+        def restore(repos: List[Dict]) -> List[Dict]:
+            """检查点中已完成的仓库已写入结果库，直接产出"""
+            restored = [completed[repo['id']] for repo in repos if repo['id'] in completed]
+            if self.state_store:
+                # 中断的运行没有写回状态，状态文件仍是其开始时的内容，可按同样规则判断当时是否复用
+                for info in restored:
+                    self.state_store.update(info, refreshed=self.state_store.get_enrichment(info) is None)
+            return restored
+            
+        def reusable(repos: List[Dict]) -> Dict:
+            """上游没有变化的仓库复用上次的补充信息"""
+            enrichments = {}
+            if self.state_store:
+                for repo in repos:
+                    enrichment = self.state_store.get_enrichment(repo)
+                    if enrichment:
+                        enrichments[repo['id']] = enrichment
+                print(f"{len(repos) - len(enrichments)} 个项目需要更新，{len(enrichments)} 个项目复用上次结果")
+            return enrichments
+            
+        async def enrich(window: List[Dict], enrichments: Dict, trends: Dict) -> List[Dict]:
+            """补充一批仓库的详情，写入结果库和检查点"""
+            detailed_by_id = {
+                repo['id']: {**repo, **enrichments[repo['id']]} for repo in window if repo['id'] in enrichments
             }
+            changed_repos = [repo for repo in window if repo['id'] not in enrichments]
+            
+            if not changed_repos:
+                fresh_results = []
+            elif self.enrichment_mode == 'graphql':
+                fresh_results = await self.graphql.enrich_async(changed_repos)
+            else:
+                fresh_results = await self._enrich_rest_async(changed_repos)
+                
+            refreshed_ids = {info['id'] for info in fresh_results}
+            for info in fresh_results:
+                detailed_by_id[info['id']] = info
+            detailed_results = [detailed_by_id[repo['id']] for repo in window]
+            
+            for info in detailed_results:
+                if info['id'] in breakouts_by_id:
+                    info['breakout'] = breakouts_by_id[info['id']]
+                if info['id'] in trends:
+                    info['trend'] = trends[info['id']]
+                if self.state_store:
+                    self.state_store.update(info, refreshed=info['id'] in refreshed_ids)
+                    
+            if save:
+                self.save_results(detailed_results, run_id=run_id)
+            if checkpoint is not None:
+                checkpoint.append('monitor', detailed_results)
+            return detailed_results
+            
+        if streaming:
+            # 同一轮的快照使用同一个时间，分批追加
+            cycle_ts = time.time()
+            async for window in self._iter_search_windows(chunk_size):
+                trending_repos.extend(window)
+                if checkpoint is not None:
+                    checkpoint.append('search', window)
+                restored = restore(window)
+                if restored:
+                    yield restored
+                    
+                pending_repos = [repo for repo in window if repo['id'] not in completed]
+                window_trends = {}
+                if self.timeseries:
+                    self.timeseries.append(window, ts=cycle_ts)
+                    window_trends = self.timeseries.growth_metrics(repo['id'] for repo in window)
+                if pending_repos:
+                    yield await enrich(pending_repos, reusable(pending_repos), window_trends)
+                    
+            if self.breakout_detector:
+                self._record_breakouts(checkpoint, resumed)
+            if checkpoint is not None:
+                checkpoint.mark_complete('search')
+        else:
+            # 只为上游有变化且未完成的仓库请求详情
+            pending_repos = [repo for repo in trending_repos if repo['id'] not in completed]
+            if completed:
+                print(f"{len(trending_repos) - len(pending_repos)} 个项目已在检查点中完成")
+            enrichments = reusable(pending_repos)
+            
+            restored = restore(trending_repos)
+            for start in range(0, len(restored), chunk_size):
+                yield restored[start:start + chunk_size]
+                
+            for start in range(0, len(pending_repos), chunk_size):
+                yield await enrich(pending_repos[start:start + chunk_size], enrichments, trends)
             
-            detailed_results.append(detailed_info)
+        if self.state_store:
+            self.state_store.save()
+            
+        print(f"监控完成，发现 {len(trending_repos)} 个潜在项目")
+        if self.cache:
+            print(f"HTTP缓存: 命中 {self.cache.stats['hits']} 次, "
+                  f"未命中 {self.cache.stats['misses']} 次, 命中率 {self.cache.hit_rate():.0%}")
+                  
+    def _record_breakouts(self, checkpoint: Optional[CheckpointStore], resumed: bool):
+        """取本轮的突增列表，新搜索的写回状态和检查点"""
+        # 突增列表只在搜索所在的进程内存中，随搜索结果一起写入检查点
+        if resumed:
+            self.breakouts = list(checkpoint.load('breakout').values())
+        else:
+            self.breakouts = self.breakout_detector.breakouts()
+            self.breakout_detector.save()
+            if checkpoint is not None:
+                checkpoint.append('breakout', self.breakouts)
+        for breakout in self.breakouts[:5]:
+            print(f"星标突增: {breakout['name']} {breakout['stars_per_day']}/天 "
+                  f"(基线 {breakout['baseline_per_day']}/天, z={breakout['z_score']})")
+                  
+    async def _iter_search_windows(self, size: int) -> AsyncIterator[List[Dict]]:
+        """在后台线程遍历 exhaustive 搜索结果，每凑满 ``size`` 个产出一批
+
+        产出一批时已开始取下一批，搜索与补充详情同时进行。
+        """
+        iterator = self.iter_search_repos()
+        take = lambda: list(itertools.islice(iterator, size))
+        pending = asyncio.ensure_future(asyncio.to_thread(take))
+        try:
+            while True:
+                window = await pending
+                if not window:
+                    return
+                pending = asyncio.ensure_future(asyncio.to_thread(take))
+                yield window
+        finally:
+            pending.cancel()
+            
+    async def run_monitor_async(self, run_id: Optional[str] = None) -> List[Dict]:
+        """运行监控流程（异步），全部完成后一次返回"""
+        detailed_results = []
+        async for chunk in self.iter_monitor_async(run_id, save=False):
+            detailed_results.extend(chunk)
             
         # 保存结果
-        self.save_results(detailed_results)
-        print(f"监控完成，发现 {len(detailed_results)} 个潜在项目")
-        
+        self.save_results(detailed_results, run_id=run_id)
         return detailed_results
+        
+    def run_monitor(self, run_id: Optional[str] = None) -> List[Dict]:
+        """运行监控流程"""
+        return asyncio.run(self.run_monitor_async(run_id))
+        
+    def iter_monitor(
+        self,
+        run_id: Optional[str] = None,
+        buffer_size: Optional[int] = None,
+        checkpoint: Optional[CheckpointStore] = None
+    ) -> BoundedStream:
+        """
+        在后台线程运行监控流程，逐条产出仓库
+
+        Args:
+            run_id: 所属运行，每批结果随即写入结果库
+            buffer_size: 未被消费的仓库数上限，默认 ``PIPELINE_BUFFER_SIZE``；
+                达到上限时监控暂停，等待下游处理
+            checkpoint: 检查点，见 ``iter_monitor_async``
+
+        Returns:
+            BoundedStream: 按搜索结果顺序的仓库详情
+        """
+        async def produce(stream: BoundedStream):
+            async for chunk in self.iter_monitor_async(run_id, checkpoint=checkpoint):
+                for info in chunk:
+                    if not await asyncio.to_thread(stream.put, info):
+                        return
+                        
+        return BoundedStream(
+            lambda stream: asyncio.run(produce(stream)),
+            buffer_size or int(os.getenv('PIPELINE_BUFFER_SIZE', 200))
+        )
 
 if __name__ == "__main__":
     monitor = GitHubMonitor()
@@ -0,0 +1,144 @@
+"""
+GraphQL批量补充仓库详情模块
+"""
+import json
+import asyncio
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+from src.utils.token_pool import TokenRejected
+
+# 单个仓库在批量查询中的字段
+REPO_FIELDS = """
+    openIssues: issues(states: OPEN) { totalCount }
+    closedIssues: issues(states: CLOSED) { totalCount }
+    openPulls: pullRequests(states: OPEN) { totalCount }
+    mergedPulls: pullRequests(states: MERGED) { totalCount }
+    defaultBranchRef {
+      target {
+        ... on Commit {
+          history(since: %s, first: 100) {
+            totalCount
+            nodes { committedDate author { user { login url } } }
+          }
+        }
+      }
+    }
+"""
+
+
+class GraphQLEnricher:
+    """用一次GraphQL查询获取一批仓库的活跃度、贡献者和问题/PR统计
+
+    输出与REST路径（``analyze_repo_activity`` / ``get_repo_contributors`` /
+    ``get_repo_issues``）的字典结构一致，但有两点近似：
+    活跃周数和贡献者只根据最近一年内最多100次提交计算，
+    贡献者的 ``contributions`` 是该窗口内的提交数而非历史总数。
+    """
+
+    def __init__(self, monitor, batch_size: int = 25):
+        self.monitor = monitor
+        self.batch_size = max(1, batch_size)
+
+    @property
+    def url(self) -> str:
+        return f"{self.monitor.base_url}/graphql"
+
+    def build_query(self, repo_names: List[str], since: datetime) -> str:
+        """构建带别名的批量查询"""
+        fields = REPO_FIELDS % json.dumps(since.strftime('%Y-%m-%dT%H:%M:%SZ'))
+        parts = []
+        for i, repo_name in enumerate(repo_names):
+            owner, name = repo_name.split('/', 1)
+            parts.append(
+                f"r{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) {{{fields}}}"
+            )
+        return "query {\n" + "\n".join(parts) + "\n}"
+
+    def parse(self, data: Dict, repo_names: List[str]) -> Dict[str, Dict]:
+        """把查询结果转换成与REST路径一致的结构"""
+        results = {}
+        for i, repo_name in enumerate(repo_names):
+            repo = (data or {}).get(f"r{i}")
+            if not repo:
+                results[repo_name] = {'activity': {}, 'contributors': [], 'issues': {}}
+                continue
+
+            target = (repo.get('defaultBranchRef') or {}).get('target') or {}
+            history = target.get('history') or {'totalCount': 0, 'nodes': []}
+
+            results[repo_name] = {
+                'activity': self._summarize_history(history),
+                'contributors': self._summarize_authors(history['nodes']),
+                'issues': {
+                    'open_issues_count': repo['openIssues']['totalCount'],
+                    'closed_issues_count': repo['closedIssues']['totalCount'],
+                    'open_pulls_count': repo['openPulls']['totalCount'],
+                    'merged_pulls_count': repo['mergedPulls']['totalCount']
+                }
+            }
+        return results
+
+    @staticmethod
+    def _summarize_history(history: Dict) -> Dict:
+        total_commits = history['totalCount']
+        weeks = set()
+        for node in history['nodes']:
+            committed = datetime.fromisoformat(node['committedDate'].replace('Z', '+00:00'))
+            weeks.add(committed.isocalendar()[:2])
+        active_weeks = min(52, len(weeks))
+
+        return {
+            'total_commits': total_commits,
+            'active_weeks': active_weeks,
+            'avg_weekly_commits': total_commits / 52 if total_commits else 0,
+            'activity_score': active_weeks / 52 if total_commits else 0
+        }
+
+    @staticmethod
+    def _summarize_authors(nodes: List[Dict]) -> List[Dict]:
+        counts = Counter()
+        profiles = {}
+        for node in nodes:
+            user = (node.get('author') or {}).get('user')
+            if user:
+                counts[user['login']] += 1
+                profiles[user['login']] = user['url']
+
+        return [{
+            'username': login,
+            'contributions': contributions,
+            'profile': profiles[login]
+        } for login, contributions in counts.most_common(10)]
+
+    def _batches(self, repos: List[Dict]) -> List[List[Dict]]:
+        return [repos[i:i + self.batch_size] for i in range(0, len(repos), self.batch_size)]
+
+    async def enrich_batch_async(self, repos: List[Dict]) -> List[Dict]:
+        """用一次查询补充一批仓库的详细信息"""
+        repo_names = [repo['name'] for repo in repos]
+        since = datetime.now(timezone.utc) - timedelta(weeks=52)
+
+        try:
+            response = await self.monitor.async_client.request(
+                self.url,
+                payload={'query': self.build_query(repo_names, since)}
+            )
+            body = response.json()
+            for error in body.get('errors', []):
+                print(f"GraphQL error: {error.get('message')}")
+            details = self.parse(body.get('data'), repo_names)
+        except TokenRejected:
+            raise
+        except Exception as e:
+            print(f"Error enriching batch via GraphQL ({len(repos)} repos): {str(e)}")
+            details = self.parse({}, repo_names)
+
+        return [{**repo, **details[repo['name']]} for repo in repos]
+
+    async def enrich_async(self, repos: List[Dict]) -> List[Dict]:
+        """分批并发补充所有仓库，保持原有顺序"""
+        batches = await asyncio.gather(
+            *(self.enrich_batch_async(batch) for batch in self._batches(repos))
+        )
+        return [info for batch in batches for info in batch]
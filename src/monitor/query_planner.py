@@ -0,0 +1,71 @@
+"""
+搜索查询规划模块
+"""
+import re
+from typing import Dict, List, Tuple
+
+# GitHub搜索查询的长度和逻辑运算符数量限制
+MAX_QUERY_LENGTH = 256
+MAX_OPERATORS = 5
+
+
+def plan_search_queries(
+    keywords: List[str],
+    qualifiers: str = '',
+    max_length: int = MAX_QUERY_LENGTH,
+    max_operators: int = MAX_OPERATORS
+) -> List[Tuple[str, List[str]]]:
+    """
+    把多个关键词合并成尽量少的 OR 查询
+
+    Args:
+        keywords: 关键词列表
+        qualifiers: 附加在每个查询后的限定条件，如 ``stars:>100``
+        max_length: 单个查询的最大长度
+        max_operators: 单个查询中 OR 的最大数量
+
+    Returns:
+        List[Tuple[str, List[str]]]: (查询字符串, 该查询包含的关键词)
+    """
+    def build(group: List[str]) -> str:
+        return ' '.join(part for part in (' OR '.join(group), qualifiers) if part)
+
+    plans = []
+    group: List[str] = []
+    for keyword in keywords:
+        candidate = group + [keyword]
+        if group and (len(candidate) - 1 > max_operators or len(build(candidate)) > max_length):
+            plans.append((build(group), group))
+            candidate = [keyword]
+        group = candidate
+
+    if group:
+        plans.append((build(group), group))
+    return plans
+
+
+def match_keywords(repo_info: Dict, keywords: List[str]) -> List[str]:
+    """
+    找出仓库名称、描述或主题中出现的关键词
+
+    Args:
+        repo_info: ``_extract_repo_info`` 返回的仓库信息
+        keywords: 候选关键词
+
+    Returns:
+        List[str]: 命中的关键词，保持输入顺序
+    """
+    topics = {topic.lower() for topic in repo_info.get('topics') or []}
+    words = set(re.findall(r'[a-z0-9]+', ' '.join([
+        repo_info.get('name') or '',
+        repo_info.get('description') or '',
+        ' '.join(topics)
+    ]).lower()))
+
+    matched = []
+    for keyword in keywords:
+        normalized = keyword.lower()
+        parts = re.findall(r'[a-z0-9]+', normalized)
+        if normalized in topics or (parts and all(part in words for part in parts)):
+            matched.append(keyword)
+    return matched
@@ -0,0 +1,190 @@
+"""
+GitHub速率限制调度模块
+"""
+import time
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+from src.utils.http_client import header_number
+
+# 各配额类别的默认限制：(请求数, 窗口秒数)
+DEFAULT_LIMITS = {
+    'core': (5000, 3600),
+    'search': (30, 60),
+    'graphql': (5000, 3600)
+}
+
+# 没有 Retry-After 时二级限流的默认等待时间（秒）
+SECONDARY_LIMIT_WAIT = 60
+
+
+class RateLimitError(Exception):
+    """等待配额恢复的时间超过允许上限"""
+
+
+class TokenBucket:
+    """单个配额类别的令牌桶"""
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = float(capacity)
+        self.period = float(period)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+        # 最近一次从响应头读到的官方配额
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.period
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """尝试取出一个令牌，返回需要等待的秒数（0表示已取到）"""
+        now = time.monotonic()
+        self._refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def refund(self):
+        """归还一个未实际消耗配额的令牌"""
+        self.tokens = min(self.capacity, self.tokens + 1)
+
+    def block_for(self, seconds: float):
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def sync(self, limit: Optional[float], remaining: Optional[float], reset_at: Optional[float]):
+        """按响应头校准本地令牌数"""
+        if limit:
+            self.limit = int(limit)
+            self.capacity = float(limit)
+        if remaining is not None:
+            self.remaining = int(remaining)
+            self.tokens = min(self.tokens, remaining)
+        if reset_at is not None:
+            self.reset_at = reset_at
+        if remaining == 0 and reset_at is not None:
+            self.block_for(max(0.0, reset_at - time.time()) + 1)
+
+
+class RateLimitScheduler:
+    """按配额类别（core/search/graphql）分别节流的请求调度器
+
+    每个类别一个令牌桶，按窗口均匀补充令牌；每次响应后读取
+    ``X-RateLimit-*`` 和 ``Retry-After`` 校准桶状态，配额耗尽时阻塞到重置时间。
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, Tuple[int, float]]] = None,
+        max_wait: float = 900,
+        scale: int = 1
+    ):
+        # scale 为令牌数量，多个令牌时总配额按倍数放大
+        self.max_wait = max_wait
+        self.scale = max(1, scale)
+        self.buckets = {
+            resource: TokenBucket(capacity * self.scale, period)
+            for resource, (capacity, period) in (limits or DEFAULT_LIMITS).items()
+        }
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def classify(url: str) -> str:
+        """根据请求路径判断配额类别"""
+        path = urlsplit(url).path
+        if '/search/' in path:
+            return 'search'
+        if path.rstrip('/').endswith('/graphql'):
+            return 'graphql'
+        return 'core'
+
+    def acquire(self, resource: str):
+        """阻塞直到该类别有可用配额"""
+        bucket = self.buckets[resource]
+        while True:
+            with self._lock:
+                wait = bucket.reserve()
+            if wait <= 0:
+                return
+            if wait > self.max_wait:
+                raise RateLimitError(f"{resource} 配额需等待 {wait:.0f} 秒，超过上限 {self.max_wait:.0f} 秒")
+            time.sleep(wait)
+
+    def update(self, resource: str, response):
+        """根据响应头更新配额状态
+
+        多令牌时响应头只反映单个令牌的额度，此时不用它校准共享的令牌桶，
+        单个令牌的耗尽由令牌池处理。
+        """
+        headers = response.headers
+        header_resource = headers.get('X-RateLimit-Resource')
+        if isinstance(header_resource, str):
+            resource = header_resource
+        bucket = self.buckets.get(resource)
+        if bucket is None:
+            return
+
+        remaining = header_number(headers, 'X-RateLimit-Remaining')
+        with self._lock:
+            if self.scale == 1:
+                bucket.sync(
+                    header_number(headers, 'X-RateLimit-Limit'),
+                    remaining,
+                    header_number(headers, 'X-RateLimit-Reset')
+                )
+
+            if response.status_code == 304:
+                # 条件请求命中不消耗配额
+                bucket.refund()
+
+            if self.is_rate_limited(response):
+                retry_after = header_number(headers, 'Retry-After')
+                if retry_after is not None:
+                    bucket.block_for(retry_after)
+                elif remaining != 0:
+                    bucket.block_for(SECONDARY_LIMIT_WAIT)
+
+    @staticmethod
+    def is_rate_limited(response) -> bool:
+        """判断响应是否因速率限制被拒绝"""
+        if response.status_code not in (403, 429):
+            return False
+        headers = response.headers
+        return (
+            header_number(headers, 'Retry-After') is not None
+            or header_number(headers, 'X-RateLimit-Remaining') == 0
+            or response.status_code == 429
+        )
+
+    def budget_state(self) -> Dict[str, Dict]:
+        """
+        获取当前各类别的配额状态
+
+        Returns:
+            Dict[str, Dict]: 类别 -> 本地令牌数、官方剩余配额、重置时间等
+        """
+        now = time.monotonic()
+        state = {}
+        with self._lock:
+            for resource, bucket in self.buckets.items():
+                bucket._refill(now)
+                state[resource] = {
+                    'available_tokens': round(bucket.tokens, 2),
+                    'capacity': int(bucket.capacity),
+                    'limit': bucket.limit,
+                    'remaining': bucket.remaining,
+                    'reset_at': bucket.reset_at,
+                    'blocked_for_seconds': round(max(0.0, bucket.blocked_until - now), 1)
+                }
+        return state
@@ -0,0 +1,112 @@
+"""
+按日期窗口穷举搜索结果模块
+"""
+import math
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, Optional, Tuple
+from src.utils.token_pool import TokenRejected
+
+# GitHub搜索接口单个查询最多返回1000条结果
+SEARCH_RESULT_CAP = 1000
+PER_PAGE = 100
+
+# 窗口小于该跨度时不再二分
+MIN_WINDOW = timedelta(minutes=1)
+
+# GitHub上线时间，作为默认的起始日期
+GITHUB_EPOCH = datetime(2008, 1, 1)
+
+
+class SearchEnumerator:
+    """把一个搜索查询按 ``created:`` / ``pushed:`` 日期窗口拆分并逐页遍历
+
+    命中1000条上限的窗口会被二分，直到每个窗口的结果都能完整翻页取回，
+    结果以生成器形式逐条返回，调用方无需等待整个查询结束。
+    """
+
+    def __init__(
+        self,
+        monitor,
+        date_field: str = 'created',
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ):
+        if date_field not in ('created', 'pushed'):
+            raise ValueError(f"不支持的日期字段: {date_field}")
+        self.monitor = monitor
+        self.date_field = date_field
+        self.start = start or GITHUB_EPOCH
+        self.end = end
+        self.stats = {'windows': 0, 'splits': 0, 'pages': 0}
+
+    @staticmethod
+    def _format(moment: datetime) -> str:
+        return moment.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+    def _window_query(self, query: str, window: Tuple[datetime, datetime]) -> str:
+        start, end = window
+        return f"{query} {self.date_field}:{self._format(start)}..{self._format(end)}"
+
+    def _fetch_page(self, query: str, page: int) -> Dict:
+        self.stats['pages'] += 1
+        return self.monitor._request(
+            f"{self.monitor.base_url}/search/repositories",
+            params={
+                'q': query,
+                'sort': 'stars',
+                'order': 'desc',
+                'per_page': PER_PAGE,
+                'page': page
+            }
+        ).json()
+
+    def iter_items(self, query: str) -> Iterator[Dict]:
+        """
+        遍历查询的全部原始搜索结果
+
+        Args:
+            query: 不含日期限定的搜索条件
+
+        Yields:
+            Dict: GitHub返回的仓库对象
+        """
+        windows = [(self.start, self.end or datetime.utcnow())]
+
+        while windows:
+            window = windows.pop()
+            window_query = self._window_query(query, window)
+
+            try:
+                data = self._fetch_page(window_query, 1)
+            except TokenRejected:
+                raise
+            except Exception as e:
+                print(f"Error searching window {window_query}: {str(e)}")
+                continue
+
+            total = data.get('total_count', 0)
+            start, end = window
+            if total > SEARCH_RESULT_CAP and end - start > MIN_WINDOW:
+                # 二分窗口，先处理较早的一半以保持时间顺序
+                self.stats['splits'] += 1
+                mid = start + (end - start) / 2
+                mid = mid.replace(microsecond=0)
+                windows.append((mid + timedelta(seconds=1), end))
+                windows.append((start, mid))
+                continue
+
+            self.stats['windows'] += 1
+            yield from data.get('items', [])
+
+            pages = math.ceil(min(total, SEARCH_RESULT_CAP) / PER_PAGE)
+            for page in range(2, pages + 1):
+                try:
+                    items = self._fetch_page(window_query, page).get('items', [])
+                except TokenRejected:
+                    raise
+                except Exception as e:
+                    print(f"Error searching window {window_query} page {page}: {str(e)}")
+                    break
+                if not items:
+                    break
+                yield from items
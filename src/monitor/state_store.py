@@ -0,0 +1,102 @@
+"""
+仓库状态持久化模块
+"""
+import os
+import json
+from datetime import datetime
+from typing import Dict, Optional
+
+# 补充信息中需要持久化的字段
+ENRICHMENT_FIELDS = ('activity', 'contributors', 'issues')
+
+
+class RepoStateStore:
+    """按仓库 ``id`` 保存上游时间戳、星标/分叉数和最近一次补充信息
+
+    下次监控时，``updated_at`` 和 ``pushed_at`` 都没有变化的仓库直接复用
+    保存的活跃度、贡献者和问题统计，不再请求API。
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv('REPO_STATE_PATH', os.path.join('data', 'repo_state.json'))
+        self.states: Dict[str, Dict] = {}
+        self.load()
+
+    def load(self):
+        """从磁盘加载状态"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.states = json.load(f).get('repos', {})
+        except (OSError, ValueError) as e:
+            print(f"Error loading repo state: {str(e)}")
+            self.states = {}
+
+    def save(self):
+        """原子地写回磁盘"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'timestamp': datetime.now().isoformat(),
+                    'repos': self.states
+                }, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Error saving repo state: {str(e)}")
+
+    def get_enrichment(self, repo: Dict) -> Optional[Dict]:
+        """
+        获取未变化仓库的缓存补充信息
+
+        Args:
+            repo: 搜索得到的仓库信息
+
+        Returns:
+            Optional[Dict]: 时间戳未变化时返回缓存的补充信息，否则返回None
+        """
+        state = self.states.get(str(repo.get('id')))
+        if not state or not state.get('enrichment'):
+            return None
+        if not repo.get('updated_at') and not repo.get('pushed_at'):
+            return None
+        if (state.get('updated_at') != repo.get('updated_at')
+                or state.get('pushed_at') != repo.get('pushed_at')):
+            return None
+        return state['enrichment']
+
+    def update(self, detailed_info: Dict, refreshed: bool = True):
+        """
+        记录仓库最新状态
+
+        Args:
+            detailed_info: 合并了补充信息的仓库信息
+            refreshed: 补充信息是否本次新获取；获取失败或复用缓存时保留上一次的时间戳
+        """
+        key = str(detailed_info['id'])
+        enrichment = {field: detailed_info.get(field) for field in ENRICHMENT_FIELDS}
+        refreshed = refreshed and bool(enrichment['activity']) and bool(enrichment['issues'])
+
+        previous = self.states.get(key, {})
+        state = {
+            'name': detailed_info.get('name'),
+            'updated_at': previous.get('updated_at'),
+            'pushed_at': previous.get('pushed_at'),
+            'stars': detailed_info.get('stars'),
+            'forks': detailed_info.get('forks'),
+            'enrichment': previous.get('enrichment'),
+            'enriched_at': previous.get('enriched_at')
+        }
+        if refreshed:
+            state.update({
+                'updated_at': detailed_info.get('updated_at'),
+                'pushed_at': detailed_info.get('pushed_at'),
+                'enrichment': enrichment,
+                'enriched_at': datetime.now().isoformat()
+            })
+        self.states[key] = state
@@ -0,0 +1,8 @@
+"""
+存储模块包
+"""
+from .result_store import ResultStore, get_result_store
+from .timeseries import MetricSeriesStore
+from .memo_cache import MemoCache, stable_hash
+
+__all__ = ['ResultStore', 'get_result_store', 'MetricSeriesStore', 'MemoCache', 'stable_hash']
@@ -0,0 +1,167 @@
+"""
+评分结果记忆化缓存模块
+"""
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS memo (
+    key TEXT PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    value TEXT NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_memo_last_used ON memo(last_used);
+"""
+
+# 单条SQL中 IN 列表的最大参数数
+_CHUNK_SIZE = 500
+
+
+def stable_hash(value: Any) -> str:
+    """与字典键顺序无关的内容哈希"""
+    payload = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class MemoCache:
+    """以“输入记录哈希 + 评分配置哈希”为键的持久化LRU缓存
+
+    记录内容和评分配置都没变时直接返回上次的结果；配置（权重、评分表等）
+    变化后键随之变化，旧条目不再命中并最终被LRU淘汰。
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        path: Optional[str] = None,
+        max_entries: Optional[int] = None
+    ):
+        self.namespace = namespace
+        self.path = path or os.getenv('MEMO_CACHE_PATH', os.path.join('data', 'memo_cache.db'))
+        self.max_entries = max_entries or int(os.getenv('MEMO_CACHE_MAX_ENTRIES', 200000))
+
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        """每个线程使用独立连接，首次读写时才创建数据库文件"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def make_key(self, record: Any, config_hash: str) -> str:
+        """生成缓存键"""
+        return stable_hash([self.namespace, config_hash, record])
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        批量读取缓存并刷新其最近使用时间
+
+        Returns:
+            Dict[str, Any]: 命中的键到缓存值
+        """
+        keys = list(dict.fromkeys(keys))
+        conn = self._connect()
+        found = {}
+        for start in range(0, len(keys), _CHUNK_SIZE):
+            chunk = keys[start:start + _CHUNK_SIZE]
+            rows = conn.execute(
+                f"SELECT key, value FROM memo WHERE key IN ({','.join('?' * len(chunk))})",
+                chunk
+            ).fetchall()
+            found.update((key, json.loads(value)) for key, value in rows)
+
+        if found:
+            now = time.time()
+            with conn:
+                conn.executemany('UPDATE memo SET last_used = ? WHERE key = ?', [(now, key) for key in found])
+        return found
+
+    def put_many(self, entries: Dict[str, Any]):
+        """批量写入缓存，超过容量时淘汰最久未使用的条目"""
+        if not entries:
+            return
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO memo VALUES (?, ?, ?, ?)',
+                [(key, self.namespace, json.dumps(value, ensure_ascii=False), now)
+                 for key, value in entries.items()]
+            )
+            excess = conn.execute('SELECT COUNT(*) FROM memo').fetchone()[0] - self.max_entries
+            if excess > 0:
+                conn.execute(
+                    'DELETE FROM memo WHERE key IN (SELECT key FROM memo ORDER BY last_used LIMIT ?)',
+                    (excess,)
+                )
+        with self._stats_lock:
+            self.stats['stores'] += len(entries)
+            self.stats['evictions'] += max(excess, 0)
+
+    def iter_cached(
+        self,
+        records: List[Any],
+        keys: List[Optional[str]],
+        compute: Callable[[List[Any]], Iterable[Any]]
+    ) -> Iterator[Any]:
+        """
+        按输入顺序产出结果，只对未命中的记录调用 ``compute``
+
+        Args:
+            records: 输入记录
+            keys: 每条记录的缓存键，为None的记录不缓存
+            compute: 接收未命中记录列表、按同样顺序返回结果的函数
+
+        Yields:
+            每条记录的结果；空结果（分析失败）不写入缓存
+        """
+        cached = self.get_many(key for key in keys if key is not None)
+        misses = [record for record, key in zip(records, keys) if key not in cached]
+        with self._stats_lock:
+            self.stats['hits'] += len(records) - len(misses)
+            self.stats['misses'] += len(misses)
+
+        computed = iter(compute(misses))
+        new_entries = {}
+        for key in keys:
+            if key in cached:
+                yield cached[key]
+                continue
+            result = next(computed)
+            if result and key is not None:
+                new_entries[key] = result
+            yield result
+        self.put_many(new_entries)
+
+    def hit_rate(self) -> float:
+        """命中率"""
+        total = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / total if total else 0.0
+
+    def reset_stats(self):
+        """清零统计，用于按运行统计命中率"""
+        with self._stats_lock:
+            for name in self.stats:
+                self.stats[name] = 0
@@ -0,0 +1,320 @@
+"""
+SQLite结果存储模块
+"""
+import os
+import json
+import uuid
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    status TEXT NOT NULL DEFAULT 'running'
+);
+CREATE INDEX IF NOT EXISTS idx_runs_started_at ON runs(started_at);
+
+CREATE TABLE IF NOT EXISTS repos (
+    run_id TEXT NOT NULL,
+    repo_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    stars INTEGER,
+    forks INTEGER,
+    language TEXT,
+    license TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (run_id, repo_id)
+);
+CREATE INDEX IF NOT EXISTS idx_repos_repo_id ON repos(repo_id);
+CREATE INDEX IF NOT EXISTS idx_repos_name ON repos(name);
+
+CREATE TABLE IF NOT EXISTS enrichment (
+    run_id TEXT NOT NULL,
+    repo_id INTEGER NOT NULL,
+    activity TEXT,
+    contributors TEXT,
+    issues TEXT,
+    PRIMARY KEY (run_id, repo_id)
+);
+CREATE INDEX IF NOT EXISTS idx_enrichment_repo_id ON enrichment(repo_id);
+
+CREATE TABLE IF NOT EXISTS analyses (
+    run_id TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    technical_score REAL,
+    market_score REAL,
+    monetization_score REAL,
+    overall_score REAL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (run_id, project_id)
+);
+CREATE INDEX IF NOT EXISTS idx_analyses_project_id ON analyses(project_id);
+CREATE INDEX IF NOT EXISTS idx_analyses_overall_score ON analyses(overall_score);
+CREATE INDEX IF NOT EXISTS idx_analyses_run_score ON analyses(run_id, overall_score);
+
+CREATE TABLE IF NOT EXISTS evaluations (
+    run_id TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    recommended_path TEXT,
+    potential_monthly_revenue REAL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (run_id, project_id)
+);
+CREATE INDEX IF NOT EXISTS idx_evaluations_project_id ON evaluations(project_id);
+CREATE INDEX IF NOT EXISTS idx_evaluations_revenue ON evaluations(potential_monthly_revenue);
+CREATE INDEX IF NOT EXISTS idx_evaluations_run_revenue ON evaluations(run_id, potential_monthly_revenue);
+
+CREATE TABLE IF NOT EXISTS reports (
+    run_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+"""
+
+# 仓库记录中单独存到 enrichment 表的字段
+ENRICHMENT_FIELDS = ('activity', 'contributors', 'issues')
+
+
+def _revenue(evaluation: Dict) -> float:
+    return (evaluation.get('monetization_potential', {})
+            .get('recommended_path', {})
+            .get('potential_monthly_revenue', 0))
+
+
+class ResultStore:
+    """基于SQLite（WAL模式）的监控、分析、评估结果存储
+
+    每次流程运行对应一个 ``run_id``；各阶段结果按仓库/项目一行写入，
+    并在仓库id、运行id、总分和预计月收入上建索引，查询无需加载整个快照。
+    WAL模式下Web应用等读取方不会阻塞流程写入。
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv('RESULT_DB_PATH', os.path.join('data', 'survival_kit.db'))
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._local = threading.local()
+        self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """每个线程使用独立连接"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ---- 运行 ----
+
+    def start_run(self) -> str:
+        """
+        登记一次新的流程运行
+
+        Returns:
+            str: 运行id
+        """
+        run_id = f"{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO runs (run_id, started_at) VALUES (?, ?)',
+                (run_id, datetime.now().isoformat())
+            )
+        return run_id
+
+    def finish_run(self, run_id: str, status: str = 'completed'):
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE runs SET finished_at = ?, status = ? WHERE run_id = ?',
+                (datetime.now().isoformat(), status, run_id)
+            )
+
+    def latest_run_id(self, table: str = 'runs') -> Optional[str]:
+        """获取最近一次写入过指定表的运行id"""
+        row = self._connect().execute(
+            f'SELECT r.run_id FROM runs r WHERE EXISTS '
+            f'(SELECT 1 FROM {table} t WHERE t.run_id = r.run_id) '
+            f'ORDER BY r.started_at DESC LIMIT 1'
+            if table != 'runs' else
+            'SELECT run_id FROM runs ORDER BY started_at DESC LIMIT 1'
+        ).fetchone()
+        return row['run_id'] if row else None
+
+    def list_runs(self) -> List[Dict]:
+        rows = self._connect().execute('SELECT * FROM runs ORDER BY started_at').fetchall()
+        return [dict(row) for row in rows]
+
+    # ---- 写入 ----
+
+    def save_repos(self, run_id: str, results: List[Dict]):
+        """保存监控结果，补充信息单独存入 enrichment 表"""
+        repo_rows, enrichment_rows = [], []
+        for repo in results:
+            base = {k: v for k, v in repo.items() if k not in ENRICHMENT_FIELDS}
+            repo_rows.append((
+                run_id, repo['id'], repo['name'], repo.get('stars'), repo.get('forks'),
+                repo.get('language'), repo.get('license'), json.dumps(base, ensure_ascii=False)
+            ))
+            enrichment_rows.append((run_id, repo['id'], *(
+                json.dumps(repo[field], ensure_ascii=False) if field in repo else None
+                for field in ENRICHMENT_FIELDS
+            )))
+
+        with self._connect() as conn:
+            conn.executemany('INSERT OR REPLACE INTO repos VALUES (?, ?, ?, ?, ?, ?, ?, ?)', repo_rows)
+            conn.executemany('INSERT OR REPLACE INTO enrichment VALUES (?, ?, ?, ?, ?)', enrichment_rows)
+
+    def save_analyses(self, run_id: str, analyses: List[Dict]):
+        """保存项目分析结果"""
+        now = datetime.now().isoformat()
+        rows = []
+        for analysis in analyses:
+            evaluation = analysis.get('evaluation', {})
+            rows.append((
+                run_id, analysis['project_id'], now,
+                evaluation.get('technical_score'), evaluation.get('market_score'),
+                evaluation.get('monetization_score'), evaluation.get('overall_score'),
+                json.dumps(analysis, ensure_ascii=False)
+            ))
+        with self._connect() as conn:
+            conn.executemany('INSERT OR REPLACE INTO analyses VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+
+    def save_evaluations(self, run_id: str, evaluations: List[Dict]):
+        """保存变现评估结果"""
+        now = datetime.now().isoformat()
+        rows = [(
+            run_id, evaluation['project_id'], now,
+            evaluation.get('monetization_potential', {}).get('recommended_path', {}).get('type'),
+            _revenue(evaluation),
+            json.dumps(evaluation, ensure_ascii=False)
+        ) for evaluation in evaluations]
+        with self._connect() as conn:
+            conn.executemany('INSERT OR REPLACE INTO evaluations VALUES (?, ?, ?, ?, ?, ?)', rows)
+
+    def save_report(self, run_id: str, report: Dict):
+        """保存机会报告"""
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO reports VALUES (?, ?, ?)',
+                (run_id, datetime.now().isoformat(), json.dumps(report, ensure_ascii=False))
+            )
+
+    # ---- 查询 ----
+
+    def load_repos(self, run_id: Optional[str] = None) -> List[Dict]:
+        """读取某次运行的监控结果（默认最近一次）"""
+        run_id = run_id or self.latest_run_id('repos')
+        rows = self._connect().execute(
+            'SELECT r.data, e.activity, e.contributors, e.issues FROM repos r '
+            'LEFT JOIN enrichment e ON e.run_id = r.run_id AND e.repo_id = r.repo_id '
+            'WHERE r.run_id = ? ORDER BY r.rowid',
+            (run_id,)
+        ).fetchall()
+
+        results = []
+        for row in rows:
+            repo = json.loads(row['data'])
+            for field in ENRICHMENT_FIELDS:
+                if row[field] is not None:
+                    repo[field] = json.loads(row[field])
+            results.append(repo)
+        return results
+
+    def load_analyses(self, run_id: Optional[str] = None) -> List[Dict]:
+        """读取某次运行的分析结果（默认最近一次），按总分降序"""
+        run_id = run_id or self.latest_run_id('analyses')
+        rows = self._connect().execute(
+            'SELECT data FROM analyses WHERE run_id = ? ORDER BY overall_score DESC',
+            (run_id,)
+        ).fetchall()
+        return [json.loads(row['data']) for row in rows]
+
+    def load_evaluations(self, run_id: Optional[str] = None) -> List[Dict]:
+        """读取某次运行的评估结果（默认最近一次），按预计月收入降序"""
+        run_id = run_id or self.latest_run_id('evaluations')
+        rows = self._connect().execute(
+            'SELECT data FROM evaluations WHERE run_id = ? ORDER BY potential_monthly_revenue DESC',
+            (run_id,)
+        ).fetchall()
+        return [json.loads(row['data']) for row in rows]
+
+    def load_report(self, run_id: Optional[str] = None) -> Optional[Dict]:
+        run_id = run_id or self.latest_run_id('reports')
+        row = self._connect().execute('SELECT data FROM reports WHERE run_id = ?', (run_id,)).fetchone()
+        return json.loads(row['data']) if row else None
+
+    def top_evaluations(
+        self,
+        limit: int = 20,
+        since: Optional[datetime] = None,
+        run_id: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        按预计月收入取前N个评估结果
+
+        Args:
+            limit: 返回数量
+            since: 只看该时间之后的评估
+            run_id: 只看某次运行
+
+        Returns:
+            List[Dict]: 评估结果，按预计月收入降序
+        """
+        clauses, params = [], []
+        if run_id:
+            clauses.append('run_id = ?')
+            params.append(run_id)
+        if since:
+            clauses.append('created_at >= ?')
+            params.append(since.isoformat())
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+
+        rows = self._connect().execute(
+            f'SELECT data FROM evaluations {where} ORDER BY potential_monthly_revenue DESC LIMIT ?',
+            (*params, limit)
+        ).fetchall()
+        return [json.loads(row['data']) for row in rows]
+
+    def top_analyses(self, limit: int = 20, run_id: Optional[str] = None) -> List[Dict]:
+        """按总分取某次运行（默认最近一次）的前N个分析结果"""
+        run_id = run_id or self.latest_run_id('analyses')
+        rows = self._connect().execute(
+            'SELECT data FROM analyses WHERE run_id = ? ORDER BY overall_score DESC LIMIT ?',
+            (run_id, limit)
+        ).fetchall()
+        return [json.loads(row['data']) for row in rows]
+
+
+_default_store: Optional[ResultStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_result_store() -> ResultStore:
+    """
+    获取进程内共享的结果存储
+
+    Returns:
+        ResultStore: 共享存储实例
+    """
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = ResultStore()
+        return _default_store
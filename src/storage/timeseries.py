@@ -0,0 +1,175 @@
+"""
+仓库指标时间序列存储模块
+"""
+import os
+import time
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+
+SECONDS_PER_DAY = 86400
+
+# 每列一个只追加的二进制文件
+COLUMNS = {
+    'repo_id': np.int64,
+    'ts': np.float64,
+    'stars': np.int64,
+    'forks': np.int64,
+    'open_issues': np.int64
+}
+
+
+class MetricSeriesStore:
+    """按列存储每次扫描的星标、分叉和未关闭问题数
+
+    每列是一个定长记录的 ``.bin`` 文件，每次扫描只在文件末尾追加，
+    读取时用 ``np.fromfile`` 整列加载，增长指标对全部仓库向量化计算。
+    """
+
+    def __init__(self, directory: Optional[str] = None, min_interval_hours: Optional[float] = None):
+        self.directory = directory or os.getenv('TIMESERIES_DIR', os.path.join('data', 'timeseries'))
+        # 计算速度的两次快照的最短间隔，间隔过短时几个星标也会折算成极高的日增速
+        self.min_interval_days = (
+            min_interval_hours if min_interval_hours is not None
+            else float(os.getenv('TREND_MIN_INTERVAL_HOURS', 1))
+        ) / 24
+
+    def _column_path(self, column: str) -> str:
+        return os.path.join(self.directory, f'{column}.bin')
+
+    def append(self, repos: Iterable[Dict], ts: Optional[float] = None):
+        """
+        追加一次扫描的快照
+
+        Args:
+            repos: ``_extract_repo_info`` 返回的仓库信息
+            ts: 扫描时间（Unix秒），默认当前时间
+        """
+        repos = [repo for repo in repos if repo.get('id') is not None]
+        if not repos:
+            return
+        ts = time.time() if ts is None else ts
+
+        values = {
+            'repo_id': [repo['id'] for repo in repos],
+            'ts': [ts] * len(repos),
+            'stars': [repo.get('stars') or 0 for repo in repos],
+            'forks': [repo.get('forks') or 0 for repo in repos],
+            'open_issues': [repo.get('open_issues') or 0 for repo in repos]
+        }
+
+        os.makedirs(self.directory, exist_ok=True)
+        for column, dtype in COLUMNS.items():
+            with open(self._column_path(column), 'ab') as f:
+                f.write(np.asarray(values[column], dtype=dtype).tobytes())
+
+    def load(self) -> Dict[str, np.ndarray]:
+        """
+        加载全部列
+
+        Returns:
+            Dict[str, np.ndarray]: 列名到数组；写入中断导致长度不一致时截断到最短列
+        """
+        columns = {}
+        for column, dtype in COLUMNS.items():
+            path = self._column_path(column)
+            columns[column] = np.fromfile(path, dtype=dtype) if os.path.exists(path) else np.empty(0, dtype=dtype)
+
+        length = min(len(values) for values in columns.values())
+        return {column: values[:length] for column, values in columns.items()}
+
+    def history(self, repo_id: int) -> Dict[str, List]:
+        """获取单个仓库的历史快照，按时间排序"""
+        columns = self.load()
+        mask = columns['repo_id'] == repo_id
+        order = np.argsort(columns['ts'][mask], kind='stable')
+        return {
+            column: values[mask][order].tolist()
+            for column, values in columns.items() if column != 'repo_id'
+        }
+
+    def growth_metrics(self, repo_ids: Optional[Iterable[int]] = None) -> Dict[int, Dict]:
+        """
+        计算每个仓库最近的增长指标
+
+        - ``stars_per_day``：最近一次扫描与此前至少间隔 ``min_interval_days``
+          的最近一次扫描之间每天新增的星标数
+        - ``acceleration``：最近两个这样的间隔的星标速度变化（星标/天²）
+        - ``growth_percentile``：``stars_per_day`` 在全部仓库中的百分位（0-1），
+          并列的仓库取平均名次，全部相同时为0.5
+
+        Args:
+            repo_ids: 只返回这些仓库的指标，百分位仍按全部仓库计算
+
+        Returns:
+            Dict[int, Dict]: 仓库id到指标；没有间隔足够的两次快照的仓库不返回
+        """
+        columns = self.load()
+        if not len(columns['repo_id']):
+            return {}
+
+        # 按 (仓库, 时间) 排序后，每个仓库的快照是连续的一段
+        order = np.lexsort((columns['ts'], columns['repo_id']))
+        ids = columns['repo_id'][order]
+        ts = columns['ts'][order]
+        stars = columns['stars'][order].astype(np.float64)
+
+        boundaries = np.flatnonzero(np.diff(ids)) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [len(ids)]))
+        counts = ends - starts
+
+        # 组内时间加上组序号的偏移后全局有序，一次 searchsorted 找到每个快照的参照快照
+        group = np.repeat(np.arange(len(starts)), counts)
+        rel_days = (ts - ts[starts][group]) / SECONDS_PER_DAY
+        offset = (rel_days.max() + self.min_interval_days + 1) * group
+        key = rel_days + offset
+
+        def reference(index: np.ndarray) -> np.ndarray:
+            """同一仓库中早于 ``index`` 至少最短间隔的最近一次快照，没有时为-1"""
+            ref = np.searchsorted(key, key[index] - self.min_interval_days, side='right') - 1
+            ref = np.minimum(ref, index - 1)
+            return np.where(ref >= starts[group[index]], ref, -1)
+
+        last = ends - 1
+        prev = reference(last)
+        has_velocity = prev >= 0
+        last, prev = last[has_velocity], prev[has_velocity]
+        if not len(last):
+            return {}
+        days = np.maximum((ts[last] - ts[prev]) / SECONDS_PER_DAY, 1 / 1440)
+        velocity = (stars[last] - stars[prev]) / days
+
+        # 参照快照之前还有间隔足够的快照才能计算加速度
+        acceleration = np.full(len(last), np.nan)
+        prev2 = reference(prev)
+        has_acceleration = prev2 >= 0
+        if has_acceleration.any():
+            last3, prev3, prev2 = last[has_acceleration], prev[has_acceleration], prev2[has_acceleration]
+            days_prev = np.maximum((ts[prev3] - ts[prev2]) / SECONDS_PER_DAY, 1 / 1440)
+            velocity_prev = (stars[prev3] - stars[prev2]) / days_prev
+            span = np.maximum((ts[last3] - ts[prev2]) / SECONDS_PER_DAY / 2, 1 / 1440)
+            acceleration[has_acceleration] = (velocity[has_acceleration] - velocity_prev) / span
+
+        # 百分位：平均名次归一化到0-1，并列的仓库名次相同，全部相同或只有一个仓库时为0.5
+        ordered = np.sort(velocity)
+        below = np.searchsorted(ordered, velocity, side='left')
+        not_above = np.searchsorted(ordered, velocity, side='right')
+        if len(velocity) > 1:
+            percentile = (below + not_above - 1) / 2 / (len(velocity) - 1)
+        else:
+            percentile = np.full(len(velocity), 0.5)
+
+        metric_ids = ids[last]
+        samples = counts[has_velocity]
+        wanted = None if repo_ids is None else set(repo_ids)
+        metrics = {}
+        for i, repo_id in enumerate(metric_ids.tolist()):
+            if wanted is not None and repo_id not in wanted:
+                continue
+            metrics[repo_id] = {
+                'stars_per_day': round(float(velocity[i]), 2),
+                'acceleration': None if np.isnan(acceleration[i]) else round(float(acceleration[i]), 2),
+                'growth_percentile': round(float(percentile[i]), 4),
+                'samples': int(samples[i])
+            }
+        return metrics
@@ -2,14 +2,16 @@
 主监控模块
 """
 import os
-import json
 import time
 from datetime import datetime
 from typing import Dict, List
 from src.monitor.github_monitor import GitHubMonitor
 from src.analyzer.project_analyzer import ProjectAnalyzer
 from src.evaluator.monetization_evaluator import MonetizationEvaluator
+from src.storage import get_result_store
 from src.utils.logger import setup_logger
+from src.utils.top_k import TopK
+from src.utils.checkpoint import CheckpointStore
 
 logger = setup_logger('monitor')
 
@@ -18,74 +20,180 @@ class SurvivalKit:
         self.monitor = GitHubMonitor()
         self.analyzer = ProjectAnalyzer()
         self.evaluator = MonetizationEvaluator()
+        self.store = get_result_store()
+        
+        # 流水线配置：监控与分析之间最多缓冲的项目数，以及每批分析评估的项目数
+        self.buffer_size = int(os.getenv('PIPELINE_BUFFER_SIZE', 200))
+        self.chunk_size = int(os.getenv('PIPELINE_CHUNK_SIZE', 50))
+        
+        # 检查点：中断后可从已完成的阶段继续
+        self.checkpoint = CheckpointStore() if os.getenv('PIPELINE_CHECKPOINT', '1') != '0' else None
         
         # 确保数据目录存在
-        os.makedirs('data', exist_ok=True)
+        os.makedirs(os.getenv('DATA_DIR', 'data'), exist_ok=True)
+        
+    def run(self, resume: bool = False):
+        """运行完整的项目发现和评估流程
+        
+        监控在后台线程运行，结果经有界队列分批流向分析和评估；
+        每批处理完即写入结果库，并更新本次运行的部分报告。
         
-    def run(self):
-        """运行完整的项目发现和评估流程"""
+        Args:
+            resume: 是否从上次中断运行的检查点继续，已获取的项目不再请求API，
+                已分析、已评估的项目不再重复计算
+        """
         logger.info("启动生存工具箱...")
+        run_id = self._start_run(resume)
+        for memo in self._memo_caches():
+            memo.reset_stats()
+        counts = {'monitored': 0, 'analyzed': 0, 'evaluated': 0}
+        top_projects = self._top_projects()
+        
+        # 检查点中已分析、已评估的项目（新运行时为空），恢复时不再重复计算
+        analyzed = self.checkpoint.load('analysis', key='project_id') if self.checkpoint else {}
+        evaluated = self.checkpoint.load('evaluation', key='project_id') if self.checkpoint else {}
+        if analyzed or evaluated:
+            logger.info(f"检查点中已有 {len(analyzed)} 个分析结果、{len(evaluated)} 个评估结果")
         
         try:
-            # 1. 监控GitHub项目
-            logger.info("1. 开始监控GitHub项目...")
-            monitored_projects = self.monitor.run_monitor()
-            logger.info(f"发现 {len(monitored_projects)} 个潜在项目")
-            
-            if not monitored_projects:
+            logger.info("开始监控GitHub项目，结果分批进入分析和评估...")
+            stream = self.monitor.iter_monitor(run_id, self.buffer_size, self.checkpoint)
+            try:
+                for chunk in stream.chunks(self.chunk_size):
+                    counts['monitored'] += len(chunk)
+                    names = [repo.get('name') for repo in chunk]
+                    
+                    # 分析项目
+                    analyzed_projects = self.analyzer.batch_analyze(
+                        [repo for repo in chunk if repo.get('name') not in analyzed]
+                    )
+                    self.analyzer.save_analysis(analyzed_projects, run_id)
+                    if self.checkpoint:
+                        self.checkpoint.append('analysis', analyzed_projects)
+                    analyzed_projects = [analyzed[name] for name in names if name in analyzed] + analyzed_projects
+                    counts['analyzed'] += len(analyzed_projects)
+                    
+                    # 评估变现潜力
+                    evaluated_projects = self.evaluator.batch_evaluate(
+                        [project for project in analyzed_projects if project['project_id'] not in evaluated]
+                    )
+                    self.evaluator.save_evaluation(evaluated_projects, run_id)
+                    if self.checkpoint:
+                        self.checkpoint.append('evaluation', evaluated_projects)
+                    evaluated_projects = [evaluated[name] for name in names if name in evaluated] + evaluated_projects
+                    counts['evaluated'] += len(evaluated_projects)
+                    
+                    # 更新部分报告
+                    top_projects.extend(evaluated_projects)
+                    self.store.save_report(
+                        run_id, self._build_report(top_projects.items(), counts['evaluated'], run_id, partial=True)
+                    )
+                    logger.info(
+                        f"已接收 {counts['monitored']} 个项目，完成分析 {counts['analyzed']} 个，"
+                        f"完成评估 {counts['evaluated']} 个"
+                    )
+            finally:
+                stream.close()
+                # 本次运行加入的项目一次性写入相似项目索引
+                self.analyzer.save_similarity_index()
+                
+            logger.info(f"发现 {counts['monitored']} 个潜在项目")
+            if not counts['monitored']:
                 logger.warning("未发现符合条件的项目，请调整搜索条件后重试")
+                self._finish_run(run_id, 'empty')
                 return
                 
-            # 2. 分析项目
-            logger.info("2. 开始分析项目...")
-            analyzed_projects = self.analyzer.batch_analyze(monitored_projects)
-            logger.info(f"完成 {len(analyzed_projects)} 个项目的分析")
-            
-            if not analyzed_projects:
+            logger.info(f"完成 {counts['analyzed']} 个项目的分析")
+            if not counts['analyzed']:
                 logger.error("项目分析失败，请检查分析器配置")
+                self._finish_run(run_id, 'failed')
                 return
                 
-            # 3. 评估变现潜力
-            logger.info("3. 评估变现潜力...")
-            evaluated_projects = self.evaluator.batch_evaluate(analyzed_projects)
-            logger.info(f"完成 {len(evaluated_projects)} 个项目的变现评估")
+            logger.info(f"完成 {counts['evaluated']} 个项目的变现评估")
+            self._log_memo_stats()
             
-            if not evaluated_projects:
+            if not counts['evaluated']:
                 logger.error("变现评估失败，请检查评估器配置")
+                self._finish_run(run_id, 'failed')
                 return
                 
-            # 4. 生成报告
-            self._generate_report(evaluated_projects)
+            # 生成报告
+            self._generate_report(top_projects.items(), counts['evaluated'], run_id)
+            self._finish_run(run_id)
             
         except Exception as e:
+            # 保留检查点，下次可用 resume 继续
             logger.error(f"运行过程中发生错误: {str(e)}")
+            self.store.finish_run(run_id, 'failed')
+            if self.checkpoint:
+                logger.info(f"检查点已保留，可使用 --resume 继续运行 {run_id}")
             raise
             
-    def _generate_report(self, evaluated_projects: List[Dict]):
+    def _start_run(self, resume: bool) -> str:
+        """开始新的运行，或继续检查点所属的运行"""
+        previous = self.checkpoint.run_id if self.checkpoint else None
+        if resume and previous:
+            logger.info(f"从检查点继续运行 {previous}")
+            return previous
+            
+        if resume:
+            logger.warning("没有可恢复的检查点，开始新的运行")
+        elif previous:
+            logger.warning(f"丢弃未完成运行 {previous} 的检查点，使用 --resume 可继续该运行")
+        run_id = self.store.start_run()
+        if self.checkpoint:
+            self.checkpoint.begin(run_id)
+        return run_id
+        
+    def _finish_run(self, run_id: str, status: str = 'completed'):
+        """运行正常结束，清除检查点"""
+        self.store.finish_run(run_id, status)
+        if self.checkpoint:
+            self.checkpoint.clear()
+            
+    def _memo_caches(self) -> List:
+        """已启用的评分结果缓存"""
+        return [memo for memo in (self.analyzer.memo, self.evaluator.memo) if memo]
+        
+    def _log_memo_stats(self):
+        """记录本次运行的缓存命中率"""
+        for memo in self._memo_caches():
+            logger.info(
+                f"{memo.namespace} 缓存: 命中 {memo.stats['hits']} 个, "
+                f"未命中 {memo.stats['misses']} 个, 命中率 {memo.hit_rate():.0%}"
+            )
+            
+    @staticmethod
+    def _top_projects() -> TopK:
+        """按变现潜力保留前5个项目"""
+        return TopK(
+            5,
+            key=lambda x: x.get('monetization_potential', {})
+                       .get('recommended_path', {})
+                       .get('potential_monthly_revenue', 0)
+        )
+        
+    def _build_report(self, top_projects: List[Dict], total: int, run_id: str, partial: bool = False) -> Dict:
+        """组装报告，partial 表示运行尚未结束"""
+        return {
+            'run_id': run_id,
+            'timestamp': datetime.now().isoformat(),
+            'partial': partial,
+            'summary': {
+                'total_projects_analyzed': total,
+                'top_opportunities': len(top_projects)
+            },
+            'top_projects': top_projects,
+            'recommendations': self._generate_recommendations(top_projects)
+        }
+        
+    def _generate_report(self, top_projects: List[Dict], total: int, run_id: str):
         """生成综合报告"""
         try:
-            # 按变现潜力排序
-            top_projects = sorted(
-                evaluated_projects,
-                key=lambda x: x.get('monetization_potential', {})
-                           .get('recommended_path', {})
-                           .get('potential_monthly_revenue', 0),
-                reverse=True
-            )[:5]  # 只取前5个项目
-            
-            report = {
-                'timestamp': datetime.now().isoformat(),
-                'summary': {
-                    'total_projects_analyzed': len(evaluated_projects),
-                    'top_opportunities': len(top_projects)
-                },
-                'top_projects': top_projects,
-                'recommendations': self._generate_recommendations(top_projects)
-            }
+            report = self._build_report(top_projects, total, run_id)
             
             # 保存报告
-            with open('data/opportunity_report.json', 'w', encoding='utf-8') as f:
-                json.dump(report, f, ensure_ascii=False, indent=2)
+            self.store.save_report(run_id, report)
                 
             # 打印报告摘要
             self._print_report_summary(report)
@@ -137,7 +245,7 @@ class SurvivalKit:
             logger.info(f"启动时间: {recommended_path['setup_time_days']} 天")
             logger.info(f"投资回报周期: {recommended_path['roi_period_months']} 个月")
             
-        logger.info("\n完整报告已保存至 data/opportunity_report.json")
+        logger.info(f"\n完整报告已保存至结果库 {self.store.path}（运行 {report['run_id']}）")
 
 def main():
     kit = SurvivalKit()
@@ -3,8 +3,8 @@ AI服务工具模块
 """
 import os
 from typing import Dict, Any, Optional
-import requests
 from .logger import setup_logger
+from .http_client import get_http_client
 from .config_loader import load_config
 from datetime import datetime
 
@@ -61,7 +61,7 @@ class AIService:
             'max_tokens': max_tokens
         }
         
-        response = requests.post(
+        response = get_http_client().post(
             f"{self.api_base}/chat/completions",
             headers=headers,
             json=data
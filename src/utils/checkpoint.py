@@ -0,0 +1,109 @@
+"""
+流水线检查点模块
+"""
+import os
+import json
+import shutil
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+
+class CheckpointStore:
+    """按阶段记录已完成的记录，供中断后恢复运行
+
+    每个阶段一个 JSONL 文件，每批记录追加写入后立即 ``fsync``；
+    进程在写入中途退出时，加载时丢弃并截掉不完整的最后一行。
+    ``run.json`` 记录检查点所属的运行，运行成功结束后整个目录被清除。
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or os.getenv('CHECKPOINT_DIR', os.path.join('data', 'checkpoints'))
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    @staticmethod
+    def _sync(f):
+        f.flush()
+        os.fsync(f.fileno())
+
+    @property
+    def run_id(self) -> Optional[str]:
+        """检查点所属的运行，没有检查点时为None"""
+        try:
+            with open(self._path('run.json'), encoding='utf-8') as f:
+                return json.load(f).get('run_id')
+        except (OSError, ValueError):
+            return None
+
+    def begin(self, run_id: str):
+        """清除旧检查点，开始记录新的运行"""
+        self.clear()
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self._path('run.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'run_id': run_id, 'started_at': datetime.now().isoformat()}, f)
+            self._sync(f)
+        os.replace(tmp_path, self._path('run.json'))
+
+    def append(self, stage: str, records: Iterable[Dict]):
+        """追加一批已完成的记录并落盘"""
+        lines = [json.dumps(record, ensure_ascii=False) + '\n' for record in records]
+        if not lines:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(f'{stage}.jsonl'), 'a', encoding='utf-8') as f:
+            f.writelines(lines)
+            self._sync(f)
+
+    def load(self, stage: str, key: str = 'id') -> Dict[Any, Dict]:
+        """
+        读取某阶段已完成的记录
+
+        Args:
+            stage: 阶段名
+            key: 记录的唯一键字段，同键的记录以后写入的为准
+
+        Returns:
+            Dict[Any, Dict]: 键到记录，按首次写入顺序
+        """
+        path = self._path(f'{stage}.jsonl')
+        if not os.path.exists(path):
+            return {}
+
+        records = {}
+        valid_bytes = 0
+        with open(path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                records[record[key]] = record
+                valid_bytes += len(line)
+
+        # 截掉中断时写了一半的内容，避免后续追加的记录接在残行之后
+        if valid_bytes < os.path.getsize(path):
+            os.truncate(path, valid_bytes)
+        return records
+
+    def mark_complete(self, stage: str):
+        """标记某阶段已全部完成"""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(f'{stage}.done'), 'w', encoding='utf-8') as f:
+            self._sync(f)
+
+    def is_complete(self, stage: str) -> bool:
+        return os.path.exists(self._path(f'{stage}.done'))
+
+    def reset(self, stage: str):
+        """删除某阶段的记录和完成标记"""
+        for name in (f'{stage}.jsonl', f'{stage}.done'):
+            if os.path.exists(self._path(name)):
+                os.remove(self._path(name))
+
+    def clear(self):
+        """删除全部检查点"""
+        shutil.rmtree(self.directory, ignore_errors=True)
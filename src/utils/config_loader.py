@@ -16,8 +16,10 @@ def load_config() -> Dict[str, Any]:
     load_dotenv()
     
     # 从环境变量获取配置
+    github_tokens = [t.strip() for t in os.getenv('GITHUB_TOKENS', '').split(',') if t.strip()]
     config = {
-        'github_token': os.getenv('GITHUB_TOKEN'),
+        'github_token': os.getenv('GITHUB_TOKEN') or next(iter(github_tokens), None),
+        'github_tokens': github_tokens,
         'openai_api_key': os.getenv('OPENAI_API_KEY'),
         'min_stars': int(os.getenv('MIN_STARS', 100)),
         'min_forks': int(os.getenv('MIN_FORKS', 20)),
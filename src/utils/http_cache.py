@@ -0,0 +1,180 @@
+"""
+HTTP条件请求缓存模块
+"""
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# 随缓存条目一起保存的响应头
+CACHED_HEADERS = ('ETag', 'Last-Modified', 'Link', 'Content-Type')
+
+
+class HTTPCache:
+    """基于 ETag / Last-Modified 的磁盘响应缓存
+
+    每个 URL+参数 对应 ``cache_dir`` 下的一个JSON文件。再次请求时带上
+    ``If-None-Match`` / ``If-Modified-Since``，服务端返回304时直接用本地内容
+    构造响应。缓存总大小超过 ``max_bytes`` 时按最近最少使用顺序淘汰。
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.cache_dir = cache_dir or os.getenv('HTTP_CACHE_DIR', os.path.join('data', 'http_cache'))
+        self.max_bytes = max_bytes or int(float(os.getenv('HTTP_CACHE_MAX_MB', 200)) * 1024 * 1024)
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+        self._index: 'OrderedDict[str, int]' = OrderedDict()
+        self._total_bytes = 0
+        self._load_index()
+
+    def _load_index(self):
+        """按文件修改时间恢复LRU顺序"""
+        if not os.path.isdir(self.cache_dir):
+            return
+
+        entries = []
+        for filename in os.listdir(self.cache_dir):
+            if not filename.endswith('.json'):
+                continue
+            stat = os.stat(os.path.join(self.cache_dir, filename))
+            entries.append((stat.st_mtime, filename[:-5], stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None) -> str:
+        """根据URL和查询参数生成缓存键"""
+        raw = url + '?' + json.dumps(params or {}, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load(self, key: str) -> Optional[Dict]:
+        if key not in self._index:
+            return None
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            self._discard(key)
+            return None
+
+    def _discard(self, key: str):
+        size = self._index.pop(key, 0)
+        self._total_bytes -= size
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _store(self, key: str, url: str, response: requests.Response):
+        """保存带校验头的成功响应"""
+        headers = {
+            name: response.headers.get(name)
+            for name in CACHED_HEADERS
+            if isinstance(response.headers.get(name), str)
+        }
+        if 'ETag' not in headers and 'Last-Modified' not in headers:
+            return
+
+        payload = json.dumps({
+            'url': url,
+            'status_code': response.status_code,
+            'headers': headers,
+            'content': response.text
+        }, ensure_ascii=False)
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self._path(key) + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(tmp_path, self._path(key))
+
+        size = os.path.getsize(self._path(key))
+        self._total_bytes += size - self._index.pop(key, 0)
+        self._index[key] = size
+        self.stats['stores'] += 1
+        self._evict()
+
+    def _evict(self):
+        """淘汰最久未使用的条目直到满足容量限制"""
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            oldest = next(iter(self._index))
+            self._discard(oldest)
+            self.stats['evictions'] += 1
+
+    def _touch(self, key: str):
+        self._index.move_to_end(key)
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+    @staticmethod
+    def _build_response(entry: Dict, revalidated: requests.Response) -> requests.Response:
+        """用缓存内容构造响应，并带上304响应里的最新头信息（如速率限制）"""
+        response = requests.Response()
+        response.status_code = entry['status_code']
+        response.url = entry['url']
+        response.encoding = 'utf-8'
+        response._content = entry['content'].encode('utf-8')
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.headers.update(revalidated.headers)
+        response.headers['X-Cache'] = 'HIT'
+        return response
+
+    def get(
+        self,
+        send: Callable[..., requests.Response],
+        url: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None
+    ) -> requests.Response:
+        """
+        发送带条件头的GET请求
+
+        Args:
+            send: 实际发送请求的函数，签名同 ``requests.get``
+            url: 请求地址
+            params: 查询参数
+            headers: 请求头
+
+        Returns:
+            requests.Response: 服务端响应，304时为缓存内容
+        """
+        key = self.make_key(url, params)
+        with self._lock:
+            entry = self._load(key)
+
+        request_headers = dict(headers or {})
+        if entry:
+            if entry['headers'].get('ETag'):
+                request_headers['If-None-Match'] = entry['headers']['ETag']
+            if entry['headers'].get('Last-Modified'):
+                request_headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+
+        response = send(url, headers=request_headers, params=params)
+
+        with self._lock:
+            if entry and response.status_code == 304:
+                self.stats['hits'] += 1
+                self._touch(key)
+                return self._build_response(entry, response)
+
+            self.stats['misses'] += 1
+            if response.status_code == 200:
+                self._store(key, url, response)
+
+        return response
+
+    def hit_rate(self) -> float:
+        """缓存命中率"""
+        total = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / total if total else 0.0
@@ -0,0 +1,106 @@
+"""
+共享HTTP客户端模块
+"""
+import os
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HTTPClient:
+    """按主机复用的连接池HTTP客户端
+
+    每个 scheme://host 对应一个 keep-alive 的 ``requests.Session``，
+    所有请求默认带上连接/读取超时，并声明接受 gzip 压缩响应。
+    """
+
+    def __init__(
+        self,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None
+    ):
+        self.pool_connections = pool_connections or int(os.getenv('HTTP_POOL_CONNECTIONS', 10))
+        self.pool_maxsize = pool_maxsize or int(os.getenv('HTTP_POOL_MAXSIZE', 20))
+        self.timeout: Tuple[float, float] = (
+            connect_timeout or float(os.getenv('HTTP_CONNECT_TIMEOUT', 5)),
+            read_timeout or float(os.getenv('HTTP_READ_TIMEOUT', 30))
+        )
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def get_session(self, url: str) -> requests.Session:
+        """获取目标主机对应的会话"""
+        parts = urlsplit(url)
+        key = f"{parts.scheme}://{parts.netloc}"
+
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self.pool_connections,
+                    pool_maxsize=self.pool_maxsize
+                )
+                session.mount(f"{parts.scheme}://", adapter)
+                session.headers['Accept-Encoding'] = 'gzip, deflate'
+                self._sessions[key] = session
+            return session
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """发送GET请求"""
+        kwargs.setdefault('timeout', self.timeout)
+        return self.get_session(url).get(url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """发送POST请求"""
+        kwargs.setdefault('timeout', self.timeout)
+        return self.get_session(url).post(url, **kwargs)
+
+    def close(self):
+        """关闭所有会话"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+def header_number(headers, name: str) -> Optional[float]:
+    """
+    读取数值型响应头
+
+    Args:
+        headers: 响应头
+        name: 头名称
+
+    Returns:
+        Optional[float]: 头不存在或不是数字时返回None
+    """
+    value = headers.get(name)
+    if not isinstance(value, str):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+_default_client: Optional[HTTPClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_http_client() -> HTTPClient:
+    """
+    获取进程内共享的HTTP客户端
+
+    Returns:
+        HTTPClient: 共享客户端实例
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HTTPClient()
+        return _default_client
@@ -0,0 +1,93 @@
+"""
+有界流水线队列模块
+"""
+import queue
+import threading
+from typing import Any, Callable, Iterator, List
+
+# 生产结束标记
+_DONE = object()
+
+
+class BoundedStream:
+    """后台线程生产、调用方线程消费的有界队列
+
+    ``produce`` 在后台线程中运行，通过 ``put`` 逐条写入；队列满时 ``put``
+    阻塞，生产速度被消费速度限制（背压）。消费方按写入顺序迭代，
+    生产方抛出的异常在已写入的记录消费完之后重新抛出。
+    消费方提前停止迭代或调用 ``close`` 后，``put`` 返回 False，生产方应尽快结束。
+    """
+
+    def __init__(self, produce: Callable[['BoundedStream'], None], maxsize: int = 200):
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, maxsize))
+        self._closed = threading.Event()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, args=(produce,), daemon=True)
+        self._thread.start()
+
+    def _run(self, produce: Callable[['BoundedStream'], None]):
+        try:
+            produce(self)
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._put(_DONE)
+
+    def _put(self, item: Any) -> bool:
+        while not self._closed.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def put(self, item: Any) -> bool:
+        """
+        写入一条记录，队列满时等待
+
+        Returns:
+            bool: 消费方是否仍在读取
+        """
+        return self._put(item)
+
+    def close(self):
+        """停止消费，生产线程在下一次 ``put`` 时得知并退出"""
+        self._closed.set()
+
+    def __iter__(self) -> Iterator[Any]:
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _DONE:
+                    break
+                yield item
+        finally:
+            self.close()
+        if self._error is not None:
+            raise self._error
+
+    def chunks(self, size: int) -> Iterator[List[Any]]:
+        """
+        按批消费
+
+        等到第一条记录后立即取出队列中已有的记录，最多 ``size`` 条，
+        不为凑满一批而等待，上游慢时结果也能尽早向下游传递。
+        """
+        items = iter(self)
+        try:
+            for first in items:
+                batch = [first]
+                while len(batch) < size:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _DONE:
+                        # 放回结束标记，由 __iter__ 结束迭代
+                        self._queue.put(item)
+                        break
+                    batch.append(item)
+                yield batch
+        finally:
+            items.close()
@@ -0,0 +1,162 @@
+"""
+GitHub令牌池模块
+"""
+import os
+import time
+import threading
+from typing import Dict, List, Optional
+from .http_client import header_number
+
+# 各配额类别每个令牌的默认额度，用于尚未收到响应头时的估计
+DEFAULT_QUOTAS = {
+    'core': 5000,
+    'search': 30,
+    'graphql': 5000
+}
+
+
+class TokenPoolExhausted(Exception):
+    """所有令牌的配额都已耗尽，且等待时间超过上限"""
+
+
+class TokenRejected(Exception):
+    """GitHub拒绝了令牌池中的全部令牌（401），继续请求没有意义"""
+
+
+class TokenPool:
+    """多个GitHub令牌的配额跟踪与路由
+
+    每个令牌按配额类别记录响应头中的剩余次数和重置时间，
+    每次请求选择剩余额度最多的令牌；额度耗尽的令牌在重置前不再参与轮换，
+    被GitHub拒绝的令牌直接移出令牌池。
+    """
+
+    def __init__(self, tokens: List[str], max_wait: float = 900):
+        self.tokens = [token for token in dict.fromkeys(tokens) if token]
+        self.max_wait = max_wait
+        self._remaining: Dict[str, Dict[str, float]] = {token: {} for token in self.tokens}
+        self._reset_at: Dict[str, Dict[str, float]] = {token: {} for token in self.tokens}
+        self.rejected: List[str] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'TokenPool':
+        """从 GITHUB_TOKENS（逗号分隔）或 GITHUB_TOKEN 创建令牌池"""
+        raw = os.getenv('GITHUB_TOKENS') or os.getenv('GITHUB_TOKEN') or ''
+        return cls(
+            [token.strip() for token in raw.split(',')],
+            max_wait=float(os.getenv('GITHUB_MAX_RATE_LIMIT_WAIT', 900))
+        )
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def _headroom(self, token: str, resource: str, now: float) -> float:
+        """令牌当前可用额度，重置时间已过的视为满额"""
+        reset_at = self._reset_at[token].get(resource)
+        if reset_at is not None and reset_at <= now:
+            self._remaining[token].pop(resource, None)
+            self._reset_at[token].pop(resource, None)
+        return self._remaining[token].get(resource, DEFAULT_QUOTAS.get(resource, 0))
+
+    def acquire(self, resource: str = 'core') -> Optional[str]:
+        """
+        选择剩余额度最多的令牌，全部耗尽时等待最早的重置
+
+        Args:
+            resource: 配额类别（core/search/graphql）
+
+        Returns:
+            Optional[str]: 令牌；未配置令牌时返回None（匿名请求）
+
+        Raises:
+            TokenRejected: 配置的令牌已全部被拒绝
+        """
+        if not self.tokens:
+            if self.rejected:
+                raise TokenRejected("GitHub API拒绝了全部令牌，请检查 GITHUB_TOKEN/GITHUB_TOKENS")
+            return None
+
+        while True:
+            with self._lock:
+                now = time.time()
+                if not self.tokens:
+                    # 等待期间其余令牌被拒绝
+                    raise TokenRejected("GitHub API拒绝了全部令牌，请检查 GITHUB_TOKEN/GITHUB_TOKENS")
+                token = max(self.tokens, key=lambda t: self._headroom(t, resource, now))
+                if self._headroom(token, resource, now) >= 1:
+                    # 乐观扣减，避免并发请求同时挤到同一个令牌上
+                    self._remaining[token][resource] = self._headroom(token, resource, now) - 1
+                    return token
+                wait = min(self._reset_at[t].get(resource, now) for t in self.tokens) - now + 1
+
+            if wait > self.max_wait:
+                raise TokenPoolExhausted(f"所有令牌的 {resource} 配额已耗尽，需等待 {wait:.0f} 秒")
+            time.sleep(max(wait, 0.1))
+
+    def reject(self, token: str) -> int:
+        """
+        把被GitHub拒绝（401）的令牌移出令牌池
+
+        Returns:
+            int: 剩余令牌数
+        """
+        with self._lock:
+            if token in self._remaining:
+                self.tokens.remove(token)
+                self._remaining.pop(token)
+                self._reset_at.pop(token)
+                self.rejected.append(token)
+            return len(self.tokens)
+
+    def update(self, token: Optional[str], resource: str, headers):
+        """根据响应头更新令牌额度"""
+        if token not in self._remaining:
+            return
+
+        header_resource = headers.get('X-RateLimit-Resource')
+        if isinstance(header_resource, str):
+            resource = header_resource
+        remaining = header_number(headers, 'X-RateLimit-Remaining')
+        reset_at = header_number(headers, 'X-RateLimit-Reset')
+
+        with self._lock:
+            if remaining is not None:
+                self._remaining[token][resource] = remaining
+            if reset_at is not None:
+                self._reset_at[token][resource] = reset_at
+
+    def state(self) -> List[Dict]:
+        """
+        获取各令牌的额度状态（令牌已脱敏）
+
+        Returns:
+            List[Dict]: 每个令牌的各类别剩余额度和重置时间
+        """
+        now = time.time()
+        with self._lock:
+            return [{
+                'token': f"...{token[-4:]}",
+                'remaining': {
+                    resource: self._headroom(token, resource, now) for resource in DEFAULT_QUOTAS
+                },
+                'reset_at': dict(self._reset_at[token])
+            } for token in self.tokens]
+
+
+_default_pool: Optional[TokenPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_token_pool() -> TokenPool:
+    """
+    获取进程内共享的令牌池，使各监控器共用同一份配额视图
+
+    Returns:
+        TokenPool: 共享令牌池
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = TokenPool.from_env()
+        return _default_pool
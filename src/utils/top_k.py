@@ -0,0 +1,71 @@
+"""
+有界堆Top-K选择模块
+"""
+import heapq
+import itertools
+from typing import Any, Callable, Iterable, List, Optional
+
+
+class TopK:
+    """流式保留得分最高的K个元素
+
+    内部是大小不超过K的最小堆，每个元素 O(log K)，只保留K个元素；
+    ``k`` 为 None 时保留全部，相当于稳定的降序排序。
+
+    同分时的顺序由 ``prefer`` 决定：``'first'`` 先加入的排在前面（与稳定的
+    ``sort(reverse=True)`` 结果一致），``'last'`` 后加入的排在前面。
+    """
+
+    def __init__(
+        self,
+        k: Optional[int],
+        key: Callable[[Any], Any],
+        prefer: str = 'first'
+    ):
+        if k is not None and k < 0:
+            raise ValueError(f"k 不能为负数: {k}")
+        if prefer not in ('first', 'last'):
+            raise ValueError(f"未知的同分规则: {prefer}")
+
+        self.k = k
+        self.key = key
+        self._sign = -1 if prefer == 'first' else 1
+        self._counter = itertools.count()
+        self._heap: List[tuple] = []
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, item: Any) -> bool:
+        """
+        加入一个元素
+
+        Returns:
+            bool: 元素当前是否在前K个中
+        """
+        if self.k == 0:
+            return False
+        entry = (self.key(item), self._sign * next(self._counter), item)
+
+        if self.k is None or len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True
+        if entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+            return True
+        return False
+
+    def extend(self, items: Iterable[Any]) -> 'TopK':
+        """依次加入多个元素"""
+        for item in items:
+            self.push(item)
+        return self
+
+    def items(self) -> List[Any]:
+        """
+        获取当前前K个元素
+
+        Returns:
+            List[Any]: 按得分降序排列
+        """
+        return [entry[2] for entry in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
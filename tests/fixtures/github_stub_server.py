@@ -0,0 +1,430 @@
+"""
+离线GitHub API替身服务
+
+实现监控流程用到的REST接口（仓库搜索、提交活跃度、贡献者、问题、PR、问题搜索），
+数据来自录制的响应文件或按种子生成的合成数据。支持可配置的延迟、202统计生成中响应、
+速率限制头、ETag条件请求和分页，把 ``GitHubMonitor.base_url`` 指向它即可离线测试和压测。
+
+命令行用法::
+
+    python -m tests.fixtures.github_stub_server --port 8765 --latency 0.05
+    python -m tests.fixtures.github_stub_server --record fixtures.json  # 代理真实API并录制
+"""
+import re
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+DEFAULT_KEYWORDS = [
+    'ai', 'machine-learning', 'automation',
+    'saas', 'api', 'sdk', 'chrome-extension',
+    'discord-bot', 'telegram-bot', 'web3'
+]
+
+# 各配额类别的 (限额, 窗口秒数)
+DEFAULT_RATE_LIMITS = {
+    'core': (5000, 3600),
+    'search': (30, 60)
+}
+
+SEARCH_RESULT_CAP = 1000
+TIME_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+
+def generate_repos(keywords: List[str] = None, repos_per_keyword: int = 30, seed: int = 42) -> List[Dict]:
+    """
+    生成合成仓库数据
+
+    Args:
+        keywords: 关键词，每个仓库的主题至少包含一个
+        repos_per_keyword: 每个关键词的仓库数
+        seed: 随机种子
+
+    Returns:
+        List[Dict]: GitHub搜索接口格式的仓库对象
+    """
+    keywords = keywords or DEFAULT_KEYWORDS
+    rng = random.Random(seed)
+    languages = ['Python', 'JavaScript', 'TypeScript', 'Go', 'Rust', 'Java']
+    licenses = ['MIT', 'Apache-2.0', 'BSD-3-Clause', 'GPL-3.0', None]
+    start = datetime(2015, 1, 1)
+
+    repos = []
+    for k, keyword in enumerate(keywords):
+        for i in range(repos_per_keyword):
+            repo_id = k * repos_per_keyword + i + 1
+            topics = [keyword]
+            # 部分仓库同时命中下一个关键词，用于测试去重
+            if i % 5 == 0:
+                topics.append(keywords[(k + 1) % len(keywords)])
+            created = start + timedelta(hours=rng.randint(0, 24 * 365 * 8))
+            pushed = created + timedelta(days=rng.randint(1, 365))
+            license_id = rng.choice(licenses)
+            repos.append({
+                'id': repo_id,
+                'full_name': f"stub-org/{keyword}-{i}",
+                'description': f"Synthetic {keyword} project #{i}",
+                'html_url': f"https://github.com/stub-org/{keyword}-{i}",
+                'stargazers_count': rng.randint(100, 50000),
+                'forks_count': rng.randint(20, 5000),
+                'language': rng.choice(languages),
+                'license': {'spdx_id': license_id} if license_id else None,
+                'created_at': created.strftime(TIME_FORMAT),
+                'updated_at': pushed.strftime(TIME_FORMAT),
+                'pushed_at': pushed.strftime(TIME_FORMAT),
+                'topics': topics,
+                'open_issues_count': 0,
+                # 以下字段只供替身服务内部使用
+                '_issues': {'open': rng.randint(0, 300), 'closed': rng.randint(0, 2000)},
+                '_pulls': {'open': rng.randint(0, 50), 'closed': rng.randint(0, 800)},
+                '_merged_ratio': rng.uniform(0.5, 0.95),
+                '_weekly_commits': [rng.choice([0, 0, 1, 3, 8, 15]) for _ in range(52)]
+            })
+            repos[-1]['open_issues_count'] = repos[-1]['_issues']['open'] + repos[-1]['_pulls']['open']
+    return repos
+
+
+def _public(repo: Dict) -> Dict:
+    return {key: value for key, value in repo.items() if not key.startswith('_')}
+
+
+def _parse_time(value: str) -> datetime:
+    return datetime.strptime(value, TIME_FORMAT) if 'T' in value else datetime.strptime(value, '%Y-%m-%d')
+
+
+class GitHubStubServer:
+    """GitHub API替身服务
+
+    Args:
+        repos: 仓库数据，默认用 ``generate_repos`` 生成
+        fixtures: 录制的响应（``"路径?查询" -> {status, headers, body}``），优先于合成数据
+        latency: 每个请求的固定延迟（秒）
+        pending_stats_polls: 每个仓库前几次请求提交活跃度时返回202
+        rate_limits: 各配额类别的 (限额, 窗口秒数)
+        upstream: 设置后代理到该地址并把响应录制到 ``fixtures``
+        rejected_tokens: 携带这些令牌的请求返回401，与GitHub对无效令牌的响应一致
+    """
+
+    def __init__(
+        self,
+        repos: Optional[List[Dict]] = None,
+        fixtures: Optional[Dict[str, Dict]] = None,
+        latency: float = 0.0,
+        pending_stats_polls: int = 0,
+        rate_limits: Optional[Dict[str, Tuple[int, int]]] = None,
+        upstream: Optional[str] = None,
+        rejected_tokens: Optional[List[str]] = None,
+        host: str = '127.0.0.1',
+        port: int = 0
+    ):
+        self.repos = repos if repos is not None else generate_repos()
+        self.repos_by_name = {repo['full_name']: repo for repo in self.repos}
+        self.fixtures = fixtures if fixtures is not None else {}
+        self.latency = latency
+        self.pending_stats_polls = pending_stats_polls
+        self.rate_limits = rate_limits or DEFAULT_RATE_LIMITS
+        self.upstream = upstream.rstrip('/') if upstream else None
+        self.rejected_tokens = set(rejected_tokens or [])
+
+        self.request_log: List[str] = []
+        self._stats_polls: Dict[str, int] = {}
+        self._usage: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'GitHubStubServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> 'GitHubStubServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @classmethod
+    def load_fixtures(cls, path: str) -> Dict[str, Dict]:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def save_fixtures(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.fixtures, f, ensure_ascii=False, indent=2)
+
+    # ---- 速率限制 ----
+
+    def _consume(self, resource: str) -> Tuple[bool, Dict[str, str]]:
+        """消耗一次配额，返回是否允许以及速率限制头"""
+        limit, window = self.rate_limits.get(resource, DEFAULT_RATE_LIMITS['core'])
+        now = time.time()
+        with self._lock:
+            used, reset_at = self._usage.get(resource, (0, now + window))
+            if now >= reset_at:
+                used, reset_at = 0, now + window
+            allowed = used < limit
+            if allowed:
+                used += 1
+            self._usage[resource] = (used, reset_at)
+
+        return allowed, {
+            'X-RateLimit-Limit': str(limit),
+            'X-RateLimit-Remaining': str(limit - used),
+            'X-RateLimit-Reset': str(int(reset_at)),
+            'X-RateLimit-Resource': resource
+        }
+
+    # ---- 路由 ----
+
+    def handle(self, path: str, query: Dict[str, str]) -> Tuple[int, object, Dict[str, str]]:
+        """返回 (状态码, 响应体, 额外响应头)"""
+        if path == '/search/repositories':
+            return self._search_repositories(path, query)
+        if path == '/search/issues':
+            return self._search_issues(query)
+
+        match = re.fullmatch(r'/repos/([^/]+/[^/]+)/(stats/commit_activity|contributors|issues|pulls)', path)
+        if not match or match.group(1) not in self.repos_by_name:
+            return 404, {'message': 'Not Found'}, {}
+
+        repo = self.repos_by_name[match.group(1)]
+        endpoint = match.group(2)
+        if endpoint == 'stats/commit_activity':
+            return self._commit_activity(repo)
+        if endpoint == 'contributors':
+            return 200, [{
+                'login': f"dev-{repo['id']}-{i}",
+                'contributions': 100 // (i + 1),
+                'html_url': f"https://github.com/dev-{repo['id']}-{i}"
+            } for i in range(12)], {}
+        return self._list_items(path, repo, endpoint, query)
+
+    def _commit_activity(self, repo: Dict):
+        with self._lock:
+            polls = self._stats_polls.get(repo['full_name'], 0)
+            self._stats_polls[repo['full_name']] = polls + 1
+        if polls < self.pending_stats_polls:
+            return 202, {}, {}
+
+        week0 = int(datetime(2024, 1, 7).timestamp())
+        return 200, [{
+            'total': total,
+            'week': week0 + i * 7 * 86400,
+            'days': [0, 0, 0, 0, 0, 0, 0]
+        } for i, total in enumerate(repo['_weekly_commits'])], {}
+
+    def _pagination(self, path: str, query: Dict[str, str], total: int) -> Tuple[int, int, Dict[str, str]]:
+        per_page = min(100, int(query.get('per_page', 30)))
+        page = max(1, int(query.get('page', 1)))
+        last_page = max(1, -(-total // per_page))
+
+        links = []
+        for rel, target in (('next', page + 1), ('last', last_page)):
+            if page < last_page:
+                link_query = urlencode({**query, 'page': target})
+                links.append(f'<{self.url}{path}?{link_query}>; rel="{rel}"')
+        return per_page, page, {'Link': ', '.join(links)} if links else {}
+
+    def _list_items(self, path: str, repo: Dict, endpoint: str, query: Dict[str, str]):
+        """问题列表包含PR，与GitHub一致"""
+        state = query.get('state', 'open')
+        states = ['open', 'closed'] if state == 'all' else [state]
+
+        items = []
+        for item_state in states:
+            items += [(item_state, True)] * repo['_pulls'][item_state]
+            if endpoint == 'issues':
+                items += [(item_state, False)] * repo['_issues'][item_state]
+
+        per_page, page, headers = self._pagination(path, query, len(items))
+        page_items = items[(page - 1) * per_page:page * per_page]
+        body = []
+        for offset, (item_state, is_pull) in enumerate(page_items):
+            item = {'number': (page - 1) * per_page + offset + 1, 'state': item_state}
+            if is_pull and endpoint == 'issues':
+                item['pull_request'] = {}
+            body.append(item)
+        return 200, body, headers
+
+    def _search_repositories(self, path: str, query: Dict[str, str]):
+        terms, min_stars, ranges = [], -1, {}
+        for token in query.get('q', '').split():
+            if token.startswith('stars:>'):
+                min_stars = int(token[len('stars:>'):])
+            elif ':' in token and token.split(':', 1)[0] in ('created', 'pushed'):
+                field, span = token.split(':', 1)
+                low, high = span.split('..')
+                ranges[field] = (_parse_time(low), _parse_time(high))
+            elif token != 'OR':
+                terms.append(token.lower())
+
+        def matches(repo: Dict) -> bool:
+            if repo['stargazers_count'] <= min_stars:
+                return False
+            words = set(re.findall(r'[a-z0-9-]+', f"{repo['full_name']} {repo['description']}".lower()))
+            if terms and not any(t in repo['topics'] or t in words for t in terms):
+                return False
+            for field, (low, high) in ranges.items():
+                if not low <= _parse_time(repo[f'{field}_at']) <= high:
+                    return False
+            return True
+
+        matched = sorted(
+            (repo for repo in self.repos if matches(repo)),
+            key=lambda r: r['stargazers_count'],
+            reverse=True
+        )
+        visible = matched[:SEARCH_RESULT_CAP]
+        per_page, page, headers = self._pagination(path, query, len(visible))
+        return 200, {
+            'total_count': len(matched),
+            'incomplete_results': False,
+            'items': [_public(r) for r in visible[(page - 1) * per_page:page * per_page]]
+        }, headers
+
+    def _search_issues(self, query: Dict[str, str]):
+        q = query.get('q', '')
+        repo_match = re.search(r'repo:(\S+)', q)
+        repo = self.repos_by_name.get(repo_match.group(1)) if repo_match else None
+        if repo is None:
+            return 200, {'total_count': 0, 'incomplete_results': False, 'items': []}, {}
+
+        kind = '_pulls' if 'is:pr' in q else '_issues'
+        if 'is:merged' in q:
+            total = int(repo['_pulls']['closed'] * repo['_merged_ratio'])
+        else:
+            total = repo[kind]['closed' if 'is:closed' in q else 'open']
+        return 200, {'total_count': total, 'incomplete_results': False, 'items': []}, {}
+
+    # ---- HTTP处理 ----
+
+    def _proxy(self, key: str, headers: Dict[str, str]) -> Tuple[int, object, Dict[str, str]]:
+        """代理到真实API并录制响应"""
+        from src.utils.http_client import get_http_client
+
+        response = get_http_client().get(f"{self.upstream}{key}", headers=headers)
+        recorded_headers = {
+            name: response.headers[name]
+            for name in ('Link', 'ETag', 'Last-Modified')
+            if name in response.headers
+        }
+        body = response.json() if response.content else {}
+        with self._lock:
+            self.fixtures[key] = {'status': response.status_code, 'headers': recorded_headers, 'body': body}
+        return response.status_code, body, recorded_headers
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                query = dict(parse_qsl(parts.query))
+                key = parts.path + ('?' + urlencode(sorted(query.items())) if query else '')
+                server.request_log.append(key)
+
+                if server.latency:
+                    time.sleep(server.latency)
+
+                auth = self.headers.get('Authorization') or ''
+                if auth.split(' ')[-1] in server.rejected_tokens:
+                    return self._send(401, {'message': 'Bad credentials'}, {})
+
+                resource = 'search' if parts.path.startswith('/search/') else 'core'
+                allowed, headers = server._consume(resource)
+                if not allowed:
+                    return self._send(403, {'message': 'API rate limit exceeded'}, headers)
+
+                if server.upstream:
+                    auth = self.headers.get('Authorization')
+                    status, body, extra = server._proxy(key, {'Authorization': auth} if auth else {})
+                elif key in server.fixtures:
+                    fixture = server.fixtures[key]
+                    status, body, extra = fixture['status'], fixture['body'], fixture.get('headers', {})
+                else:
+                    status, body, extra = server.handle(parts.path, query)
+                headers.update(extra)
+
+                payload = json.dumps(body).encode('utf-8')
+                if status == 200:
+                    etag = '"' + hashlib.sha1(payload).hexdigest() + '"'
+                    headers['ETag'] = etag
+                    if self.headers.get('If-None-Match') == etag:
+                        # 与GitHub一致：条件请求命中不消耗配额
+                        with server._lock:
+                            used, reset_at = server._usage[resource]
+                            server._usage[resource] = (used - 1, reset_at)
+                        headers['X-RateLimit-Remaining'] = str(int(headers['X-RateLimit-Remaining']) + 1)
+                        return self._send(304, None, headers)
+                self._send(status, body, headers, payload)
+
+            def _send(self, status: int, body, headers: Dict[str, str], payload: bytes = None):
+                if payload is None and body is not None:
+                    payload = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(payload or b'')))
+                self.end_headers()
+                if payload:
+                    self.wfile.write(payload)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='离线GitHub API替身服务')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='每个请求的延迟（秒）')
+    parser.add_argument('--pending-stats-polls', type=int, default=0, help='每个仓库前N次活跃度请求返回202')
+    parser.add_argument('--repos-per-keyword', type=int, default=30)
+    parser.add_argument('--fixtures', help='回放的录制文件')
+    parser.add_argument('--record', help='代理真实API并把响应录制到该文件')
+    parser.add_argument('--upstream', default='https://api.github.com')
+    args = parser.parse_args()
+
+    server = GitHubStubServer(
+        repos=generate_repos(repos_per_keyword=args.repos_per_keyword),
+        fixtures=GitHubStubServer.load_fixtures(args.fixtures) if args.fixtures else None,
+        latency=args.latency,
+        pending_stats_polls=args.pending_stats_polls,
+        upstream=args.upstream if args.record else None,
+        port=args.port
+    )
+    print(f"GitHub API替身服务运行在 {server.url}，设置 GITHUB_API_URL={server.url} 使用")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        if args.record:
+            server.save_fixtures(args.record)
+            print(f"已录制 {len(server.fixtures)} 个响应到 {args.record}")
+
+
+if __name__ == '__main__':
+    main()
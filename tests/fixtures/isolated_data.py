@@ -0,0 +1,72 @@
+"""
+测试用数据目录隔离
+
+把各持久化存储（结果库、评分缓存、HTTP缓存、仓库状态、时间序列、突增状态、
+相似项目索引、检查点）的路径都指向一个临时目录，测试结束后整个删除，
+避免测试数据写入工作目录下的 ``data/`` 并混入之后的真实运行。
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.storage import result_store
+
+# 环境变量到临时目录中的文件名
+STORE_PATHS = {
+    'DATA_DIR': '',
+    'RESULT_DB_PATH': 'survival_kit.db',
+    'MEMO_CACHE_PATH': 'memo_cache.db',
+    'HTTP_CACHE_DIR': 'http_cache',
+    'REPO_STATE_PATH': 'repo_state.json',
+    'TIMESERIES_DIR': 'timeseries',
+    'BREAKOUT_STATE_PATH': 'breakout_state.json',
+    'SIMILARITY_INDEX_PATH': 'similarity_index.npz',
+    'CHECKPOINT_DIR': 'checkpoints'
+}
+
+
+class IsolatedDataDir:
+    """在 ``start`` 和 ``stop`` 之间把全部存储路径指向临时目录
+
+    进程内共享的结果库在期间替换为新实例，结束时关闭并恢复。
+    """
+
+    def __init__(self):
+        self.path = None
+        self._patches = []
+
+    def start(self) -> str:
+        """创建临时目录并设置环境变量，返回目录路径"""
+        self.path = tempfile.mkdtemp()
+        self._patches = [
+            patch.dict(os.environ, {
+                name: os.path.join(self.path, filename) for name, filename in STORE_PATHS.items()
+            }),
+            patch.object(result_store, '_default_store', None)
+        ]
+        for p in self._patches:
+            p.start()
+        return self.path
+
+    def stop(self):
+        """关闭期间创建的结果库，恢复环境并删除临时目录"""
+        if result_store._default_store is not None:
+            result_store._default_store.close()
+        for p in reversed(self._patches):
+            p.stop()
+        self._patches = []
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def isolate_data(test: unittest.TestCase) -> str:
+    """
+    为单个测试隔离存储路径，测试结束时自动清理
+
+    Returns:
+        str: 临时数据目录
+    """
+    isolated = IsolatedDataDir()
+    path = isolated.start()
+    test.addCleanup(isolated.stop)
+    return path
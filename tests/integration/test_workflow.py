@@ -3,19 +3,24 @@
 """
 import unittest
 import os
-import json
-from src.monitor import SurvivalKit
+from unittest.mock import patch
+from src import SurvivalKit
+from src.utils.token_pool import TokenPool, TokenRejected
+from tests.fixtures.github_stub_server import GitHubStubServer
+from tests.fixtures.isolated_data import IsolatedDataDir
 
 class TestWorkflow(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """测试前准备"""
-        # 确保环境变量设置正确
-        assert 'GITHUB_TOKEN' in os.environ, "需要设置GITHUB_TOKEN环境变量"
+        # 使用离线替身服务代替真实GitHub API
+        cls.stub = GitHubStubServer(rejected_tokens=['invalid_token']).start()
+        os.environ['GITHUB_API_URL'] = cls.stub.url
+        os.environ.setdefault('GITHUB_TOKEN', 'stub-token')
         
-        # 创建必要的目录
-        os.makedirs('data', exist_ok=True)
-        os.makedirs('logs', exist_ok=True)
+        # 全部存储写入临时目录，替身服务的仓库不会混入之后的真实运行
+        cls.isolated = IsolatedDataDir()
+        cls.data_dir = cls.isolated.start()
         
         # 初始化SurvivalKit
         cls.kit = SurvivalKit()
@@ -25,35 +30,33 @@ class TestWorkflow(unittest.TestCase):
         # 运行完整流程
         self.kit.run()
         
-        # 验证生成的文件
-        self.assertTrue(os.path.exists('data/github_trends.json'))
-        self.assertTrue(os.path.exists('data/project_analysis.json'))
-        self.assertTrue(os.path.exists('data/monetization_evaluation.json'))
-        self.assertTrue(os.path.exists('data/opportunity_report.json'))
+        # 验证结果库中的数据
+        store = self.kit.store
+        run_id = store.latest_run_id('reports')
+        self.assertIsNotNone(run_id)
+        self.assertTrue(store.load_repos(run_id))
+        self.assertTrue(store.load_analyses(run_id))
+        self.assertTrue(store.load_evaluations(run_id))
         
         # 验证数据完整性
-        with open('data/opportunity_report.json', 'r') as f:
-            report = json.load(f)
-            self.assertIn('timestamp', report)
-            self.assertIn('summary', report)
-            self.assertIn('top_projects', report)
+        report = store.load_report(run_id)
+        self.assertIn('timestamp', report)
+        self.assertIn('summary', report)
+        self.assertIn('top_projects', report)
             
     def test_data_consistency(self):
         """测试数据一致性"""
-        # 读取所有生成的数据文件
-        with open('data/github_trends.json', 'r') as f:
-            trends = json.load(f)
-            
-        with open('data/project_analysis.json', 'r') as f:
-            analysis = json.load(f)
-            
-        with open('data/monetization_evaluation.json', 'r') as f:
-            evaluation = json.load(f)
+        # 读取同一次运行的各阶段结果
+        store = self.kit.store
+        run_id = store.latest_run_id('evaluations')
+        trends = store.load_repos(run_id)
+        analysis = store.load_analyses(run_id)
+        evaluation = store.load_evaluations(run_id)
             
         # 验证数据流转
-        trend_projects = set(p['name'] for p in trends.get('results', []))
-        analyzed_projects = set(p['project_id'] for p in analysis.get('analysis', []))
-        evaluated_projects = set(p['project_id'] for p in evaluation.get('evaluation', []))
+        trend_projects = set(p['name'] for p in trends)
+        analyzed_projects = set(p['project_id'] for p in analysis)
+        evaluated_projects = set(p['project_id'] for p in evaluation)
         
         # 确保没有项目在流程中丢失
         self.assertTrue(analyzed_projects.issubset(trend_projects))
@@ -61,20 +64,66 @@ class TestWorkflow(unittest.TestCase):
         
     def test_error_handling(self):
         """测试错误处理"""
-        # 测试无效的GitHub Token
-        original_token = os.environ.get('GITHUB_TOKEN')
-        os.environ['GITHUB_TOKEN'] = 'invalid_token'
-        
-        try:
-            self.kit.run()
-            self.fail("应该抛出异常")
-        except Exception as e:
-            self.assertIn("API", str(e))
-        finally:
-            # 恢复环境
-            if original_token:
-                os.environ['GITHUB_TOKEN'] = original_token
+        # 测试无效的GitHub Token：令牌池是进程内单例，这里为新的实例单独创建
+        env = {'GITHUB_TOKEN': 'invalid_token', 'GITHUB_TOKENS': '', 'PIPELINE_CHECKPOINT': '0'}
+        with patch.dict(os.environ, env):
+            kit = SurvivalKit()
+            kit.monitor.token_pool = TokenPool.from_env()
+            
+            with self.assertRaises(TokenRejected) as context:
+                kit.run()
+        self.assertIn("API", str(context.exception))
+        
+        # 本次运行记为失败
+        run = kit.store.list_runs()[-1]
+        self.assertEqual(run['status'], 'failed')
                 
+    def test_resume_skips_completed_repos(self):
+        """测试中断后恢复时，已分析、已评估的项目不再重复处理"""
+        kit = SurvivalKit()
+        kit.chunk_size = 10
+        analyze, evaluate = kit.analyzer.batch_analyze, kit.evaluator.batch_evaluate
+        first = {'analyzed': [], 'pending': [], 'evaluated': [], 'batches': 0}
+        resumed = {'analyzed': [], 'pending': [], 'evaluated': [], 'batches': 0}
+        
+        def recorder(calls, crash=False):
+            def batch_analyze(projects):
+                calls['analyzed'] += [project['name'] for project in projects]
+                return analyze(projects)
+            
+            def batch_evaluate(analyses):
+                # 第二批评估时模拟中断
+                if crash and calls['batches']:
+                    raise RuntimeError("模拟中断")
+                calls['batches'] += 1
+                calls['pending'] += [analysis['project_id'] for analysis in analyses]
+                evaluations = evaluate(analyses)
+                calls['evaluated'] += [evaluation['project_id'] for evaluation in evaluations]
+                return evaluations
+            return batch_analyze, batch_evaluate
+        
+        batch_analyze, batch_evaluate = recorder(first, crash=True)
+        with patch.object(kit.analyzer, 'batch_analyze', batch_analyze), \
+             patch.object(kit.evaluator, 'batch_evaluate', batch_evaluate):
+            with self.assertRaises(RuntimeError):
+                kit.run()
+        run_id = kit.checkpoint.run_id
+        
+        batch_analyze, batch_evaluate = recorder(resumed)
+        with patch.object(kit.analyzer, 'batch_analyze', batch_analyze), \
+             patch.object(kit.evaluator, 'batch_evaluate', batch_evaluate):
+            kit.run(resume=True)
+        
+        # 评估失败的项目没有记录，恢复后重试
+        self.assertFalse(set(first['analyzed']) & set(resumed['analyzed']))
+        self.assertFalse(set(first['evaluated']) & set(resumed['pending']))
+        # 中断时已分析但未评估的项目在恢复后评估
+        self.assertTrue(set(first['analyzed']) - set(first['pending']) <= set(resumed['pending']))
+        
+        report = kit.store.load_report(run_id)
+        self.assertFalse(report['partial'])
+        self.assertEqual(report['summary']['total_projects_analyzed'], len(kit.store.load_evaluations(run_id)))
+    
     def test_performance(self):
         """测试性能"""
         import time
@@ -94,17 +143,11 @@ class TestWorkflow(unittest.TestCase):
     @classmethod
     def tearDownClass(cls):
         """测试后清理"""
-        # 清理测试生成的文件
-        test_files = [
-            'data/github_trends.json',
-            'data/project_analysis.json',
-            'data/monetization_evaluation.json',
-            'data/opportunity_report.json'
-        ]
-        
-        for file in test_files:
-            if os.path.exists(file):
-                os.remove(file)
+        cls.stub.stop()
+        os.environ.pop('GITHUB_API_URL', None)
+        
+        # 清理测试生成的全部数据
+        cls.isolated.stop()
                 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -1,6 +1,7 @@
 """
 性能测试模块
 """
+import os
 import unittest
 import time
 import concurrent.futures
@@ -8,13 +9,28 @@ from typing import List, Dict
 from src.monitor.github_monitor import GitHubMonitor
 from src.analyzer.project_analyzer import ProjectAnalyzer
 from src.evaluator.monetization_evaluator import MonetizationEvaluator
+from tests.fixtures.github_stub_server import GitHubStubServer
+from tests.fixtures.isolated_data import isolate_data
 
 class TestPerformance(unittest.TestCase):
     def setUp(self):
         """测试前准备"""
+        isolate_data(self)
+        # 监控模块指向带网络延迟的离线替身服务，结果可重复
+        self.stub = GitHubStubServer(latency=0.05).start()
         self.monitor = GitHubMonitor()
+        self.monitor.base_url = self.stub.url
+        self.monitor.cache = None
+        self.monitor.state_store = None
+        self.monitor.timeseries = None
+        self.monitor.breakout_detector = None
         self.analyzer = ProjectAnalyzer()
+        self.analyzer.memo = None
         self.evaluator = MonetizationEvaluator()
+        self.evaluator.memo = None
+        
+    def tearDown(self):
+        self.stub.stop()
         
     def test_monitor_performance(self):
         """测试监控模块性能"""
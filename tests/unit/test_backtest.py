@@ -0,0 +1,99 @@
+"""
+评分配置回测单元测试
+"""
+import os
+import copy
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from src.backtest import Backtester
+from src.storage import ResultStore
+
+WEIGHTS = {
+    'technical': {'code_quality': 0.1, 'activity': 0.1, 'tech_stack': 0.1},
+    'market': {'demand': 0.15, 'competition': 0.1, 'user_feedback': 0.15},
+    'monetization': {'license': 0.1, 'complexity': 0.1, 'maintenance': 0.1}
+}
+
+def make_repo(i, stars):
+    return {
+        'id': i, 'name': f'test/repo-{i}', 'stars': stars, 'forks': 10 + i,
+        'language': 'Python' if i % 2 else 'Haskell', 'license': 'MIT', 'topics': ['api']
+    }
+
+class TestBacktester(unittest.TestCase):
+    def setUp(self):
+        """测试前准备：三个间隔10天的快照，大项目之后增长更慢"""
+        self.data_dir = tempfile.mkdtemp()
+        self.store = ResultStore(os.path.join(self.data_dir, 'results.db'))
+        start = datetime(2024, 1, 1)
+        for n in range(3):
+            run_id = self.store.start_run()
+            with self.store._connect() as conn:
+                conn.execute(
+                    'UPDATE runs SET started_at = ? WHERE run_id = ?',
+                    ((start + timedelta(days=10 * n)).isoformat(), run_id)
+                )
+            self.store.save_repos(run_id, [
+                make_repo(i, 100 * (i + 1) + n * (50 - 5 * i)) for i in range(8)
+            ])
+        self.configs = {'default': {'weights': WEIGHTS}}
+        stars_only = copy.deepcopy(WEIGHTS)
+        stars_only['technical']['code_quality'] = 1.0
+        self.configs['stars_heavy'] = {'weights': stars_only}
+        
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+        
+    def test_windows_and_metrics(self):
+        """测试每个有后续快照的快照都参与回测"""
+        result = Backtester(self.store, horizon_days=15, top_k=3, rank_by='overall', max_workers=1).run(self.configs)
+        
+        self.assertEqual(result['snapshots'], 2)
+        self.assertEqual({summary['name'] for summary in result['configs']}, {'default', 'stars_heavy'})
+        for summary in result['configs']:
+            self.assertEqual(len(summary['snapshots']), 2)
+            for snapshot in summary['snapshots']:
+                self.assertEqual(snapshot['picks'], 3)
+                self.assertEqual(snapshot['tracked'], 3)
+                self.assertGreaterEqual(snapshot['precision_at_k'], 0.0)
+                self.assertLessEqual(snapshot['precision_at_k'], 1.0)
+                
+        # 偏重星标的配置选中的是增长最慢的大项目
+        ranked = [summary['name'] for summary in result['configs']]
+        self.assertEqual(ranked[-1], 'stars_heavy')
+        
+    def test_weights_change_results(self):
+        """测试默认按总分选取时，不同权重给出不同的回测结果"""
+        result = Backtester(self.store, horizon_days=15, top_k=3, max_workers=1).run(self.configs)
+        self.assertEqual(result['rank_by'], 'overall')
+        default, stars_heavy = sorted(result['configs'], key=lambda summary: summary['name'])
+        self.assertNotEqual(default['mean_relative_growth'], stars_heavy['mean_relative_growth'])
+        
+    def test_revenue_rejects_equivalent_configs(self):
+        """测试按收入选取时，变现权重相同的配置被拒绝"""
+        backtester = Backtester(self.store, horizon_days=15, top_k=3, rank_by='revenue', max_workers=1)
+        with self.assertRaises(ValueError):
+            backtester.run(self.configs)
+            
+        # 变现权重只差一个倍数的配置同样等价
+        scaled = copy.deepcopy(WEIGHTS)
+        scaled['monetization'] = {key: value * 2 for key, value in WEIGHTS['monetization'].items()}
+        with self.assertRaises(ValueError):
+            backtester.run({'default': {'weights': WEIGHTS}, 'scaled': {'weights': scaled}})
+            
+        license_heavy = copy.deepcopy(WEIGHTS)
+        license_heavy['monetization']['license'] = 1.0
+        result = backtester.run({'default': {'weights': WEIGHTS}, 'license_heavy': {'weights': license_heavy}})
+        self.assertEqual(len(result['configs']), 2)
+        
+    def test_process_pool_matches_inline(self):
+        """测试进程池并行与单进程结果一致"""
+        inline = Backtester(self.store, top_k=3, max_workers=1).run(self.configs)
+        pooled = Backtester(self.store, top_k=3, max_workers=2).run(self.configs)
+        self.assertEqual(inline, pooled)
+
+if __name__ == '__main__':
+    unittest.main()
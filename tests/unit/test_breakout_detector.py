@@ -0,0 +1,77 @@
+"""
+星标突增检测单元测试
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from src.monitor.breakout_detector import BreakoutDetector
+
+DAY = 86400
+
+class TestBreakoutDetector(unittest.TestCase):
+    def setUp(self):
+        """测试前准备"""
+        self.data_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.data_dir, 'breakout_state.json')
+        self.detector = BreakoutDetector(self.path, alpha=0.3, threshold=3)
+        
+    def tearDown(self):
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+        
+    def scan(self, day, stars_by_id):
+        """模拟一轮扫描"""
+        self.detector.start_cycle(ts=day * DAY)
+        for repo_id, stars in stars_by_id.items():
+            self.detector.observe({'id': repo_id, 'name': f'test/repo{repo_id}', 'stars': stars})
+        return self.detector.breakouts()
+        
+    def test_detects_breakout(self):
+        """测试增长突然超出基线时报告突增"""
+        # 仓库1每天约10星，仓库2每天约50星
+        for day in range(6):
+            self.assertEqual(self.scan(day, {1: 100 + day * 10, 2: 1000 + day * 50 + day % 2}), [])
+            
+        breakouts = self.scan(6, {1: 100 + 5 * 10 + 200, 2: 1000 + 6 * 50})
+        
+        self.assertEqual([b['id'] for b in breakouts], [1])
+        self.assertEqual(breakouts[0]['stars_per_day'], 200)
+        self.assertEqual(breakouts[0]['baseline_per_day'], 10)
+        
+    def test_short_interval_ignored(self):
+        """测试间隔过短的扫描不会把少量星标折算成突增"""
+        for day in range(6):
+            self.scan(day, {1: 100 + day * 10})
+            
+        # 5分钟后多了5个星标，折算为每天1440星
+        self.assertEqual(self.scan(5 + 5 / 1440, {1: 155}), [])
+        self.assertEqual(self.detector.states['1']['ts'], 5 * DAY)
+        
+        # 下一次足够长的间隔按累积的增量计算
+        self.assertEqual(self.scan(6, {1: 160}), [])
+        self.assertEqual(self.detector.states['1']['stars'], 160)
+        
+    def test_state_persisted(self):
+        """测试状态保存后新实例继续使用基线"""
+        for day in range(5):
+            self.scan(day, {1: 100 + day * 10})
+        self.detector.save()
+        
+        detector = BreakoutDetector(self.path, alpha=0.3, threshold=3)
+        detector.start_cycle(ts=5 * DAY)
+        breakout = detector.observe({'id': 1, 'name': 'test/repo1', 'stars': 500})
+        
+        self.assertIsNotNone(breakout)
+        self.assertGreater(breakout['z_score'], 3)
+        
+    def test_repeated_record_in_cycle(self):
+        """测试同一轮内重复出现的仓库只计一次"""
+        self.scan(0, {1: 100})
+        self.detector.start_cycle(ts=DAY)
+        self.detector.observe({'id': 1, 'stars': 110})
+        self.detector.observe({'id': 1, 'stars': 110})
+        
+        self.assertEqual(self.detector.states['1']['n'], 1)
+        
+if __name__ == '__main__':
+    unittest.main()
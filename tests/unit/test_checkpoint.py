@@ -0,0 +1,63 @@
+"""
+流水线检查点单元测试
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from src.utils.checkpoint import CheckpointStore
+
+class TestCheckpointStore(unittest.TestCase):
+    def setUp(self):
+        """测试前准备"""
+        self.data_dir = tempfile.mkdtemp()
+        self.checkpoint = CheckpointStore(os.path.join(self.data_dir, 'checkpoints'))
+        
+    def tearDown(self):
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+        
+    def test_append_and_load(self):
+        """测试按批追加后按键读回，同键以后写入的为准"""
+        self.checkpoint.begin('run-1')
+        self.checkpoint.append('monitor', [{'id': 2, 'name': 'b'}, {'id': 1, 'name': 'a'}])
+        self.checkpoint.append('monitor', [{'id': 2, 'name': 'b2'}])
+        
+        self.assertEqual(self.checkpoint.run_id, 'run-1')
+        records = self.checkpoint.load('monitor')
+        self.assertEqual(list(records), [2, 1])
+        self.assertEqual(records[2]['name'], 'b2')
+        self.assertEqual(self.checkpoint.load('missing'), {})
+        
+    def test_truncated_line_repaired(self):
+        """测试写入中断留下的残行被丢弃，之后的追加不受影响"""
+        self.checkpoint.append('monitor', [{'id': 1}])
+        with open(os.path.join(self.checkpoint.directory, 'monitor.jsonl'), 'a', encoding='utf-8') as f:
+            f.write('{"id": 2, "na')
+            
+        self.assertEqual(list(self.checkpoint.load('monitor')), [1])
+        self.checkpoint.append('monitor', [{'id': 3}])
+        self.assertEqual(list(self.checkpoint.load('monitor')), [1, 3])
+        
+    def test_stage_completion_and_clear(self):
+        """测试阶段完成标记、重置和清除"""
+        self.checkpoint.begin('run-1')
+        self.checkpoint.append('search', [{'id': 1}])
+        self.assertFalse(self.checkpoint.is_complete('search'))
+        self.checkpoint.mark_complete('search')
+        self.assertTrue(self.checkpoint.is_complete('search'))
+        
+        self.checkpoint.reset('search')
+        self.assertFalse(self.checkpoint.is_complete('search'))
+        self.assertEqual(self.checkpoint.load('search'), {})
+        
+        # 开始新的运行时清除旧检查点
+        self.checkpoint.append('monitor', [{'id': 1}])
+        self.checkpoint.begin('run-2')
+        self.assertEqual(self.checkpoint.run_id, 'run-2')
+        self.assertEqual(self.checkpoint.load('monitor'), {})
+        
+        self.checkpoint.clear()
+        self.assertIsNone(self.checkpoint.run_id)
+
+if __name__ == '__main__':
+    unittest.main()
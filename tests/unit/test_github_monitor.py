@@ -1,16 +1,29 @@
 """
 GitHub监控模块单元测试
 """
+import io
+import os
+import asyncio
+import time
+import threading
 import unittest
+from contextlib import redirect_stdout
 from unittest.mock import patch, MagicMock
+from src.monitor.async_client import AsyncGitHubClient
 from src.monitor.github_monitor import GitHubMonitor
+from src.storage import ResultStore
+from src.utils.checkpoint import CheckpointStore
+from src.utils.token_pool import TokenPool, TokenRejected
+from tests.fixtures.isolated_data import isolate_data
 
 class TestGitHubMonitor(unittest.TestCase):
     def setUp(self):
         """测试前准备"""
+        # 状态、时间序列、突增检测和HTTP缓存都写入临时目录
+        self.data_dir = isolate_data(self)
         self.monitor = GitHubMonitor()
         
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_search_trending_repos(self, mock_get):
         """测试趋势项目搜索"""
         # 模拟API响应
@@ -42,8 +55,64 @@ class TestGitHubMonitor(unittest.TestCase):
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0]['name'], 'test/repo')
         self.assertEqual(results[0]['stars'], 1000)
+        self.assertEqual(results[0]['matched_keywords'], self.monitor.keywords)
         
-    @patch('requests.get')
+    @patch('requests.Session.get')
+    def test_search_combined_queries(self, mock_get):
+        """测试合并关键词的OR查询"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {'items': [{
+            'id': 1,
+            'full_name': 'test/bot',
+            'description': 'A telegram bot for automation',
+            'html_url': 'https://github.com/test/bot',
+            'stargazers_count': 500,
+            'forks_count': 50,
+            'language': 'Python',
+            'created_at': '2024-01-01T00:00:00Z',
+            'updated_at': '2024-02-01T00:00:00Z',
+            'topics': ['telegram-bot'],
+            'open_issues_count': 1
+        }]}
+        mock_get.return_value = mock_response
+        self.monitor.combine_keywords = True
+        
+        results = self.monitor.search_trending_repos()
+        
+        # 10个关键词在运算符限制下合并为2个查询
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertIn(' OR ', mock_get.call_args_list[0].kwargs['params']['q'])
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['matched_keywords'], ['automation', 'telegram-bot'])
+        
+    @patch('requests.Session.get')
+    def test_search_combined_top_per_keyword(self, mock_get):
+        """测试合并查询时每个关键词各取前5个结果"""
+        def item(i, description):
+            return {
+                'id': i, 'full_name': f'test/repo-{i}', 'description': description,
+                'html_url': f'https://github.com/test/repo-{i}', 'stargazers_count': 1000 - i,
+                'forks_count': 10, 'language': 'Python', 'created_at': '2024-01-01T00:00:00Z',
+                'updated_at': '2024-02-01T00:00:00Z', 'topics': [], 'open_issues_count': 0
+            }
+            
+        # 按星标排序时前8个都只命中 automation
+        items = [item(i, 'workflow automation tool') for i in range(8)]
+        items += [item(i, 'telegram bot') for i in range(8, 11)]
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {'items': items}
+        mock_get.return_value = mock_response
+        self.monitor.combine_keywords = True
+        self.monitor.keywords = ['automation', 'telegram']
+        
+        results = self.monitor.search_trending_repos()
+        
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual([r['id'] for r in results], [0, 1, 2, 3, 4, 8, 9, 10])
+        
+    @patch('requests.Session.get')
     def test_analyze_repo_activity(self, mock_get):
         """测试仓库活跃度分析"""
         # 模拟API响应
@@ -63,6 +132,308 @@ class TestGitHubMonitor(unittest.TestCase):
         self.assertIn('active_weeks', activity)
         self.assertEqual(activity['total_commits'], 30)
         
+    @patch('requests.Session.get')
+    def test_rejected_token_falls_back(self, mock_get):
+        """测试令牌被拒绝时换下一个令牌重试，全部被拒绝时中止补充信息"""
+        self.monitor.cache = None
+        self.monitor.token_pool = TokenPool(['bad-token', 'good-token'])
+        
+        def fake_get(url, headers=None, params=None, **kwargs):
+            response = MagicMock()
+            response.headers = {}
+            if headers['Authorization'] == 'token bad-token':
+                response.status_code = 401
+            else:
+                response.status_code = 200
+                response.json.return_value = [{'total': 3, 'week': 1}]
+            return response
+            
+        mock_get.side_effect = fake_get
+        activity = asyncio.run(self.monitor.analyze_repo_activity_async('test/repo'))
+        self.assertEqual(activity['total_commits'], 3)
+        self.assertEqual(self.monitor.token_pool.tokens, ['good-token'])
+        
+        # 剩下的令牌也被拒绝时异常不被吞掉
+        self.monitor.token_pool.reject('good-token')
+        with self.assertRaises(TokenRejected):
+            asyncio.run(self.monitor.enrich_repo_async({'name': 'test/repo'}))
+            
+    @patch('requests.Session.get')
+    def test_rate_limit_retry_counter(self, mock_get):
+        """测试被限流时的重试次数和提示"""
+        self.monitor.cache = None
+        self.monitor.max_retries = 3
+        response = MagicMock()
+        response.status_code = 429
+        response.headers = {'Retry-After': '0'}
+        mock_get.return_value = response
+        
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.monitor._send('https://api.github.com/repos/test/repo')
+            
+        self.assertEqual(mock_get.call_count, 4)
+        self.assertIn('(3/3)', output.getvalue())
+        self.assertNotIn('(4/3)', output.getvalue())
+        
+    @patch('requests.Session.get')
+    def test_run_monitor_concurrent(self, mock_get):
+        """测试并发获取仓库详情"""
+        repos = [{'id': i, 'name': f'test/repo-{i}'} for i in range(6)]
+        self.monitor.async_client = AsyncGitHubClient(self.monitor._request, 3)
+        in_flight = {'now': 0, 'peak': 0}
+        lock = threading.Lock()
+        
+        def fake_get(url, headers=None, params=None, **kwargs):
+            with lock:
+                in_flight['now'] += 1
+                in_flight['peak'] = max(in_flight['peak'], in_flight['now'])
+            time.sleep(0.02)
+            with lock:
+                in_flight['now'] -= 1
+            response = MagicMock()
+            response.status_code = 200
+            if url.endswith('/stats/commit_activity'):
+                response.json.return_value = [{'total': 1, 'week': 1}]
+            else:
+                response.json.return_value = []
+            return response
+            
+        mock_get.side_effect = fake_get
+        
+        with patch.object(self.monitor, 'search_trending_repos', return_value=repos), \
+             patch.object(self.monitor, 'save_results'):
+            results = self.monitor.run_monitor()
+            
+        # 验证结果顺序与内容
+        self.assertEqual([r['name'] for r in results], [r['name'] for r in repos])
+        self.assertEqual(results[0]['activity']['total_commits'], 1)
+        # 24个请求同时在途的数量不超过并发上限
+        self.assertGreater(in_flight['peak'], 1)
+        self.assertLessEqual(in_flight['peak'], 3)
+        
+    @patch('requests.Session.get')
+    def test_run_monitor_retries_pending_stats(self, mock_get):
+        """测试202统计数据生成中时延迟重试"""
+        repos = [{'id': 1, 'name': 'test/pending'}, {'id': 2, 'name': 'test/ready'}]
+        calls = {'test/pending': 0}
+        
+        def fake_get(url, headers=None, params=None, **kwargs):
+            response = MagicMock()
+            response.status_code = 200
+            response.json.return_value = []
+            if url.endswith('/stats/commit_activity'):
+                response.json.return_value = [{'total': 5, 'week': 1}]
+                if 'test/pending' in url:
+                    calls['test/pending'] += 1
+                    if calls['test/pending'] < 3:
+                        response.status_code = 202
+                        response.json.return_value = {}
+            return response
+            
+        mock_get.side_effect = fake_get
+        self.monitor.stats_retry_delay = 0.01
+        
+        with patch.object(self.monitor, 'search_trending_repos', return_value=repos), \
+             patch.object(self.monitor, 'save_results'):
+            results = self.monitor.run_monitor()
+            
+        self.assertEqual(calls['test/pending'], 3)
+        self.assertEqual(results[0]['activity']['total_commits'], 5)
+        self.assertEqual(results[1]['activity']['total_commits'], 5)
+        
+    @patch('requests.Session.post')
+    def test_run_monitor_graphql_mode(self, mock_post):
+        """测试GraphQL批量获取详情"""
+        repos = [{'id': 1, 'name': 'test/a'}, {'id': 2, 'name': 'test/b'}]
+        node = {'committedDate': '2024-01-02T00:00:00Z',
+                'author': {'user': {'login': 'dev', 'url': 'https://github.com/dev'}}}
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {'data': {
+            'r0': {
+                'openIssues': {'totalCount': 3},
+                'closedIssues': {'totalCount': 7},
+                'openPulls': {'totalCount': 1},
+                'mergedPulls': {'totalCount': 4},
+                'defaultBranchRef': {'target': {'history': {'totalCount': 2, 'nodes': [node, node]}}}
+            },
+            'r1': None
+        }}
+        mock_post.return_value = mock_response
+        self.monitor.enrichment_mode = 'graphql'
+        
+        with patch.object(self.monitor, 'search_trending_repos', return_value=repos), \
+             patch.object(self.monitor, 'save_results'):
+            results = self.monitor.run_monitor()
+            
+        # 两个仓库只发出一次请求
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertIn('r1: repository(owner: "test", name: "b")', mock_post.call_args.kwargs['json']['query'])
+        self.assertEqual(results[0]['issues'], {
+            'open_issues_count': 3,
+            'closed_issues_count': 7,
+            'open_pulls_count': 1,
+            'merged_pulls_count': 4
+        })
+        self.assertEqual(results[0]['activity']['total_commits'], 2)
+        self.assertEqual(results[0]['activity']['active_weeks'], 1)
+        self.assertEqual(results[0]['contributors'][0]['contributions'], 2)
+        self.assertEqual(results[1]['issues'], {})
+        
+    @patch('requests.Session.get')
+    def test_run_monitor_incremental(self, mock_get):
+        """测试未变化的仓库复用上次的补充信息"""
+        repos = [
+            {'id': 1, 'name': 'test/same', 'updated_at': 't1', 'pushed_at': 't1'},
+            {'id': 2, 'name': 'test/moved', 'updated_at': 't1', 'pushed_at': 't1'}
+        ]
+        
+        def fake_get(url, headers=None, params=None, **kwargs):
+            response = MagicMock()
+            response.status_code = 200
+            response.json.return_value = [{'total': 1, 'week': 1}] if 'stats' in url else []
+            return response
+            
+        mock_get.side_effect = fake_get
+        # 两次扫描紧挨着进行，不设快照最短间隔
+        self.monitor.timeseries.min_interval_days = 0
+        with patch.object(self.monitor, 'save_results'):
+            with patch.object(self.monitor, 'search_trending_repos', return_value=repos):
+                self.monitor.run_monitor()
+            first_calls = mock_get.call_count
+            
+            # 第二次运行只有一个仓库的时间戳变化
+            repos[1] = {**repos[1], 'pushed_at': 't2'}
+            with patch.object(self.monitor, 'search_trending_repos', return_value=repos):
+                results = self.monitor.run_monitor()
+                
+        self.assertEqual(mock_get.call_count - first_calls, first_calls // 2)
+        self.assertEqual(results[0]['activity']['total_commits'], 1)
+        self.assertEqual(self.monitor.state_store.states['2']['pushed_at'], 't2')
+        
+        # 两次扫描后有了增长速度
+        self.assertEqual(results[0]['trend']['samples'], 2)
+        
+    @patch('requests.Session.get')
+    def test_iter_monitor_streams_chunks(self, mock_get):
+        """测试流式监控按搜索顺序分批产出并逐批保存"""
+        repos = [{'id': i, 'name': f'test/repo-{i}'} for i in range(5)]
+        
+        def fake_get(url, headers=None, params=None, **kwargs):
+            response = MagicMock()
+            response.status_code = 200
+            response.json.return_value = [{'total': 1, 'week': 1}] if 'stats' in url else []
+            return response
+            
+        mock_get.side_effect = fake_get
+        self.monitor.stream_chunk_size = 2
+        
+        with patch.object(self.monitor, 'search_trending_repos', return_value=repos), \
+             patch.object(self.monitor, 'save_results') as save_results:
+            results = list(self.monitor.iter_monitor('run-1', buffer_size=1))
+            
+        self.assertEqual([r['name'] for r in results], [r['name'] for r in repos])
+        self.assertEqual(results[4]['activity']['total_commits'], 1)
+        self.assertEqual([len(call.args[0]) for call in save_results.call_args_list], [2, 2, 1])
+        self.assertEqual(save_results.call_args.kwargs['run_id'], 'run-1')
+        
+    @patch('requests.Session.get')
+    def test_exhaustive_search_streams_into_enrichment(self, mock_get):
+        """测试 exhaustive 模式搜索未结束时已开始补充详情"""
+        repos = [{'id': i, 'name': f'test/repo-{i}', 'stars': 10} for i in range(5)]
+        enriched = threading.Event()
+        waited = []
+        
+        def search(keywords=None):
+            for i, repo in enumerate(repos):
+                if i == 4:
+                    # 前两批的详情补充完之前不继续搜索
+                    waited.append(enriched.wait(timeout=2))
+                yield repo
+                
+        def fake_get(url, headers=None, params=None, **kwargs):
+            enriched.set()
+            response = MagicMock()
+            response.status_code = 200
+            response.json.return_value = [{'total': 1, 'week': 1}] if 'stats' in url else []
+            return response
+            
+        mock_get.side_effect = fake_get
+        self.monitor.search_mode = 'exhaustive'
+        self.monitor.stream_chunk_size = 2
+        
+        with patch.object(self.monitor, 'iter_search_repos', side_effect=search), \
+             patch.object(self.monitor, 'save_results') as save_results:
+            results = list(self.monitor.iter_monitor('run-1', buffer_size=1))
+            
+        self.assertEqual(waited, [True])
+        self.assertEqual([r['name'] for r in results], [r['name'] for r in repos])
+        self.assertEqual([len(call.args[0]) for call in save_results.call_args_list], [2, 2, 1])
+        self.assertEqual(len(self.monitor.timeseries.load()['repo_id']), 5)
+        
+    @patch('requests.Session.get')
+    def test_iter_monitor_resumes_from_checkpoint(self, mock_get):
+        """测试从检查点恢复时不重复搜索，已完成的仓库不再请求详情"""
+        repos = [{'id': i, 'name': f'test/repo-{i}'} for i in range(3)]
+        checkpoint = CheckpointStore(os.path.join(self.data_dir, 'checkpoints'))
+        checkpoint.begin('run-1')
+        checkpoint.append('search', repos)
+        checkpoint.mark_complete('search')
+        checkpoint.append('monitor', [
+            {**repos[1], 'activity': {'total_commits': 9}, 'issues': {'open_issues': 4}}
+        ])
+        
+        def fake_get(url, headers=None, params=None, **kwargs):
+            response = MagicMock()
+            response.status_code = 200
+            response.json.return_value = [{'total': 1, 'week': 1}] if 'stats' in url else []
+            return response
+            
+        mock_get.side_effect = fake_get
+        
+        with patch.object(self.monitor, 'search_trending_repos') as search, \
+             patch.object(self.monitor, 'save_results'):
+            results = list(self.monitor.iter_monitor('run-1', checkpoint=checkpoint))
+            
+        search.assert_not_called()
+        self.assertEqual([r['name'] for r in results], ['test/repo-1', 'test/repo-0', 'test/repo-2'])
+        self.assertEqual(results[0]['activity']['total_commits'], 9)
+        self.assertFalse(any('test/repo-1' in call.args[0] for call in mock_get.call_args_list))
+        self.assertEqual(list(checkpoint.load('monitor')), [1, 0, 2])
+        
+        # 恢复的仓库也写入状态，下次运行不再请求
+        self.assertEqual(self.monitor.state_store.states['1']['enrichment']['activity'], {'total_commits': 9})
+        
+    @patch('requests.Session.get')
+    def test_get_repo_issues_counts(self, mock_get):
+        """测试通过Link头计算问题和PR总数"""
+        totals = {
+            ('issues', 'open'): 130, ('issues', 'closed'): 950,
+            ('pulls', 'open'): 30, ('pulls', 'closed'): 400
+        }
+        
+        def fake_get(url, headers=None, params=None, **kwargs):
+            kind = url.rsplit('/', 1)[-1]
+            total = totals[(kind, params['state'])]
+            response = MagicMock()
+            response.status_code = 200
+            response.headers = {'Link': f'<{url}?state={params["state"]}&per_page=1&page=2>; rel="next", '
+                                        f'<{url}?state={params["state"]}&per_page=1&page={total}>; rel="last"'}
+            response.json.return_value = [{'state': params['state']}]
+            return response
+            
+        mock_get.side_effect = fake_get
+        issues = self.monitor.get_repo_issues('test/repo')
+        
+        self.assertEqual(issues, {
+            'open_issues_count': 100,
+            'closed_issues_count': 550,
+            'open_pulls_count': 30,
+            'closed_pulls_count': 400
+        })
+        self.assertTrue(all(c.kwargs['params']['per_page'] == 1 for c in mock_get.call_args_list))
+        
     def test_extract_repo_info(self):
         """测试仓库信息提取"""
         # 测试数据
@@ -96,16 +467,24 @@ class TestGitHubMonitor(unittest.TestCase):
         # 测试数据
         results = [
             {
+                'id': 1,
                 'name': 'test/repo',
                 'stars': 1000,
                 'forks': 100
             }
         ]
         
-        # 执行测试
-        self.monitor.save_results(results, 'test_results.json')
+        store = ResultStore(os.path.join(self.data_dir, 'results.db'))
+        filename = os.path.join(self.data_dir, 'test_results.json')
         
-        # 验证文件是否创建（这里可以添加文件读取和内容验证）
+        # 执行测试
+        with patch('src.monitor.github_monitor.get_result_store', return_value=store):
+            self.monitor.save_results(results, filename, run_id='run-1')
+            
+        # 验证结果库和导出文件
+        self.assertEqual(store.load_repos('run-1'), results)
+        self.assertTrue(os.path.exists(filename))
+        store.close()
         
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
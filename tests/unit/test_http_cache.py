@@ -0,0 +1,74 @@
+"""
+HTTP条件请求缓存单元测试
+"""
+import json
+import shutil
+import tempfile
+import unittest
+import requests
+from src.utils.http_cache import HTTPCache
+
+def make_response(status_code: int, body=None, headers=None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(body).encode('utf-8') if body is not None else b''
+    response.headers.update(headers or {})
+    return response
+
+class TestHTTPCache(unittest.TestCase):
+    def setUp(self):
+        """测试前准备"""
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = HTTPCache(cache_dir=self.cache_dir, max_bytes=10 * 1024)
+        self.sent_headers = []
+        
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        
+    def _send(self, responses):
+        def send(url, headers=None, params=None):
+            self.sent_headers.append(headers)
+            return responses.pop(0)
+        return send
+        
+    def test_revalidation_served_from_cache(self):
+        """测试304响应使用本地内容"""
+        send = self._send([
+            make_response(200, [{'total': 3}], {'ETag': '"abc"', 'X-RateLimit-Remaining': '10'}),
+            make_response(304, headers={'ETag': '"abc"', 'X-RateLimit-Remaining': '9'})
+        ])
+        url = 'https://api.github.com/repos/a/b/stats/commit_activity'
+        
+        first = self.cache.get(send, url, params={'per_page': 100})
+        second = self.cache.get(send, url, params={'per_page': 100})
+        
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second.headers['X-RateLimit-Remaining'], '9')
+        self.assertEqual(self.sent_headers[1]['If-None-Match'], '"abc"')
+        self.assertEqual(self.cache.stats['hits'], 1)
+        self.assertEqual(self.cache.stats['misses'], 1)
+        
+    def test_persisted_between_instances(self):
+        """测试缓存持久化到磁盘"""
+        url = 'https://api.github.com/repos/a/b/contributors'
+        self.cache.get(self._send([make_response(200, [], {'ETag': '"x"'})]), url)
+        
+        reloaded = HTTPCache(cache_dir=self.cache_dir)
+        reloaded.get(self._send([make_response(304)]), url)
+        self.assertEqual(reloaded.stats['hits'], 1)
+        
+    def test_lru_eviction(self):
+        """测试超过容量时淘汰最久未使用的条目"""
+        body = ['x' * 1000] * 3
+        for i in range(5):
+            url = f'https://api.github.com/repos/a/repo-{i}'
+            self.cache.get(self._send([make_response(200, body, {'ETag': f'"{i}"'})]), url)
+            
+        self.assertGreater(self.cache.stats['evictions'], 0)
+        self.assertLessEqual(self.cache._total_bytes, self.cache.max_bytes)
+        self.assertIn(HTTPCache.make_key('https://api.github.com/repos/a/repo-4'), self.cache._index)
+        self.assertNotIn(HTTPCache.make_key('https://api.github.com/repos/a/repo-0'), self.cache._index)
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+"""
+共享HTTP客户端单元测试
+"""
+import unittest
+from unittest.mock import patch
+from src.utils.http_client import HTTPClient
+
+class TestHTTPClient(unittest.TestCase):
+    def setUp(self):
+        """测试前准备"""
+        self.client = HTTPClient(pool_maxsize=4, connect_timeout=2, read_timeout=10)
+        
+    def tearDown(self):
+        self.client.close()
+        
+    def test_session_reused_per_host(self):
+        """测试同一主机复用会话"""
+        first = self.client.get_session('https://api.github.com/search/repositories')
+        second = self.client.get_session('https://api.github.com/repos/a/b')
+        other = self.client.get_session('https://api.deepseek.com/v1/chat')
+        
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(first.get_adapter('https://api.github.com')._pool_maxsize, 4)
+        self.assertIn('gzip', first.headers['Accept-Encoding'])
+        
+    @patch('requests.Session.get')
+    def test_default_timeout(self, mock_get):
+        """测试默认超时"""
+        self.client.get('https://api.github.com/rate_limit')
+        self.assertEqual(mock_get.call_args.kwargs['timeout'], (2, 10))
+        
+        self.client.get('https://api.github.com/rate_limit', timeout=1)
+        self.assertEqual(mock_get.call_args.kwargs['timeout'], 1)
+        
+if __name__ == '__main__':
+    unittest.main()
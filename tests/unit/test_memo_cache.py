@@ -0,0 +1,69 @@
+"""
+评分结果缓存单元测试
+"""
+import io
+import os
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+from src.storage import MemoCache
+from src.analyzer.project_analyzer import ProjectAnalyzer
+from tests.fixtures.isolated_data import isolate_data
+
+class TestMemoCache(unittest.TestCase):
+    def setUp(self):
+        """测试前准备"""
+        self.data_dir = isolate_data(self)
+        self.path = os.path.join(self.data_dir, 'memo.db')
+        
+    def test_iter_cached(self):
+        """测试只计算未命中的记录并保持顺序"""
+        memo = MemoCache('test', self.path)
+        computed = []
+        
+        def compute(batch):
+            computed.extend(batch)
+            return [value * 10 for value in batch]
+            
+        keys = [memo.make_key(value, 'config') for value in (1, 2)]
+        self.assertEqual(list(memo.iter_cached([1, 2], keys, compute)), [10, 20])
+        
+        keys = [memo.make_key(value, 'config') for value in (3, 1, 2)]
+        self.assertEqual(list(memo.iter_cached([3, 1, 2], keys, compute)), [30, 10, 20])
+        self.assertEqual(computed, [1, 2, 3])
+        self.assertEqual(memo.stats['hits'], 2)
+        memo.close()
+        
+    def test_lru_eviction(self):
+        """测试超过容量时淘汰最久未使用的条目"""
+        memo = MemoCache('test', self.path, max_entries=2)
+        with patch('src.storage.memo_cache.time.time', side_effect=[1, 2, 3, 4]):
+            memo.put_many({'a': 1})
+            memo.put_many({'b': 2})
+            memo.get_many(['a'])
+            memo.put_many({'c': 3})
+            
+        self.assertEqual(memo.get_many(['a', 'b', 'c']), {'a': 1, 'c': 3})
+        self.assertEqual(memo.stats['evictions'], 1)
+        memo.close()
+        
+    def test_analyzer_config_change_invalidates(self):
+        """测试评分配置变化后不再命中"""
+        analyzer = ProjectAnalyzer()
+        analyzer.memo = MemoCache('analysis', self.path)
+        project = {'name': 'test/repo', 'stars': 100, 'forks': 10, 'language': 'Go', 'license': 'MIT'}
+        
+        with redirect_stdout(io.StringIO()):
+            first = analyzer.batch_analyze([project])
+            self.assertEqual(analyzer.batch_analyze([{**project, 'url': 'changed'}]), first)
+            self.assertEqual(analyzer.memo.stats['hits'], 1)
+            
+            analyzer.license_scores['MIT'] = 0.5
+            changed = analyzer.batch_analyze([project])
+            
+        self.assertEqual(analyzer.memo.stats['misses'], 2)
+        self.assertNotEqual(changed, first)
+        analyzer.memo.close()
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+变现评估模块单元测试
+"""
+import io
+import unittest
+from contextlib import redirect_stdout
+from src.evaluator.monetization_evaluator import MonetizationEvaluator
+from tests.fixtures.isolated_data import isolate_data
+
+class TestMonetizationEvaluator(unittest.TestCase):
+    def setUp(self):
+        """测试前准备"""
+        isolate_data(self)
+        self.evaluator = MonetizationEvaluator()
+        self.evaluator.memo = None
+        
+    def _analyses(self):
+        """覆盖多路径、同分路径和无效记录的测试数据"""
+        return [
+            {
+                'project_id': 'test/multi', 'features': ['developer_tools'],
+                'competition': {'level': 'low'},
+                'evaluation': {'monetization_score': 0.73, 'market_score': 0.81},
+                'monetization_paths': [
+                    {'type': 'SaaS', 'difficulty': 'medium'},
+                    {'type': 'API Service', 'difficulty': 'medium'},
+                    {'type': 'Support & Consulting', 'difficulty': 'low'}
+                ]
+            },
+            {
+                'project_id': 'test/low', 'topics': ['automation'],
+                'evaluation': {'monetization_score': 0.1, 'market_score': 0.2},
+                'monetization_paths': [
+                    {'type': 'Premium Template', 'difficulty': 'low'},
+                    {'type': 'Premium Template', 'difficulty': 'high'}
+                ]
+            },
+            {
+                'project_id': 'test/int-score',
+                'evaluation': {'monetization_score': 1, 'market_score': 0.7},
+                'monetization_paths': [{'type': 'SaaS', 'difficulty': 'low'}]
+            },
+            # 以下记录在逐个评估时会出错或没有可评估的路径
+            {
+                'project_id': 'test/no-market',
+                'evaluation': {'monetization_score': 0.5},
+                'monetization_paths': [{'type': 'SaaS', 'difficulty': 'medium'}]
+            },
+            {
+                'project_id': 'test/no-difficulty',
+                'evaluation': {'monetization_score': 0.5, 'market_score': 0.5},
+                'monetization_paths': [{'type': 'SaaS'}]
+            },
+            {
+                'project_id': 'test/no-paths',
+                'evaluation': {'monetization_score': 0.5, 'market_score': 0.5},
+                'monetization_paths': None
+            }
+        ]
+        
+    def test_vectorized_matches_per_project(self):
+        """测试矩阵批量评估与逐个评估结果完全一致"""
+        with redirect_stdout(io.StringIO()):
+            vectorized = self.evaluator.batch_evaluate(self._analyses())
+            per_project = self.evaluator.batch_evaluate(self._analyses(), vectorized=False)
+            
+        self.assertEqual(vectorized, per_project)
+        self.assertEqual(len(vectorized), 3)
+        
+    def test_recommended_path_is_first_best(self):
+        """测试推荐路径为潜在收入最高且靠前的路径"""
+        evaluation = next(self.evaluator._iter_evaluations_vectorized(self._analyses()[1:2]))
+        potential = evaluation['monetization_potential']
+        
+        self.assertIs(potential['recommended_path'], potential['evaluated_paths'][0])
+        self.assertEqual(potential['recommended_path']['difficulty'], 'low')
+        self.assertEqual(potential['market_analysis']['target_audience'], ['DevOps'])
+
+if __name__ == '__main__':
+    unittest.main()
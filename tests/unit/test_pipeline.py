@@ -0,0 +1,64 @@
+"""
+有界流水线队列单元测试
+"""
+import threading
+import time
+import unittest
+from src.utils.pipeline import BoundedStream
+
+class TestBoundedStream(unittest.TestCase):
+    def test_order_and_chunks(self):
+        """测试按写入顺序消费，分批不超过指定大小"""
+        def produce(stream):
+            for i in range(10):
+                stream.put(i)
+                
+        stream = BoundedStream(produce, maxsize=4)
+        time.sleep(0.05)
+        chunks = list(stream.chunks(3))
+        
+        self.assertEqual([item for chunk in chunks for item in chunk], list(range(10)))
+        self.assertTrue(all(1 <= len(chunk) <= 3 for chunk in chunks))
+        
+    def test_backpressure(self):
+        """测试队列满时生产方等待"""
+        produced = []
+        
+        def produce(stream):
+            for i in range(10):
+                stream.put(i)
+                produced.append(i)
+                
+        stream = BoundedStream(produce, maxsize=2)
+        time.sleep(0.1)
+        self.assertLessEqual(len(produced), 3)
+        self.assertEqual(list(stream), list(range(10)))
+        
+    def test_error_raised_after_items(self):
+        """测试生产方异常在已写入的记录之后抛出"""
+        def produce(stream):
+            stream.put('a')
+            raise RuntimeError('API error')
+            
+        items = []
+        with self.assertRaises(RuntimeError):
+            for item in BoundedStream(produce):
+                items.append(item)
+        self.assertEqual(items, ['a'])
+        
+    def test_close_stops_producer(self):
+        """测试消费方提前停止后生产方退出"""
+        stopped = threading.Event()
+        
+        def produce(stream):
+            while stream.put(1):
+                pass
+            stopped.set()
+            
+        stream = BoundedStream(produce, maxsize=1)
+        for _ in stream:
+            break
+        self.assertTrue(stopped.wait(2))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+项目分析模块单元测试
+"""
+import io
+import os
+import unittest
+from contextlib import redirect_stdout
+from src.analyzer.project_analyzer import ProjectAnalyzer
+from tests.fixtures.isolated_data import isolate_data
+
+class TestProjectAnalyzer(unittest.TestCase):
+    def setUp(self):
+        """测试前准备"""
+        isolate_data(self)
+        self.analyzer = ProjectAnalyzer()
+        self.analyzer.memo = None
+        
+    def _projects(self):
+        """覆盖各评分分支和无效记录的测试数据"""
+        return [
+            {
+                'name': 'test/full', 'stars': 1234, 'forks': 321, 'language': 'Python',
+                'license': 'MIT', 'topics': ['api', 'tool'],
+                'activity': {'activity_score': 0.37},
+                'issues': {'open_issues_count': 13, 'closed_issues_count': 29},
+                'trend': {'growth_percentile': 0.83}
+            },
+            {
+                'name': 'test/big', 'stars': 98000, 'forks': 7000, 'language': 'Haskell',
+                'license': 'Unknown', 'topics': [], 'activity': {},
+                'issues': {'open_issues_count': 0, 'closed_issues_count': 0}
+            },
+            {'name': 'test/bare', 'stars': 7, 'forks': 0, 'language': None, 'license': 'GPL-3.0'},
+            {'name': 'test/no-issues', 'stars': 500, 'forks': 50, 'language': 'Go',
+             'license': 'Apache-2.0', 'issues': None},
+            # 以下记录在逐个分析时会出错，应同样被丢弃
+            {'name': 'test/no-stars', 'forks': 1, 'language': 'Go', 'license': 'MIT'},
+            {'name': 'test/bad-activity', 'stars': 1, 'forks': 1, 'language': 'Go',
+             'license': 'MIT', 'activity': None},
+            {'stars': 1, 'forks': 1, 'language': 'Go', 'license': 'MIT'}
+        ]
+        
+    def test_vectorized_matches_per_project(self):
+        """测试按列批量评分与逐个分析结果完全一致"""
+        with redirect_stdout(io.StringIO()):
+            vectorized = self.analyzer.batch_analyze(self._projects())
+            per_project = self.analyzer.batch_analyze(self._projects(), vectorized=False)
+            
+        self.assertEqual(vectorized, per_project)
+        self.assertEqual(len(vectorized), 4)
+        
+    def test_top_k(self):
+        """测试只保留总分最高的K个"""
+        with redirect_stdout(io.StringIO()):
+            full = self.analyzer.batch_analyze(self._projects())
+            top = self.analyzer.batch_analyze(self._projects(), top_k=2)
+            
+        self.assertEqual(top, full[:2])
+        
+    def test_growth_percentile_raises_demand(self):
+        """测试增长百分位参与需求评分"""
+        project = self._projects()[2]
+        base = self.analyzer.analyze_project(project)['evaluation']['market_score']
+        boosted = self.analyzer.analyze_project({**project, 'trend': {'growth_percentile': 1.0}})
+        
+        self.assertGreater(boosted['evaluation']['market_score'], base)
+
+    def test_similarity_index_saved_once(self):
+        """测试批量分析只更新内存中的索引，显式保存后才写入磁盘"""
+        projects = [{**project, 'id': i, 'description': 'api tool'}
+                    for i, project in enumerate(self._projects()[:2])]
+        with redirect_stdout(io.StringIO()):
+            self.analyzer.batch_analyze(projects)
+
+        path = self.analyzer.similarity_index.path
+        self.assertEqual(len(self.analyzer.similarity_index), 2)
+        self.assertFalse(os.path.exists(path))
+        self.analyzer.save_similarity_index()
+        self.assertTrue(os.path.exists(path))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+速率限制调度单元测试
+"""
+import time
+import unittest
+from unittest.mock import MagicMock
+from src.monitor.rate_limiter import RateLimitScheduler, RateLimitError
+
+def make_response(status_code: int, headers: dict) -> MagicMock:
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers
+    return response
+
+class TestRateLimitScheduler(unittest.TestCase):
+    def test_classify(self):
+        """测试配额类别识别"""
+        self.assertEqual(RateLimitScheduler.classify('https://api.github.com/search/repositories'), 'search')
+        self.assertEqual(RateLimitScheduler.classify('https://api.github.com/graphql'), 'graphql')
+        self.assertEqual(RateLimitScheduler.classify('https://api.github.com/repos/a/b/issues'), 'core')
+        
+    def test_buckets_are_independent(self):
+        """测试search和core配额互不影响"""
+        scheduler = RateLimitScheduler(limits={'core': (100, 60), 'search': (2, 60)}, max_wait=0.1)
+        scheduler.acquire('search')
+        scheduler.acquire('search')
+        
+        with self.assertRaises(RateLimitError):
+            scheduler.acquire('search')
+        scheduler.acquire('core')
+        
+    def test_exhausted_budget_blocks_until_reset(self):
+        """测试响应头显示配额耗尽时暂停"""
+        scheduler = RateLimitScheduler(max_wait=0.5)
+        scheduler.update('core', make_response(200, {
+            'X-RateLimit-Limit': '5000',
+            'X-RateLimit-Remaining': '0',
+            'X-RateLimit-Reset': str(int(time.time()) + 600)
+        }))
+        
+        state = scheduler.budget_state()['core']
+        self.assertEqual(state['remaining'], 0)
+        self.assertGreater(state['blocked_for_seconds'], 500)
+        with self.assertRaises(RateLimitError):
+            scheduler.acquire('core')
+            
+    def test_retry_after(self):
+        """测试二级限流的Retry-After"""
+        scheduler = RateLimitScheduler()
+        response = make_response(403, {'Retry-After': '0.2', 'X-RateLimit-Resource': 'search'})
+        
+        self.assertTrue(scheduler.is_rate_limited(response))
+        scheduler.update('core', response)
+        
+        start = time.monotonic()
+        scheduler.acquire('search')
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+        self.assertFalse(scheduler.is_rate_limited(make_response(403, {})))
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+结果库单元测试
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from src.storage import ResultStore
+
+def make_evaluation(project_id, revenue):
+    return {
+        'project_id': project_id,
+        'monetization_potential': {
+            'recommended_path': {'type': 'SaaS', 'potential_monthly_revenue': revenue}
+        }
+    }
+
+class TestResultStore(unittest.TestCase):
+    def setUp(self):
+        """测试前准备"""
+        self.data_dir = tempfile.mkdtemp()
+        self.store = ResultStore(os.path.join(self.data_dir, 'results.db'))
+        
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+        
+    def test_wal_mode(self):
+        """测试使用WAL模式"""
+        mode = self.store._connect().execute('PRAGMA journal_mode').fetchone()[0]
+        self.assertEqual(mode, 'wal')
+        
+    def test_repos_round_trip(self):
+        """测试监控结果与补充信息分表存储后能完整读回"""
+        run_id = self.store.start_run()
+        repos = [
+            {'id': 2, 'name': 'b/repo', 'stars': 10, 'activity': {'activity_score': 0.5}, 'issues': {}},
+            {'id': 1, 'name': 'a/repo', 'stars': 20}
+        ]
+        self.store.save_repos(run_id, repos)
+        
+        self.assertEqual(self.store.load_repos(run_id), repos)
+        self.assertEqual(self.store.latest_run_id('repos'), run_id)
+        
+    def test_top_evaluations(self):
+        """测试按预计月收入取前N个"""
+        old_run = self.store.start_run()
+        self.store.save_evaluations(old_run, [make_evaluation('old/repo', 9000)])
+        run_id = self.store.start_run()
+        self.store.save_evaluations(run_id, [
+            make_evaluation(f'test/repo{i}', revenue)
+            for i, revenue in enumerate([300, 1200, 800])
+        ])
+        
+        top = self.store.top_evaluations(limit=2, run_id=run_id)
+        self.assertEqual([e['project_id'] for e in top], ['test/repo1', 'test/repo2'])
+        
+        # 不限运行时包含所有运行的结果
+        top = self.store.top_evaluations(limit=1, since=datetime.now() - timedelta(days=7))
+        self.assertEqual(top[0]['project_id'], 'old/repo')
+        
+    def test_analyses_sorted_by_score(self):
+        """测试分析结果按总分读取"""
+        run_id = self.store.start_run()
+        self.store.save_analyses(run_id, [
+            {'project_id': 'a', 'evaluation': {'overall_score': 0.3}},
+            {'project_id': 'b', 'evaluation': {'overall_score': 0.9}}
+        ])
+        
+        self.assertEqual([a['project_id'] for a in self.store.load_analyses()], ['b', 'a'])
+        self.assertEqual(len(self.store.top_analyses(limit=1)), 1)
+        
+if __name__ == '__main__':
+    unittest.main()
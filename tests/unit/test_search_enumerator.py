@@ -0,0 +1,58 @@
+"""
+日期窗口搜索遍历单元测试
+"""
+import re
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+from src.monitor.search_enumerator import SearchEnumerator
+
+class FakeSearchMonitor:
+    """按 created: 日期范围过滤的假搜索接口"""
+    base_url = 'https://api.github.com'
+    
+    def __init__(self, count: int):
+        start = datetime(2020, 1, 1)
+        self.repos = [
+            {'id': i, 'created_at': start + timedelta(hours=i)}
+            for i in range(count)
+        ]
+        
+    def _request(self, url, params=None):
+        low, high = re.search(r'created:(\S+)\.\.(\S+)', params['q']).groups()
+        low = datetime.strptime(low, '%Y-%m-%dT%H:%M:%SZ')
+        high = datetime.strptime(high, '%Y-%m-%dT%H:%M:%SZ')
+        matched = [r for r in self.repos if low <= r['created_at'] <= high]
+        
+        page, per_page = params['page'], params['per_page']
+        visible = matched[:1000]
+        response = MagicMock()
+        response.json.return_value = {
+            'total_count': len(matched),
+            'items': visible[(page - 1) * per_page:page * per_page]
+        }
+        return response
+
+class TestSearchEnumerator(unittest.TestCase):
+    def test_enumerates_beyond_result_cap(self):
+        """测试超过1000条上限的查询被拆分并完整遍历"""
+        monitor = FakeSearchMonitor(2500)
+        enumerator = SearchEnumerator(
+            monitor,
+            start=datetime(2019, 1, 1),
+            end=datetime(2021, 1, 1)
+        )
+        
+        ids = [repo['id'] for repo in enumerator.iter_items('ai stars:>100')]
+        
+        self.assertEqual(len(ids), 2500)
+        self.assertEqual(len(set(ids)), 2500)
+        self.assertGreater(enumerator.stats['splits'], 0)
+        
+    def test_invalid_date_field(self):
+        """测试不支持的日期字段"""
+        with self.assertRaises(ValueError):
+            SearchEnumerator(FakeSearchMonitor(0), date_field='updated')
+            
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+相似项目索引单元测试
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from src.analyzer.similarity_index import SimilarityIndex, repo_tokens
+
+def make_repo(repo_id, description, topics, stars=100):
+    return {'id': repo_id, 'name': f'test/repo{repo_id}', 'description': description,
+            'topics': topics, 'stars': stars}
+
+class TestSimilarityIndex(unittest.TestCase):
+    def setUp(self):
+        """测试前准备"""
+        self.data_dir = tempfile.mkdtemp()
+        self.index = SimilarityIndex(os.path.join(self.data_dir, 'index.npz'))
+        self.bots = [
+            make_repo(1, 'Discord bot for music playback and moderation', ['discord-bot', 'music'], 5000),
+            make_repo(2, 'Music playback Discord bot with moderation commands', ['discord-bot', 'music'], 3000),
+            make_repo(3, 'Kubernetes operator for managing Postgres clusters', ['kubernetes', 'postgres'], 800)
+        ]
+        for repo in self.bots:
+            self.index.add(repo)
+            
+    def tearDown(self):
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+        
+    def test_query_finds_similar(self):
+        """测试找到相似项目且不包含自身"""
+        similar = self.index.query(self.bots[0])
+        
+        self.assertEqual([s['id'] for s in similar], [2])
+        self.assertGreater(similar[0]['similarity'], 0.5)
+        self.assertEqual(self.index.query(self.bots[2]), [])
+        
+    def test_competition(self):
+        """测试竞争评分随竞品数量和强弱变化"""
+        crowded = self.index.competition(self.bots[1])
+        alone = self.index.competition(self.bots[2])
+        
+        self.assertEqual(crowded['competitors'], 1)
+        self.assertEqual(crowded['top_competitors'], ['test/repo1'])
+        self.assertLess(crowded['score'], alone['score'])
+        self.assertEqual(alone['level'], 'low')
+        self.assertIsNone(self.index.competition({'id': 9, 'description': '', 'topics': []}))
+        
+    def test_incremental_update_and_persistence(self):
+        """测试重新加入时更新签名，保存后可加载"""
+        self.index.add(make_repo(2, 'Kubernetes operator for Postgres clusters', ['kubernetes', 'postgres']))
+        self.assertEqual([s['id'] for s in self.index.query(self.bots[2])], [2])
+        self.assertEqual(self.index.query(self.bots[0]), [])
+        
+        self.index.save()
+        loaded = SimilarityIndex(self.index.path)
+        loaded.load()
+        self.assertEqual(len(loaded), 3)
+        self.assertEqual([s['id'] for s in loaded.query(self.bots[2])], [2])
+        
+    def test_candidates_capped_by_collisions(self):
+        """测试候选数超过上限时保留同桶段数最多的项目"""
+        index = SimilarityIndex(os.path.join(self.data_dir, 'crowded.npz'), max_candidates=5)
+        for i in range(40):
+            index.add(make_repo(100 + i, f'Discord bot variant{i} extra{i} feature{i}', ['discord-bot']))
+        twin = make_repo(1, 'Discord bot for music playback and moderation', ['discord-bot', 'music'])
+        index.add(make_repo(2, 'Discord bot for music playback and moderation', ['discord-bot', 'music']))
+        
+        with index._lock:
+            candidates = index._candidates(index.signature(repo_tokens(twin)))
+        self.assertLessEqual(len(candidates), 5)
+        self.assertEqual(candidates[0], 2)
+        self.assertEqual(index.query(twin, limit=1)[0]['id'], 2)
+        
+if __name__ == '__main__':
+    unittest.main()
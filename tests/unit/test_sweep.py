@@ -0,0 +1,131 @@
+"""
+参数扫描模块单元测试
+"""
+import unittest
+import numpy as np
+from src.evaluator.monetization_evaluator import MonetizationEvaluator
+from src.evaluator.sweep import ParameterSweep
+from tests.fixtures.isolated_data import isolate_data
+
+class TestParameterSweep(unittest.TestCase):
+    def setUp(self):
+        """测试前准备"""
+        isolate_data(self)
+        self.evaluator = MonetizationEvaluator()
+        self.evaluator.memo = None
+        self.analyses = [
+            {
+                'project_id': f'test/{i}',
+                'evaluation': {'monetization_score': score, 'market_score': 0.5},
+                'monetization_paths': [
+                    {'type': 'SaaS', 'difficulty': 'high'},
+                    {'type': 'Support & Consulting', 'difficulty': 'low'},
+                    {'type': 'Premium Template', 'difficulty': 'low'}
+                ][:1 + i % 3]
+            }
+            for i, score in enumerate([0.9, 0.2, 0.55, 0.7, 0.4])
+        ]
+        # 没有可评估路径的项目不参与扫描
+        self.analyses.append({
+            'project_id': 'test/none',
+            'evaluation': {'monetization_score': 0.5, 'market_score': 0.5},
+            'monetization_paths': []
+        })
+        self.sweep = ParameterSweep(self.analyses, evaluator=self.evaluator)
+        
+    def test_scenario_grid(self):
+        """测试场景为参数取值的笛卡尔积，单一场景与对照完全一致"""
+        baseline = self.sweep.run()
+        self.assertEqual(baseline['scenarios'], 1)
+        self.assertEqual(baseline['stability']['spearman_min'], 1.0)
+        self.assertEqual(len(baseline['projects']), 5)
+        
+        result = self.sweep.run(
+            revenue_scale=[0.5, 1.0, 2.0],
+            max_roi_months=[2, 24],
+            weights=[{'income_potential': 1}, {'passive_level': 1, 'time_investment': 1}],
+            mode='criteria'
+        )
+        self.assertEqual(result['scenarios'], 12)
+        for project in result['projects']:
+            revenue = project['net_monthly_revenue']
+            self.assertLessEqual(revenue['min'], revenue['p50'])
+            self.assertLessEqual(revenue['p50'], revenue['max'])
+            self.assertLessEqual(project['best_rank'], project['worst_rank'])
+            
+    def test_default_matches_batch_evaluate(self):
+        """测试默认场景的推荐路径、净收入和排名与 batch_evaluate 一致"""
+        result = self.sweep.run(max_roi_months=[6])
+        evaluations = self.evaluator.batch_evaluate(self.analyses)
+        
+        projects = sorted(result['projects'], key=lambda project: project['baseline_rank'])
+        self.assertEqual(
+            [project['project_id'] for project in projects],
+            [evaluation['project_id'] for evaluation in evaluations]
+        )
+        for project, evaluation in zip(projects, evaluations):
+            path = evaluation['monetization_potential']['recommended_path']
+            self.assertAlmostEqual(project['net_monthly_revenue']['p50'], path['net_monthly_revenue'], delta=0.01)
+            self.assertEqual(project['viable_fraction'], float(path['roi_period_months'] <= 6))
+            
+    def test_global_scales_keep_ranking(self):
+        """测试全局倍数等比缩放所有项目，排名不变"""
+        result = self.sweep.run(revenue_scale=[0.5, 2.0], maintenance_scale=[0.5, 1.5])
+        self.assertEqual(result['stability']['spearman_min'], 1.0)
+        
+    def test_model_scales_reorder_projects(self):
+        """测试按变现模式缩放时，至少一个场景改变项目排名"""
+        result = self.sweep.run(model_scales={'SaaS': {'min_revenue': [0.2, 1.0, 3.0]}})
+        self.assertEqual(result['scenarios'], 3)
+        self.assertLess(result['stability']['spearman_min'], 1.0)
+        self.assertTrue(any(project['rank_std'] > 0 for project in result['projects']))
+        self.assertEqual(result['stability']['least_stable_scenario']['SaaS.min_revenue'], 0.2)
+        
+        # 倍数为1的场景与默认参数一致
+        single = self.sweep.run(model_scales={'SaaS': {'scalability': [1.0]}})
+        self.assertEqual(single['projects'], self.sweep.run()['projects'])
+        
+        with self.assertRaises(ValueError):
+            self.sweep.run(model_scales={'SaaS': {'setup_time': [2.0]}})
+        with self.assertRaises(ValueError):
+            self.sweep.run(model_scales={'Unknown': {'min_revenue': [2.0]}})
+            
+    def test_criteria_options(self):
+        """测试手续费和权重只在 criteria 模式下可用"""
+        with self.assertRaises(ValueError):
+            self.sweep.run(fee_scale=[0.5])
+        with self.assertRaises(ValueError):
+            self.sweep.run(mode='weighted')
+        self.assertIn('weights', self.sweep.run(mode='criteria')['parameters'])
+            
+    def test_revenue_matches_evaluator(self):
+        """测试 criteria 模式只看收入时，最佳路径净收入与评估器一致"""
+        result = self.sweep.run(
+            fee_scale=[0.0], max_roi_months=[1000], weights=[{'income_potential': 1}], mode='criteria'
+        )
+        evaluations = {
+            evaluation['project_id']: evaluation
+            for evaluation in self.evaluator.batch_evaluate(self.analyses)
+        }
+        for project in result['projects']:
+            paths = evaluations[project['project_id']]['monetization_potential']['evaluated_paths']
+            self.assertAlmostEqual(
+                project['net_monthly_revenue']['max'],
+                max(path['net_monthly_revenue'] for path in paths),
+                places=1
+            )
+            
+    def test_chunking(self):
+        """测试分块计算结果与一次计算一致"""
+        grid = {'revenue_scale': np.linspace(0.5, 1.5, 7), 'maintenance_scale': [0.5, 1.0, 1.5]}
+        whole = self.sweep.run(**grid)
+        self.sweep.max_chunk_elements = 1
+        self.assertEqual(self.sweep.run(**grid), whole)
+        
+    def test_invalid_weights(self):
+        """测试权重之和为0时报错"""
+        with self.assertRaises(ValueError):
+            self.sweep.run(weights=[{'setup_cost': 0}], mode='criteria')
+
+if __name__ == '__main__':
+    unittest.main()
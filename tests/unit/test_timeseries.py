@@ -0,0 +1,96 @@
+"""
+指标时间序列存储单元测试
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from src.storage import MetricSeriesStore
+
+DAY = 86400
+
+class TestMetricSeriesStore(unittest.TestCase):
+    def setUp(self):
+        """测试前准备"""
+        self.data_dir = tempfile.mkdtemp()
+        self.store = MetricSeriesStore(self.data_dir)
+        
+    def tearDown(self):
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+        
+    def test_append_only_history(self):
+        """测试每次扫描追加快照"""
+        self.store.append([{'id': 1, 'stars': 100, 'forks': 10, 'open_issues': 5}], ts=0)
+        self.store.append([{'id': 1, 'stars': 150, 'forks': 12, 'open_issues': 4}], ts=DAY)
+        
+        history = self.store.history(1)
+        self.assertEqual(history['stars'], [100, 150])
+        self.assertEqual(history['forks'], [10, 12])
+        self.assertEqual(history['ts'], [0.0, float(DAY)])
+        
+    def test_growth_metrics(self):
+        """测试星标速度、加速度和增长百分位"""
+        # 仓库1加速增长，仓库2匀速增长，仓库3只有一次快照
+        for day, (fast, steady) in enumerate([(100, 500), (110, 520), (150, 540)]):
+            self.store.append([
+                {'id': 1, 'stars': fast},
+                {'id': 2, 'stars': steady}
+            ], ts=day * DAY)
+        self.store.append([{'id': 3, 'stars': 9000}], ts=2 * DAY)
+        
+        metrics = self.store.growth_metrics()
+        
+        self.assertEqual(set(metrics), {1, 2})
+        self.assertEqual(metrics[1]['stars_per_day'], 40)
+        self.assertEqual(metrics[1]['acceleration'], 30)
+        self.assertEqual(metrics[1]['growth_percentile'], 1.0)
+        self.assertEqual(metrics[2]['stars_per_day'], 20)
+        self.assertEqual(metrics[2]['acceleration'], 0)
+        self.assertEqual(metrics[2]['growth_percentile'], 0.0)
+        self.assertEqual(metrics[1]['samples'], 3)
+        
+        # 按仓库过滤不影响百分位
+        self.assertEqual(self.store.growth_metrics([2]), {2: metrics[2]})
+        
+    def test_percentile_ties(self):
+        """测试并列的仓库取平均名次，全部为零增长时百分位为中性值"""
+        for day in range(2):
+            self.store.append([{'id': i, 'stars': 100} for i in range(1, 5)], ts=day * DAY)
+        metrics = self.store.growth_metrics()
+        self.assertEqual({m['growth_percentile'] for m in metrics.values()}, {0.5})
+        
+        # 仓库4增长，其余三个并列
+        self.store.append([{'id': i, 'stars': 100} for i in range(1, 4)] + [{'id': 4, 'stars': 130}], ts=2 * DAY)
+        metrics = self.store.growth_metrics()
+        self.assertEqual(metrics[4]['growth_percentile'], 1.0)
+        self.assertEqual(metrics[1]['growth_percentile'], metrics[3]['growth_percentile'])
+        self.assertEqual(metrics[1]['growth_percentile'], round(1 / 3, 4))
+        
+    def test_short_interval_skipped(self):
+        """测试间隔过短的快照不作为计算速度的参照"""
+        self.store.append([{'id': 1, 'stars': 100}, {'id': 2, 'stars': 100}], ts=0)
+        self.store.append([{'id': 1, 'stars': 200}], ts=DAY)
+        # 一分钟后的重复扫描多了2个星标，不应折算成每天近3000个
+        self.store.append([{'id': 1, 'stars': 202}, {'id': 2, 'stars': 102}], ts=DAY + 60)
+        
+        metrics = self.store.growth_metrics()
+        self.assertEqual(metrics[1]['stars_per_day'], round(102 / (1 + 60 / DAY), 2))
+        self.assertIsNone(metrics[1]['acceleration'])
+        self.assertEqual(metrics[1]['samples'], 3)
+        
+        # 只有一分钟间隔的两次快照时不返回指标
+        store = MetricSeriesStore(os.path.join(self.data_dir, 'short'))
+        store.append([{'id': 1, 'stars': 1}], ts=0)
+        store.append([{'id': 1, 'stars': 3}], ts=60)
+        self.assertEqual(store.growth_metrics(), {})
+        
+    def test_truncated_write(self):
+        """测试写入中断导致的列长度不一致"""
+        self.store.append([{'id': 1, 'stars': 1}, {'id': 2, 'stars': 2}], ts=0)
+        with open(os.path.join(self.data_dir, 'stars.bin'), 'ab') as f:
+            f.write(b'\0' * 8)
+            
+        self.assertEqual(len(self.store.load()['stars']), 2)
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+"""
+GitHub令牌池单元测试
+"""
+import time
+import unittest
+from src.utils.token_pool import TokenPool, TokenPoolExhausted, TokenRejected
+
+class TestTokenPool(unittest.TestCase):
+    def test_routes_to_token_with_most_headroom(self):
+        """测试选择剩余额度最多的令牌"""
+        pool = TokenPool(['token-a', 'token-b'])
+        pool.update('token-a', 'core', {'X-RateLimit-Remaining': '100', 'X-RateLimit-Reset': str(time.time() + 600)})
+        pool.update('token-b', 'core', {'X-RateLimit-Remaining': '4000', 'X-RateLimit-Reset': str(time.time() + 600)})
+        
+        self.assertEqual(pool.acquire('core'), 'token-b')
+        self.assertEqual(pool.state()[1]['remaining']['core'], 3999)
+        
+    def test_exhausted_token_leaves_rotation(self):
+        """测试额度耗尽的令牌在重置前不再使用"""
+        pool = TokenPool(['token-a', 'token-b'], max_wait=0.5)
+        reset = str(time.time() + 600)
+        pool.update('token-a', 'search', {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': reset})
+        
+        self.assertEqual({pool.acquire('search') for _ in range(5)}, {'token-b'})
+        
+        pool.update('token-b', 'search', {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': reset})
+        with self.assertRaises(TokenPoolExhausted):
+            pool.acquire('search')
+        # core 配额不受影响
+        self.assertIn(pool.acquire('core'), ('token-a', 'token-b'))
+        
+    def test_reset_restores_token(self):
+        """测试重置时间过后令牌恢复"""
+        pool = TokenPool(['token-a'])
+        pool.update('token-a', 'search', {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(time.time() - 1)})
+        self.assertEqual(pool.acquire('search'), 'token-a')
+        
+    def test_rejected_token_leaves_pool(self):
+        """测试被拒绝的令牌移出令牌池，全部被拒绝后不再退回匿名请求"""
+        pool = TokenPool(['token-a', 'token-b'])
+        self.assertEqual(pool.reject('token-a'), 1)
+        self.assertEqual(pool.reject('token-a'), 1)
+        self.assertEqual({pool.acquire('core') for _ in range(3)}, {'token-b'})
+        
+        self.assertEqual(pool.reject('token-b'), 0)
+        with self.assertRaises(TokenRejected):
+            pool.acquire('core')
+            
+    def test_empty_pool(self):
+        """测试未配置令牌时匿名请求"""
+        self.assertIsNone(TokenPool(['', None]).acquire('core'))
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+"""
+Top-K选择单元测试
+"""
+import random
+import unittest
+from src.utils.top_k import TopK
+
+class TestTopK(unittest.TestCase):
+    def test_matches_stable_sort(self):
+        """测试结果与稳定降序排序后截取前K个一致"""
+        random.seed(7)
+        items = [{'id': i, 'score': random.randint(0, 20)} for i in range(500)]
+        
+        for k in (0, 1, 5, 50, None):
+            expected = sorted(items, key=lambda x: x['score'], reverse=True)
+            expected = expected if k is None else expected[:k]
+            actual = TopK(k, key=lambda x: x['score']).extend(items).items()
+            self.assertEqual(actual, expected)
+            
+    def test_bounded_memory(self):
+        """测试只保留K个元素"""
+        ranking = TopK(3, key=lambda x: x)
+        for value in range(1000):
+            ranking.push(value)
+            
+        self.assertEqual(len(ranking), 3)
+        self.assertEqual(ranking.items(), [999, 998, 997])
+        
+    def test_prefer_last(self):
+        """测试同分时后加入的优先"""
+        items = [('a', 1), ('b', 1), ('c', 1)]
+        
+        self.assertEqual(TopK(2, key=lambda x: x[1]).extend(items).items(), [('a', 1), ('b', 1)])
+        self.assertEqual(TopK(2, key=lambda x: x[1], prefer='last').extend(items).items(), [('c', 1), ('b', 1)])
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+"""
+主题分类单元测试
+"""
+import unittest
+from src.analyzer.topic_classifier import TopicClassifier, normalize_topic
+from src.evaluator.monetization_evaluator import MonetizationEvaluator
+from tests.fixtures.isolated_data import isolate_data
+
+class TestTopicClassifier(unittest.TestCase):
+    def setUp(self):
+        """测试前准备"""
+        isolate_data(self)
+        self.classifier = TopicClassifier()
+        
+    def test_normalize_topic(self):
+        """测试大小写、分隔符和复数统一"""
+        self.assertEqual(normalize_topic('Developer_Tools'), 'developer-tool')
+        self.assertEqual(normalize_topic('utilities'), 'utility')
+        self.assertEqual(normalize_topic('APIs'), 'api')
+        
+    def test_no_substring_false_matches(self):
+        """测试不再因子串误判"""
+        self.assertEqual(self.classifier.classify(['build', 'rapid-prototyping', 'webassembly']), set())
+        
+    def test_classify_features(self):
+        """测试按词和整个主题识别特征"""
+        features = self.classifier.classify(['rest-api', 'Developer-Tools', 'web', 'Docker'])
+        
+        self.assertEqual(features, {'api', 'developer_tools', 'tool', 'ui', 'docker'})
+        self.assertEqual(self.classifier.classify(['automation']), {'tool', 'automation'})
+        self.assertEqual(self.classifier.classify(None), set())
+        
+    def test_target_audience_uses_features(self):
+        """测试评估器按分析结果中的特征识别目标用户"""
+        evaluator = MonetizationEvaluator()
+        
+        audiences = evaluator._identify_target_audience({'features': ['developer_tools', 'automation']})
+        self.assertEqual(audiences, ['Developers', 'DevOps'])
+        self.assertEqual(evaluator._identify_target_audience({'topics': ['builder']}), ['General Developers'])
+        
+if __name__ == '__main__':
+    unittest.main()